@@ -3,3 +3,7 @@ from .subscription import router as subscription_router
 from .projects import router as projects_router
 from .tasks import router as tasks_router
 from .teams import router as teams_router
+from .imports import router as imports_router
+from .sync import router as sync_router
+from .events import router as events_router
+from .batch import router as batch_router
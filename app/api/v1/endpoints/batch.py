@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core import app_settings
+from app.db import get_db
+from app.db.session import shared_session
+from app.schemas import (
+    BatchRequest,
+    BatchRequestItem,
+    BatchResponse,
+    BatchResponseItem,
+    Token,
+)
+from app.services.auth import verified_token, verify_token
+
+router = APIRouter()
+
+API_PREFIX = "/api/v1"
+# Streams never finish and webhooks are not for clients.
+EXCLUDED_PATHS = ("/batch", "/events", "/subscription/webhook")
+
+
+def _allowed(path: str) -> bool:
+    if not path.startswith(API_PREFIX + "/"):
+        return False
+    return not path.removeprefix(API_PREFIX).startswith(EXCLUDED_PATHS)
+
+
+async def _dispatch(
+    client: httpx.AsyncClient, item: BatchRequestItem, token: str
+) -> BatchResponseItem:
+    # The check runs on the path the app will see, after dot segments are
+    # resolved, so "/projects/../batch" cannot sneak through.
+    sub_request = client.build_request(
+        item.method,
+        API_PREFIX + item.path,
+        json=item.body,
+        # The batch response is compressed as a whole.
+        headers={"Authorization": token, "Accept-Encoding": "identity"},
+    )
+    if not _allowed(sub_request.url.path):
+        return BatchResponseItem(status=400, body={"detail": "Path not allowed"})
+
+    response = await client.send(sub_request)
+    body = None
+    if response.content:
+        try:
+            body = response.json()
+        except json.JSONDecodeError:
+            body = response.text
+    return BatchResponseItem(status=response.status_code, body=body)
+
+
+async def _dispatch_reads(
+    client: httpx.AsyncClient, items: list[BatchRequestItem], token: str
+) -> list[BatchResponseItem]:
+    if len(items) < 2:
+        return [await _dispatch(client, item, token) for item in items]
+
+    async def read(item: BatchRequestItem):
+        # Sessions are not thread safe; concurrent reads get their own.
+        shared_session.set(None)
+        return await _dispatch(client, item, token)
+
+    return await asyncio.gather(*(read(item) for item in items))
+
+
+@router.post("", response_model=BatchResponse)
+async def batch_requests(
+    request: Request, batch: BatchRequest, db: Session = Depends(get_db)
+):
+    """Run several API calls in one round trip.
+
+    The token is checked once for the whole batch. Sub-requests run in
+    order, except that consecutive GETs run concurrently; each gets its own
+    status and body.
+    """
+    if len(batch.requests) > app_settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {app_settings.BATCH_MAX_REQUESTS} requests per batch",
+        )
+
+    token = request.headers.get("Authorization")
+    if not token or not await run_in_threadpool(
+        verify_token, db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    verified = verified_token.set(token)
+    shared = shared_session.set(db)
+    # Sub-requests go through the app in-process, middleware included; a
+    # failing one becomes a 500 item instead of failing the batch.
+    transport = httpx.ASGITransport(app=request.app, raise_app_exceptions=False)
+    responses: list[BatchResponseItem] = []
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://batch"
+        ) as client:
+            reads: list[BatchRequestItem] = []
+            for item in batch.requests:
+                if item.method == "GET":
+                    reads.append(item)
+                    continue
+                responses += await _dispatch_reads(client, reads, token)
+                reads = []
+                responses.append(await _dispatch(client, item, token))
+                # Discard whatever a failed write left in the shared session.
+                await run_in_threadpool(db.rollback)
+            responses += await _dispatch_reads(client, reads, token)
+    finally:
+        shared_session.reset(shared)
+        verified_token.reset(verified)
+
+    return BatchResponse(responses=responses)
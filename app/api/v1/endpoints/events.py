@@ -0,0 +1,158 @@
+import asyncio
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    WebSocket,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from jwt import InvalidTokenError
+from uuid import UUID
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core import app_settings
+from app.core.events import Subscriber, broker
+from app.core.security import decode_access_token
+from app.db import get_db
+from app.db.session import SessionLocal
+from app.schemas import Token
+from app.services import verify_token
+from app.services.access import get_user_access, reload_user_access
+from app.services.auth import get_user_by_email
+
+router = APIRouter()
+
+
+def _subscribe(db: Session, token: str | None) -> Subscriber:
+    try:
+        if not token or not verify_token(
+            db, Token(access_token=token, token_type="bearer")
+        ):
+            raise HTTPException(status_code=401, detail="Unauthorized")
+
+        user = get_user_by_email(db, decode_access_token(token)["sub"])
+
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        access = get_user_access(db, user.id)
+    finally:
+        # Long-lived connections must not keep a pooled DB connection checked out.
+        db.close()
+
+    return broker.subscribe(
+        user.id, access.project_ids, app_settings.EVENTS_QUEUE_SIZE, access.team_ids
+    )
+
+
+def _load_access(user_id: UUID):
+    db = SessionLocal()
+    try:
+        return reload_user_access(db, user_id)
+    finally:
+        db.close()
+
+
+async def _refresh_access(subscriber: Subscriber):
+    # Cleared first so a change that lands during the reload is not lost.
+    subscriber.stale = False
+    access = await run_in_threadpool(_load_access, UUID(subscriber.user_id))
+    subscriber.set_access(access.project_ids, access.team_ids)
+
+
+async def _next_event(subscriber: Subscriber):
+    """Wait for the next event; None on keepalive timeout, when dropped or
+    when the event is no longer visible to the user."""
+    if subscriber.stale:
+        await _refresh_access(subscriber)
+    get = asyncio.ensure_future(subscriber.queue.get())
+    dropped = asyncio.ensure_future(subscriber.dropped.wait())
+    try:
+        done, _ = await asyncio.wait(
+            {get, dropped},
+            timeout=app_settings.EVENTS_KEEPALIVE_SECONDS,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+    finally:
+        get.cancel()
+        dropped.cancel()
+    if get not in done:
+        return None
+    event = get.result()
+    if subscriber.stale:
+        await _refresh_access(subscriber)
+        subscriber.recheck += 1
+    return subscriber.checked(event)
+
+
+@router.get("/stream")
+async def stream_events(request: Request, db: Session = Depends(get_db)):
+    if not broker.running:
+        raise HTTPException(status_code=503, detail="Event stream unavailable")
+
+    subscriber = await run_in_threadpool(
+        _subscribe, db, request.headers.get("Authorization")
+    )
+
+    async def event_stream():
+        try:
+            yield ": connected\n\n"
+            while not subscriber.dropped.is_set():
+                event = await _next_event(subscriber)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event.type}\ndata: {event.to_json()}\n\n"
+            yield 'event: dropped\ndata: {"reason": "slow consumer"}\n\n'
+        finally:
+            broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket, token: str | None = None, db: Session = Depends(get_db)
+):
+    # Browsers cannot set headers on WebSocket handshakes; accept a query token.
+    token = token or websocket.headers.get("Authorization")
+    if not broker.running:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    try:
+        subscriber = await run_in_threadpool(_subscribe, db, token)
+    except (HTTPException, InvalidTokenError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    async def send_events():
+        while not subscriber.dropped.is_set():
+            event = await _next_event(subscriber)
+            if event is not None:
+                await websocket.send_text(event.to_json())
+        await websocket.close(
+            code=status.WS_1013_TRY_AGAIN_LATER, reason="slow consumer"
+        )
+
+    async def receive_until_closed():
+        while True:
+            await websocket.receive_text()
+
+    sender = asyncio.ensure_future(send_events())
+    receiver = asyncio.ensure_future(receive_until_closed())
+    try:
+        await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        broker.unsubscribe(subscriber)
+        sender.cancel()
+        receiver.cancel()
+        # Collect WebSocketDisconnect and cancellation from both sides.
+        await asyncio.gather(sender, receiver, return_exceptions=True)
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core import app_settings
+from app.db import get_db
+from app.schemas import Token, ImportFormat, ImportReport
+from app.services import (
+    import_rows,
+    import_tasks_chunk,
+    import_projects_chunk,
+    verify_token,
+    verify_user_subscription,
+)
+from app.services.auth import get_user_by_email
+from app.core.security import decode_access_token
+from app.utils.imports import iter_lines, iter_ndjson_rows, iter_csv_rows
+
+router = APIRouter()
+
+
+def _authorize_import(db: Session, token: str | None):
+    if not token or not verify_token(
+        db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    decode_token = decode_access_token(token)
+
+    user = get_user_by_email(db, decode_token["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if not verify_user_subscription(db, user.email):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    return user
+
+
+def _parse_upload(request: Request, format: ImportFormat | None):
+    if format is None:
+        content_type = request.headers.get("Content-Type", "")
+        format = ImportFormat.csv if "csv" in content_type else ImportFormat.ndjson
+
+    lines = iter_lines(request.stream(), app_settings.IMPORT_MAX_LINE_BYTES)
+    if format == ImportFormat.csv:
+        return iter_csv_rows(lines, app_settings.IMPORT_MAX_LINE_BYTES)
+    return iter_ndjson_rows(lines)
+
+
+@router.post("/tasks", response_model=ImportReport)
+async def import_tasks_endpoint(
+    request: Request,
+    format: ImportFormat | None = None,
+    db: Session = Depends(get_db),
+):
+    user = await run_in_threadpool(
+        _authorize_import, db, request.headers.get("Authorization")
+    )
+    rows = _parse_upload(request, format)
+    return await import_rows(db, user, rows, import_tasks_chunk)
+
+
+@router.post("/projects", response_model=ImportReport)
+async def import_projects_endpoint(
+    request: Request,
+    format: ImportFormat | None = None,
+    db: Session = Depends(get_db),
+):
+    user = await run_in_threadpool(
+        _authorize_import, db, request.headers.get("Authorization")
+    )
+    rows = _parse_upload(request, format)
+    return await import_rows(db, user, rows, import_projects_chunk)
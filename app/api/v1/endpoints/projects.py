@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.services import (
@@ -7,8 +7,22 @@ from app.services import (
     update_project,
     delete_project,
     get_project,
+    get_project_progress,
+    get_project_activity,
+    get_topological_order,
+    get_blocked_tasks,
+    get_critical_path,
+)
+from app.schemas import (
+    ProjectCreate,
+    ProjectResponse,
+    ProjectUpdate,
+    ProjectProgress,
+    ActivityPage,
+    ProjectTaskOrder,
+    ProjectBlockedTasks,
+    ProjectCriticalPath,
 )
-from app.schemas import ProjectCreate, ProjectResponse, ProjectUpdate
 from app.db import get_db
 from app.services.auth import verify_token
 from app.schemas import Token
@@ -16,6 +30,13 @@ from app.core.security import decode_access_token
 from app.services import verify_user_subscription
 from uuid import UUID
 from app.services.auth import get_user_by_email
+from app.services.response_cache import (
+    cached_response,
+    get_cached_response,
+    project_scopes,
+    user_scopes,
+)
+from app.utils.serialization import item_response, list_response, parse_fields
 
 router = APIRouter()
 
@@ -48,8 +69,13 @@ def list_user_projects(
     request: Request,
     skip: int = 0,
     limit: int = 10,
+    fields: str | None = None,
     db: Session = Depends(get_db),
 ):
+    cached = get_cached_response(db, request)
+    if cached is not None:
+        return cached
+
     token = request.headers.get("Authorization")
     if not token or not verify_token(
         db, Token(access_token=token, token_type="bearer")
@@ -63,16 +89,154 @@ def list_user_projects(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return get_user_projects(db, user, skip=skip, limit=limit)
+    selected = parse_fields(ProjectResponse, fields)
+    return cached_response(
+        request,
+        user.id,
+        user_scopes(db, user),
+        List[ProjectResponse],
+        lambda: list_response(
+            ProjectResponse,
+            get_user_projects(db, user, skip=skip, limit=limit, fields=selected),
+            selected,
+        ),
+    )
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 def get_project_by_id(
     request: Request,
     project_id: UUID,
+    fields: str | None = None,
+    db: Session = Depends(get_db),
+):
+    cached = get_cached_response(db, request)
+    if cached is not None:
+        return cached
+
+    token = request.headers.get("Authorization")
+    if not token or not verify_token(
+        db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    user = decode_access_token(token)
+
+    user = get_user_by_email(db, user["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    selected = parse_fields(ProjectResponse, fields)
+    return cached_response(
+        request,
+        user.id,
+        project_scopes(db, user, project_id),
+        ProjectResponse,
+        lambda: item_response(
+            ProjectResponse, get_project(db, project_id, user, selected), selected
+        ),
+    )
+
+
+@router.get("/{project_id}/progress", response_model=ProjectProgress)
+def get_project_progress_by_id(
+    request: Request,
+    project_id: UUID,
+    db: Session = Depends(get_db),
+):
+    token = request.headers.get("Authorization")
+    if not token or not verify_token(
+        db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    user = decode_access_token(token)
+
+    user = get_user_by_email(db, user["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return get_project_progress(db, project_id, user)
+
+
+@router.get("/{project_id}/activity", response_model=ActivityPage)
+def get_project_activity_by_id(
+    request: Request,
+    project_id: UUID,
+    before: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
+    token = request.headers.get("Authorization")
+    if not token or not verify_token(
+        db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
 
+    user = decode_access_token(token)
+
+    user = get_user_by_email(db, user["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return get_project_activity(db, project_id, user, before=before, limit=limit)
+
+
+@router.get("/{project_id}/dependencies/order", response_model=ProjectTaskOrder)
+def get_project_task_order(
+    request: Request,
+    project_id: UUID,
+    db: Session = Depends(get_db),
+):
+    token = request.headers.get("Authorization")
+    if not token or not verify_token(
+        db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    user = decode_access_token(token)
+
+    user = get_user_by_email(db, user["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return get_topological_order(db, project_id, user)
+
+
+@router.get("/{project_id}/dependencies/blocked", response_model=ProjectBlockedTasks)
+def get_project_blocked_tasks(
+    request: Request,
+    project_id: UUID,
+    db: Session = Depends(get_db),
+):
+    token = request.headers.get("Authorization")
+    if not token or not verify_token(
+        db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    user = decode_access_token(token)
+
+    user = get_user_by_email(db, user["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return get_blocked_tasks(db, project_id, user)
+
+
+@router.get(
+    "/{project_id}/dependencies/critical-path", response_model=ProjectCriticalPath
+)
+def get_project_critical_path(
+    request: Request,
+    project_id: UUID,
+    db: Session = Depends(get_db),
+):
     token = request.headers.get("Authorization")
     if not token or not verify_token(
         db, Token(access_token=token, token_type="bearer")
@@ -86,7 +250,7 @@ def get_project_by_id(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return get_project(db, project_id, user)
+    return get_critical_path(db, project_id, user)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
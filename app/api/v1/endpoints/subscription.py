@@ -1,6 +1,11 @@
+import json
+import stripe
 from fastapi import APIRouter, HTTPException, Request, Depends, Response
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core import app_settings
 from app.db import get_db
+from app.jobs.stripe_events import stripe_event_workers
 from app.services import (
     create_checkout_session,
     get_stripe_session,
@@ -9,6 +14,7 @@ from app.services import (
 )
 from app.schemas import Token, SubscriptionCheckoutInformation
 from app.services.auth import verify_token
+from app.services.stripe_events import get_checkout_subscription, store_stripe_event
 from app.models.subscription import SubscriptionType
 from app.core.security import decode_access_token
 
@@ -20,14 +26,15 @@ async def create_checkout_session_endpoint(
     request: Request, subscription_type: SubscriptionType, db: Session = Depends(get_db)
 ) -> SubscriptionCheckoutInformation:
     token = request.headers.get("Authorization")
-    if not token or not verify_token(
-        db, Token(access_token=token, token_type="bearer")
+    if not token or not await run_in_threadpool(
+        verify_token, db, Token(access_token=token, token_type="bearer")
     ):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     try:
         # Create a Stripe checkout session
-        checkout_session = create_checkout_session(
+        checkout_session = await run_in_threadpool(
+            create_checkout_session,
             "{request_obj}/return?session_id={CHECKOUT_SESSION_ID}".format(
                 request_obj=request.headers.get("Origin"),
                 CHECKOUT_SESSION_ID="{CHECKOUT_SESSION_ID}",
@@ -44,6 +51,11 @@ async def create_checkout_session_endpoint(
         return SubscriptionCheckoutInformation(
             id=checkout_session.id, client_secret=checkout_session.client_secret
         )
+    except HTTPException as e:
+        # Provider failures keep their status; the rest are bad requests.
+        if e.status_code >= 500:
+            raise
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -56,7 +68,17 @@ async def check_stripe_session_status(
 ):
     from stripe import Subscription
 
-    session = get_stripe_session(stripe_session_id)
+    # Once the webhook has been applied there is no need to ask Stripe.
+    subscription = await run_in_threadpool(
+        get_checkout_subscription, db, stripe_session_id
+    )
+    if subscription is not None:
+        return {
+            "message": "Subscription created successfully",
+            "subscription": subscription,
+        }
+
+    session = await run_in_threadpool(get_stripe_session, stripe_session_id)
     if session is None:
         raise HTTPException(status_code=400, detail="Invalid session ID")
 
@@ -76,8 +98,12 @@ async def check_stripe_session_status(
             else session.subscription
         )
 
-        subscription = create_subscription(
-            db, session.customer_email, subscription_id, subscription_type
+        subscription = await run_in_threadpool(
+            create_subscription,
+            db,
+            session.customer_email,
+            subscription_id,
+            subscription_type,
         )
 
         if subscription is None:
@@ -97,9 +123,29 @@ async def cancel_subscription_endpoint(
     request: Request, user_email: str, db: Session = Depends(get_db)
 ):
     token = request.headers.get("Authorization")
-    if not token or not verify_token(
-        db, Token(access_token=token, token_type="bearer")
+    if not token or not await run_in_threadpool(
+        verify_token, db, Token(access_token=token, token_type="bearer")
     ):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    return cancel_subscription(db, user_email)
+    return await run_in_threadpool(cancel_subscription, db, user_email)
+
+
+@router.post("/webhook")
+async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
+    payload = (await request.body()).decode("utf-8")
+    signature = request.headers.get("Stripe-Signature")
+    if not signature:
+        raise HTTPException(status_code=400, detail="Missing signature")
+    try:
+        stripe.WebhookSignature.verify_header(
+            payload, signature, app_settings.STRIPE_WEBHOOK_SECRET
+        )
+        event = json.loads(payload)
+    except (ValueError, stripe.SignatureVerificationError):
+        raise HTTPException(status_code=400, detail="Invalid webhook")
+
+    # Only store here; the workers apply events outside the request.
+    if await run_in_threadpool(store_stripe_event, db, event):
+        stripe_event_workers.notify()
+    return {"received": True}
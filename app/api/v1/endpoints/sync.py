@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from app.db import get_db
+from app.schemas import Token, SyncResponse
+from app.services import get_changes, verify_token
+from app.services.auth import get_user_by_email
+from app.core.security import decode_access_token
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SyncResponse)
+def sync_changes(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(500, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    token = request.headers.get("Authorization")
+    if not token or not verify_token(
+        db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    decode_token = decode_access_token(token)
+
+    user = get_user_by_email(db, decode_token["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return get_changes(db, user, cursor, limit)
@@ -1,10 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
 from sqlalchemy.orm import Session
 from typing import List
-from app.schemas.task import TaskCreate, TaskUpdate, TaskInDB
+from app.core import app_settings
+from app.jobs.task_ranks import rebalance_column
+from app.models import User
+from app.models.task import TaskStatus
+from app.schemas.task import TaskCreate, TaskUpdate, TaskPatch, TaskMove, TaskInDB
+from app.schemas.dependency import TaskDependencyCreate, TaskDependencyResponse
 from app.services import (
     create_task,
     update_task,
+    patch_task,
+    move_task,
+    add_task_dependency,
+    remove_task_dependency,
     delete_task,
     get_task_by_id,
     get_tasks_by_project,
@@ -15,32 +32,59 @@ from app.services import verify_token, verify_user_subscription
 from app.core.security import decode_access_token
 from app.schemas import Token
 from uuid import UUID
+from app.services.access import authorize_task, require_project_access
 from app.services.auth import get_user_by_email
+from app.services.response_cache import (
+    cached_response,
+    get_cached_response,
+    user_scopes,
+)
+from app.utils.serialization import item_response, list_response, parse_fields
 
 
 router = APIRouter()
 
 
-@router.post("/new", response_model=TaskInDB, status_code=status.HTTP_201_CREATED)
-def create_new_task(
-    request: Request, task_data: TaskCreate, db: Session = Depends(get_db)
-):
+def _get_actor(db: Session, request: Request) -> User:
+    # Loading the user checks the token and gives the actor in one query.
     token = request.headers.get("Authorization")
-    if not token or not verify_token(
-        db, Token(access_token=token, token_type="bearer")
-    ):
+    actor = get_user_by_email(db, decode_access_token(token)["sub"]) if token else None
+    if actor is None:
         raise HTTPException(status_code=401, detail="Unauthorized")
+    return actor
 
-    user = decode_access_token(token)
 
-    if verify_user_subscription(db, user["sub"]):
-        return create_task(db, task_data)
+def _schedule_rebalance(background_tasks: BackgroundTasks, task):
+    if len(task.rank) > app_settings.TASK_RANK_MAX_LENGTH:
+        background_tasks.add_task(rebalance_column, task.project_id, task.status)
+
+
+@router.post("/new", response_model=TaskInDB, status_code=status.HTTP_201_CREATED)
+def create_new_task(
+    request: Request,
+    task_data: TaskCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    actor = _get_actor(db, request)
+
+    if verify_user_subscription(db, actor.email):
+        require_project_access(db, actor, task_data.project_id)
+        task = create_task(db, task_data, actor_id=actor.id)
+        _schedule_rebalance(background_tasks, task)
+        return task
     else:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
 
 @router.get("/", response_model=List[TaskInDB])
-def get_tasks_list(request: Request, db: Session = Depends(get_db)):
+def get_tasks_list(
+    request: Request, fields: str | None = None, db: Session = Depends(get_db)
+):
+    cached = get_cached_response(db, request)
+    if cached is not None:
+        return cached
+
     token = request.headers.get("Authorization")
     if not token or not verify_token(
         db, Token(access_token=token, token_type="bearer")
@@ -54,24 +98,43 @@ def get_tasks_list(request: Request, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return get_tasks(db, user.email)
+    selected = parse_fields(TaskInDB, fields)
+    return cached_response(
+        request,
+        user.id,
+        user_scopes(db, user),
+        List[TaskInDB],
+        lambda: list_response(TaskInDB, get_tasks(db, user.email, selected), selected),
+    )
 
 
 @router.get("/{task_id}", response_model=TaskInDB)
-def read_task(request: Request, task_id: UUID, db: Session = Depends(get_db)):
+def read_task(
+    request: Request,
+    task_id: UUID,
+    fields: str | None = None,
+    db: Session = Depends(get_db),
+):
     token = request.headers.get("Authorization")
     if not token or not verify_token(
         db, Token(access_token=token, token_type="bearer")
     ):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    task = get_task_by_id(db, task_id)
+    user = get_user_by_email(db, decode_access_token(token)["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    selected = parse_fields(TaskInDB, fields)
+    authorize_task(db, user, task_id)
+    task = get_task_by_id(db, task_id, selected)
 
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
         )
-    return task
+    return item_response(TaskInDB, task, selected)
 
 
 @router.put("/{task_id}", response_model=TaskInDB)
@@ -79,9 +142,79 @@ def update_existing_task(
     request: Request,
     task_id: UUID,
     task_data: TaskUpdate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    actor = _get_actor(db, request)
+
+    if verify_user_subscription(db, actor.email):
+        authorize_task(db, actor, task_id)
+        task = update_task(db, task_id, task_data, actor_id=actor.id)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+            )
+        # A status change appends the task to its new column.
+        _schedule_rebalance(background_tasks, task)
+        return task
+    return HTTPException(status_code=401, detail="Unauthorized")
+
+
+@router.patch("/{task_id}", response_model=TaskInDB)
+def patch_existing_task(
+    request: Request,
+    task_id: UUID,
+    task_patch: TaskPatch,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    actor = _get_actor(db, request)
+
+    if verify_user_subscription(db, actor.email):
+        authorize_task(db, actor, task_id)
+        task = patch_task(db, task_id, task_patch, actor_id=actor.id)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+            )
+        _schedule_rebalance(background_tasks, task)
+        return task
+    raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@router.post("/{task_id}/move", response_model=TaskInDB)
+def move_existing_task(
+    request: Request,
+    task_id: UUID,
+    task_move: TaskMove,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
+    actor = _get_actor(db, request)
 
+    if verify_user_subscription(db, actor.email):
+        authorize_task(db, actor, task_id)
+        task = move_task(db, task_id, task_move, actor_id=actor.id)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+            )
+        _schedule_rebalance(background_tasks, task)
+        return task
+    raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@router.post(
+    "/{task_id}/dependencies",
+    response_model=TaskDependencyResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def add_dependency(
+    request: Request,
+    task_id: UUID,
+    dependency_data: TaskDependencyCreate,
+    db: Session = Depends(get_db),
+):
     token = request.headers.get("Authorization")
     if not token or not verify_token(
         db, Token(access_token=token, token_type="bearer")
@@ -90,19 +223,23 @@ def update_existing_task(
 
     user = decode_access_token(token)
 
-    if verify_user_subscription(db, user["sub"]):
-        task = update_task(db, task_id, task_data)
-        if not task:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-            )
-        return task
-    return HTTPException(status_code=401, detail="Unauthorized")
+    user = get_user_by_email(db, user["sub"])
 
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
-@router.delete("/{task_id}", response_model=TaskInDB)
-def delete_existing_task(
-    request: Request, task_id: UUID, db: Session = Depends(get_db)
+    if verify_user_subscription(db, user.email):
+        return add_task_dependency(db, user, task_id, dependency_data.depends_on_id)
+
+    raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@router.delete("/{task_id}/dependencies/{depends_on_id}")
+def remove_dependency(
+    request: Request,
+    task_id: UUID,
+    depends_on_id: UUID,
+    db: Session = Depends(get_db),
 ):
     token = request.headers.get("Authorization")
     if not token or not verify_token(
@@ -112,8 +249,26 @@ def delete_existing_task(
 
     user = decode_access_token(token)
 
-    if verify_user_subscription(db, user["sub"]):
-        task = delete_task(db, task_id)
+    user = get_user_by_email(db, user["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if verify_user_subscription(db, user.email):
+        return remove_task_dependency(db, user, task_id, depends_on_id)
+
+    raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@router.delete("/{task_id}", response_model=TaskInDB)
+def delete_existing_task(
+    request: Request, task_id: UUID, db: Session = Depends(get_db)
+):
+    actor = _get_actor(db, request)
+
+    if verify_user_subscription(db, actor.email):
+        authorize_task(db, actor, task_id)
+        task = delete_task(db, task_id, actor_id=actor.id)
         if not task:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
@@ -125,7 +280,11 @@ def delete_existing_task(
 
 @router.get("/project/{project_id}", response_model=List[TaskInDB])
 def read_tasks_by_project(
-    request: Request, project_id: UUID, db: Session = Depends(get_db)
+    request: Request,
+    project_id: UUID,
+    task_status: TaskStatus | None = Query(None, alias="status"),
+    fields: str | None = None,
+    db: Session = Depends(get_db),
 ):
     token = request.headers.get("Authorization")
     if not token or not verify_token(
@@ -138,4 +297,10 @@ def read_tasks_by_project(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return get_tasks_by_project(db, project_id, user.email)
+    selected = parse_fields(TaskInDB, fields)
+    tasks = get_tasks_by_project(db, project_id, user["sub"], task_status, selected)
+
+    if tasks is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return list_response(TaskInDB, tasks, selected)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from app.services.auth import verify_token
 from app.schemas import Token
 from sqlalchemy.orm import Session
@@ -7,24 +7,35 @@ from app.schemas import (
     TeamUpdate,
     Team,
     TeamWithMembers,
+    TeamSummaryPage,
     TeamCreate,
     AddTeamMember,
     RemoveTeamMember,
+    TeamMembersBatch,
+    TeamMembersBatchResult,
 )
 from app.services import (
     create_team,
-    get_team,
+    get_team_row,
     update_team,
     delete_team,
     add_member_to_team,
     remove_member_from_team,
-    get_team_by_owned_by,
+    get_team_summaries,
+    get_team_member_ids,
+    add_members_to_team,
+    remove_members_from_team,
 )
 from app.db.session import get_db
 from uuid import UUID
 from app.services.auth import get_user_by_email
 from app.services import verify_user_subscription
 from app.core.security import decode_access_token
+from app.services.response_cache import (
+    cached_response,
+    get_cached_response,
+    team_scopes,
+)
 
 
 router = APIRouter()
@@ -55,41 +66,58 @@ def add_new_team_endpoint(
 
 
 @router.get("/{team_id}", response_model=TeamWithMembers)
-def get_team_endpoint(request: Request, team_id: UUID, db: Session = Depends(get_db)):
+def get_team_endpoint(
+    request: Request,
+    team_id: UUID,
+    members_after: UUID | None = None,
+    members_limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    cached = get_cached_response(db, request)
+    if cached is not None:
+        return cached
+
     token = request.headers.get("Authorization")
     if not token or not verify_token(
         db, Token(access_token=token, token_type="bearer")
     ):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    team = get_team(db, team_id)
-    if not team:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
+    user = get_user_by_email(db, decode_access_token(token)["sub"])
+
+    def build():
+        team = get_team_row(db, team_id)
+        members = get_team_member_ids(db, team_id, members_after, members_limit + 1)
+        has_more = len(members) > members_limit
+        members = members[:members_limit]
+        return TeamWithMembers(
+            id=team_id,
+            name=team.name,
+            owner_id=team.owner_id,
+            members=members,
+            next_members_after=members[-1] if has_more else None,
         )
-    return TeamWithMembers(
-        id=team_id,
-        name=team.name,
-        owner_id=team.owner_id,
-        members=[member.id for member in team.members],
+
+    return cached_response(
+        request, user.id, team_scopes(team_id), TeamWithMembers, build
     )
 
 
-@router.get("/owner/{owner_id}", response_model=list[Team])
-def get_teams_by_owner(request: Request, owner_id: UUID, db: Session = Depends(get_db)):
+@router.get("/owner/{owner_id}", response_model=TeamSummaryPage)
+def get_teams_by_owner(
+    request: Request,
+    owner_id: UUID,
+    after: UUID | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
     token = request.headers.get("Authorization")
     if not token or not verify_token(
         db, Token(access_token=token, token_type="bearer")
     ):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    teams = get_team_by_owned_by(db, owner_id)
-
-    if not teams:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Teams not found"
-        )
-    return teams
+    return get_team_summaries(db, owner_id, after, limit)
 
 
 @router.put("/{team_id}", response_model=Team)
@@ -139,7 +167,7 @@ def delete_team_endpoint(
         return delete_team(db, user.id, team_id)
 
 
-@router.post("/members/add")
+@router.post("/members/add", response_model=Team)
 def add_member_endpoint(
     request: Request, add_team_member: AddTeamMember, db: Session = Depends(get_db)
 ):
@@ -162,7 +190,7 @@ def add_member_endpoint(
         raise HTTPException(status_code=401, detail="Unauthorized")
 
 
-@router.delete("/members/remove")
+@router.delete("/members/remove", response_model=Team)
 def remove_member_endpoint(
     request: Request, user_to_remove: RemoveTeamMember, db: Session = Depends(get_db)
 ):
@@ -183,3 +211,49 @@ def remove_member_endpoint(
         return remove_member_from_team(db, user.id, user_to_remove)
     else:
         raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@router.post("/members/batch/add", response_model=TeamMembersBatchResult)
+def add_members_batch_endpoint(
+    request: Request, batch: TeamMembersBatch, db: Session = Depends(get_db)
+):
+    token = request.headers.get("Authorization")
+    if not token or not verify_token(
+        db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    decode_token = decode_access_token(token)
+
+    user = get_user_by_email(db, decode_token["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if verify_user_subscription(db, user.email):
+        return add_members_to_team(db, user.id, batch)
+    else:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@router.delete("/members/batch/remove", response_model=TeamMembersBatchResult)
+def remove_members_batch_endpoint(
+    request: Request, batch: TeamMembersBatch, db: Session = Depends(get_db)
+):
+    token = request.headers.get("Authorization")
+    if not token or not verify_token(
+        db, Token(access_token=token, token_type="bearer")
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    decode_token = decode_access_token(token)
+
+    user = get_user_by_email(db, decode_token["sub"])
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if verify_user_subscription(db, user.email):
+        return remove_members_from_team(db, user.id, batch)
+    else:
+        raise HTTPException(status_code=401, detail="Unauthorized")
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class Overloaded(Exception):
+    pass
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted by AIMD from observed latency.
+
+    Each request that finishes within `target_latency` grows the limit by
+    1/limit, about one slot per limit's worth of requests. A slower one cuts
+    it by `backoff`, at most once per `target_latency`, so one burst of slow
+    requests counts as a single signal. Requests that cannot get a slot
+    within `queue_timeout` raise Overloaded.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        target_latency: float,
+        queue_timeout: float,
+        min_limit: int = 1,
+        backoff: float = 0.75,
+    ):
+        self.name = name
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.target_latency = target_latency
+        self.queue_timeout = queue_timeout
+        self.backoff = backoff
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self):
+        if self.in_flight < self.capacity and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # A waiter woken by _free() already holds its slot.
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot in the same loop iteration the timeout fired;
+                # keep it rather than leak it.
+                return
+            self.rejected += 1
+            raise Overloaded(self.name)
+        except asyncio.CancelledError:
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as the client went away; pass it on.
+                self._free()
+            raise
+
+    def release(self, latency: float):
+        self._adjust(latency)
+        self._free()
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _free(self):
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.capacity:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _adjust(self, latency: float):
+        if latency <= self.target_latency:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            return
+        now = time.monotonic()
+        if now - self._last_decrease >= self.target_latency:
+            self._last_decrease = now
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def metrics(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "rejected": self.rejected,
+        }
+
+
+def classify(method: str, path: str) -> str | None:
+    """The route class a request is admitted under, or None to skip it."""
+    # Event streams hold a connection for good, and batches are admitted
+    # per sub-request.
+    if path.startswith(("/api/v1/events", "/api/v1/batch")):
+        return None
+    if not path.startswith("/api/v1/"):
+        return None
+    if path.startswith(("/api/v1/auth/login", "/api/v1/auth/register")):
+        # Password hashing is the most CPU-hungry thing we do.
+        return "auth"
+    if path.startswith("/api/v1/import/"):
+        # Imports run for seconds by design; keep them from holding write
+        # slots and from being read as an overload signal for writes.
+        return "imports"
+    if path.startswith("/api/v1/subscription/") and path != (
+        "/api/v1/subscription/webhook"
+    ):
+        return "stripe"
+    if method in ("GET", "HEAD"):
+        return "reads"
+    return "writes"
+
+
+class AdmissionMiddleware:
+    """Admit each request under its route class's adaptive limit.
+
+    Requests over their queue-time budget get a 503 with Retry-After right
+    away, instead of waiting on the threadpool and the database until the
+    client or load balancer gives up.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiters: dict[str, AdaptiveLimiter],
+        retry_after: int = 1,
+    ):
+        self.app = app
+        self.limiters = limiters
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limiter = None
+        if scope["type"] == "http":
+            limiter = self.limiters.get(classify(scope["method"], scope["path"]))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except Overloaded:
+            await self._reject(send)
+            return
+
+        started = time.monotonic()
+        latency = None
+
+        async def timed_send(message):
+            nonlocal latency
+            if message["type"] == "http.response.start":
+                # Time to first byte; streaming the body to a slow client
+                # says nothing about server load.
+                latency = time.monotonic() - started
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            if latency is None:
+                latency = time.monotonic() - started
+            limiter.release(latency)
+
+    async def _reject(self, send: Send):
+        body = json.dumps({"detail": "Server overloaded, retry later"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def build_limiters(
+    limits: dict[str, int], targets: dict[str, float], queue_timeout: float
+) -> dict[str, AdaptiveLimiter]:
+    return {
+        name: AdaptiveLimiter(name, limit, targets[name], queue_timeout)
+        for name, limit in limits.items()
+    }
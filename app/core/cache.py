@@ -0,0 +1,249 @@
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+
+class CacheBackend(ABC):
+    """Byte values with a TTL, plus counters that never expire."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float): ...
+
+    @abstractmethod
+    def get_counters(self, keys: list[str]) -> list[int]: ...
+
+    @abstractmethod
+    def incr(self, keys: list[str]): ...
+
+    @abstractmethod
+    def clear(self): ...
+
+
+class NullCache(CacheBackend):
+    """Caching disabled: nothing is ever stored."""
+
+    def get(self, key: str) -> bytes | None:
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float):
+        pass
+
+    def get_counters(self, keys: list[str]) -> list[int]:
+        return [0] * len(keys)
+
+    def incr(self, keys: list[str]):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LocalCache(CacheBackend):
+    """In-process LRU; counters only reach this worker's entries.
+
+    Only correct with a single worker: a write bumps the counters of the
+    worker that served it and no other.
+
+    A counter left untouched for longer than any entry can live is dropped.
+    Every entry stamped with it has expired by then, so it reads as 0 again
+    safely. If live counters still exceed `max_counters`, everything is
+    cleared, because evicting a live counter could revive stale entries.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, max_counters: int = 0):
+        self.max_entries = max_entries
+        self.max_counters = max_counters or 10 * max_entries
+        # Slack for entries stamped a while before they are stored.
+        self.counter_ttl = 2 * ttl
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        # key -> (value, last touched), least recently touched first.
+        self._counters: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_counters(self, keys: list[str]) -> list[int]:
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                counter = self._counters.get(key)
+                if counter is None:
+                    values.append(0)
+                    continue
+                values.append(counter[0])
+                self._counters[key] = (counter[0], now)
+                self._counters.move_to_end(key)
+            self._expire_counters(now)
+        return values
+
+    def incr(self, keys: list[str]):
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                value = self._counters.get(key, (0, now))[0]
+                self._counters[key] = (value + 1, now)
+                self._counters.move_to_end(key)
+            self._expire_counters(now)
+
+    def _expire_counters(self, now: float):
+        while self._counters:
+            key, (_, touched) = next(iter(self._counters.items()))
+            if now - touched <= self.counter_ttl:
+                break
+            del self._counters[key]
+        if len(self._counters) > self.max_counters:
+            self._entries.clear()
+            self._counters.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisCache(CacheBackend):
+    """Backend speaking the Redis protocol, shared by every worker.
+
+    Each thread keeps its own connection; commands for one call are
+    pipelined into a single round trip.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._local.sock = sock
+        self._local.reader = sock.makefile("rb")
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", str(self.db)))
+        if setup:
+            self._send(setup)
+
+    def _send(self, commands: list[tuple]) -> list:
+        payload = bytearray()
+        for command in commands:
+            payload += b"*%d\r\n" % len(command)
+            for arg in command:
+                arg = arg if isinstance(arg, bytes) else str(arg).encode()
+                payload += b"$%d\r\n%s\r\n" % (len(arg), arg)
+        self._local.sock.sendall(payload)
+        # Read every reply before raising, so an error halfway through a
+        # pipeline cannot leave replies behind for the next call.
+        replies = [self._read() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def _read(self):
+        line = self._local.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            return RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            return self._local.reader.read(length + 2)[:-2]
+        if kind == b"*":
+            return [self._read() for _ in range(int(rest))]
+        raise RedisError(f"Unexpected reply {line!r}")
+
+    def _execute(self, commands: list[tuple]) -> list:
+        try:
+            if getattr(self._local, "sock", None) is None:
+                self._connect()
+            return self._send(commands)
+        except Exception:
+            # Drop the connection on any failure, so a half-read pipeline
+            # never hands its replies to the next call; it reconnects.
+            self._close()
+            raise
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            self._local.reader.close()
+            sock.close()
+        self._local.sock = None
+
+    def get(self, key: str) -> bytes | None:
+        return self._execute([("GET", key)])[0]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._execute([("SET", key, value, "PX", int(ttl * 1000))])
+
+    def get_counters(self, keys: list[str]) -> list[int]:
+        if not keys:
+            return []
+        values = self._execute([("MGET", *keys)])[0]
+        return [int(value) if value is not None else 0 for value in values]
+
+    def incr(self, keys: list[str]):
+        if keys:
+            self._execute([("INCR", key) for key in keys])
+
+    def clear(self):
+        self._execute([("FLUSHDB",)])
+
+
+def build_cache(
+    name: str, url: str, max_entries: int, ttl: float, workers: int = 1
+) -> CacheBackend:
+    if name == "none":
+        return NullCache()
+    if name == "local":
+        if workers > 1:
+            # Other workers would keep serving entries this one invalidated.
+            raise ValueError(
+                "The local cache backend only supports a single worker; "
+                "use redis or none"
+            )
+        return LocalCache(max_entries, ttl)
+    if name == "redis":
+        return RedisCache(url)
+    raise ValueError(f"Unknown cache backend: {name}")
@@ -0,0 +1,275 @@
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from functools import partial
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+
+class _Gzip:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, body: bytes) -> bytes:
+        # mtime=0 keeps the output stable for the compressed body cache.
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+    def stream(self):
+        return _Stream(
+            zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS),
+            lambda c: c.flush(zlib.Z_SYNC_FLUSH),
+            lambda c: c.flush(),
+        )
+
+
+class _Brotli:
+    name = "br"
+
+    def __init__(self, level: int):
+        self.level = min(level, 11)
+
+    def compress(self, body: bytes) -> bytes:
+        return brotli.compress(body, quality=self.level)
+
+    def stream(self):
+        compressor = brotli.Compressor(quality=self.level)
+        return _Stream(
+            compressor,
+            lambda c: c.flush(),
+            lambda c: c.finish(),
+            compress=compressor.process,
+        )
+
+
+class _Zstd:
+    name = "zstd"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, body: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(body)
+
+    def stream(self):
+        return _Stream(
+            zstandard.ZstdCompressor(level=self.level).compressobj(),
+            lambda c: c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            lambda c: c.flush(),
+        )
+
+
+class _Stream:
+    """Incremental compressor that flushes after every chunk.
+
+    Flushing costs some ratio but lets clients decode each chunk as it
+    arrives, which event streams depend on.
+    """
+
+    def __init__(self, compressor, flush, finish, compress=None):
+        self._compressor = compressor
+        self._compress = compress or compressor.compress
+        self._flush = flush
+        self._finish = finish
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compress(data) + self._flush(self._compressor)
+
+    def finish(self) -> bytes:
+        return self._finish(self._compressor)
+
+
+def available_encoders(level: int) -> dict:
+    """Encoders this process can use, most preferred first."""
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = _Zstd(level)
+    if brotli is not None:
+        encoders["br"] = _Brotli(level)
+    encoders["gzip"] = _Gzip(level)
+    return encoders
+
+
+def _accepted(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by encoding and body digest.
+
+    Hashing is far cheaper than compressing, so identical responses (the same
+    listing fetched by many clients) are compressed once.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def compress(self, encoder, body: bytes) -> bytes:
+        if self.max_bytes <= 0:
+            return encoder.compress(body)
+        key = (encoder.name, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                return compressed
+
+        compressed = encoder.compress(body)
+        if len(compressed) > self.max_bytes:
+            return compressed
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = compressed
+                self._size += len(compressed)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return compressed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class CompressionMiddleware:
+    """Compress responses with the best encoding the client accepts.
+
+    Only allowlisted content types of at least `minimum_size` bytes are
+    compressed; streaming responses are compressed chunk by chunk. Bodies
+    and chunks of `offload_size` bytes or more are compressed in a worker
+    thread so they do not stall the event loop. Responses that already
+    carry a Content-Encoding are left alone.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        level: int = 6,
+        content_types: list[str] | None = None,
+        cache_bytes: int = 0,
+        offload_size: int = 256 * 1024,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.encoders = available_encoders(level)
+        self.content_types = set(content_types or ["application/json"])
+        self.cache = CompressedBodyCache(cache_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted(Headers(scope=scope).get("accept-encoding", ""))
+        encoder = next(
+            (e for name, e in self.encoders.items() if name in accepted), None
+        )
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _Responder(self, encoder, send))
+
+
+class _Responder:
+    def __init__(self, middleware: CompressionMiddleware, encoder, send: Send):
+        self.middleware = middleware
+        self.encoder = encoder
+        self.send = send
+        self.start: Message | None = None
+        # None until the first body message decides how to answer.
+        self.stream: _Stream | None = None
+        self.passthrough = False
+
+    async def _compress(self, compress, data: bytes) -> bytes:
+        if len(data) >= self.middleware.offload_size:
+            return await anyio.to_thread.run_sync(compress, data)
+        return compress(data)
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").split(";")[0].strip()
+            if (
+                "content-encoding" in headers
+                or content_type not in self.middleware.content_types
+            ):
+                self.passthrough = True
+                await self.send(message)
+                return
+            MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            self.start = message
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is not None:
+            data = await self._compress(self.stream.chunk, body) if body else b""
+            if not more_body:
+                data += self.stream.finish()
+            await self.send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+            return
+
+        start, self.start = self.start, None
+        headers = MutableHeaders(raw=start["headers"])
+        if not more_body:
+            if len(body) < self.middleware.minimum_size:
+                await self.send(start)
+                await self.send(message)
+                return
+            body = await self._compress(
+                partial(self.middleware.cache.compress, self.encoder), body
+            )
+            headers["Content-Encoding"] = self.encoder.name
+            headers["Content-Length"] = str(len(body))
+            await self.send(start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        # The full size is unknown; compress whatever the stream produces.
+        self.stream = self.encoder.stream()
+        headers["Content-Encoding"] = self.encoder.name
+        del headers["Content-Length"]
+        data = await self._compress(self.stream.chunk, body) if body else b""
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": data, "more_body": True})
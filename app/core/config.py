@@ -16,6 +16,88 @@ class ApplicationSettings(BaseSettings):
     STRIPE_ANNUAL_PRICE_ID: str = "your-stripe-annual-price-id"
     STRIPE_SUCCESS_URL: str = "http://localhost:3000/success"
     STRIPE_CANCEL_URL: str = "http://localhost:3000/cancel"
+    STRIPE_API_BASE: str = "https://api.stripe.com"
+    STRIPE_TIMEOUT_SECONDS: float = 10.0
+    STRIPE_MAX_CONCURRENCY: int = 8
+    STRIPE_MAX_RETRIES: int = 2
+    STRIPE_RETRY_BACKOFF_SECONDS: float = 0.25
+    STRIPE_RETRY_MAX_BACKOFF_SECONDS: float = 2.0
+    STRIPE_BREAKER_FAILURES: int = 5
+    STRIPE_BREAKER_RESET_SECONDS: float = 30.0
+    STRIPE_SESSION_CACHE_SECONDS: float = 5.0
+    STRIPE_WEBHOOK_SECRET: str = "your-stripe-webhook-secret"
+    STRIPE_EVENT_WORKERS: int = 2
+    STRIPE_EVENT_POLL_SECONDS: float = 5.0
+    STRIPE_EVENT_MAX_ATTEMPTS: int = 5
+    STRIPE_EVENT_RETRY_BACKOFF_SECONDS: float = 30.0
+
+    SUBSCRIPTION_SWEEP_INTERVAL_SECONDS: float = 60.0
+    SUBSCRIPTION_SWEEP_BATCH_SIZE: int = 1000
+    SUBSCRIPTION_SWEEP_MAX_BATCHES: int = 100
+    # Stripe bills on its own cycle, which can run past the local end date.
+    SUBSCRIPTION_EXPIRY_GRACE_SECONDS: float = 3 * 24 * 60 * 60
+
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    EVENTS_TRANSPORT: str = "local"
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+
+    ACTIVITY_QUEUE_SIZE: int = 10000
+    ACTIVITY_BATCH_SIZE: int = 500
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 1.0
+
+    TASK_RANK_MAX_LENGTH: int = 16
+    TASK_GRAPH_CACHE_SIZE: int = 256
+
+    ACCESS_INDEX_SIZE: int = 10000
+    ACCESS_INDEX_TTL_SECONDS: float = 60.0
+
+    FAST_JSON_RESPONSES: bool = False
+
+    ENTITLEMENT_CACHE_SIZE: int = 100000
+    ENTITLEMENT_TTL_SECONDS: float = 60.0
+    ENTITLEMENT_NEGATIVE_TTL_SECONDS: float = 2.0
+
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "application/json",
+        "text/csv",
+        "text/plain",
+        "text/event-stream",
+    ]
+    COMPRESSION_CACHE_BYTES: int = 32 * 1024 * 1024
+    COMPRESSION_OFFLOAD_SIZE: int = 256 * 1024
+
+    RESPONSE_CACHE_BACKEND: str = "local"
+    RESPONSE_CACHE_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_SIZE: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+    # Read by uvicorn and gunicorn as the default worker count.
+    WEB_CONCURRENCY: int = 1
+
+    BATCH_MAX_REQUESTS: int = 20
+
+    # Limits start at the maximum, which together match AnyIO's 40 threads.
+    ADMISSION_LIMITS: dict[str, int] = {
+        "auth": 4,
+        "reads": 24,
+        "writes": 6,
+        "imports": 2,
+        "stripe": 4,
+    }
+    ADMISSION_TARGET_LATENCY_SECONDS: dict[str, float] = {
+        "auth": 0.5,
+        "reads": 0.2,
+        "writes": 0.3,
+        "imports": 30.0,
+        "stripe": 2.0,
+    }
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 1.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
 
     TEST_DATABASE_URL: str = "sqlite:///:memory:"
 
@@ -0,0 +1,293 @@
+import asyncio
+import json
+import logging
+import queue
+import select
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+# Published when team membership or project ownership changes; never sent to
+# clients. Data lists the affected "users" and "teams".
+ACCESS_CHANGED = "access.changed"
+
+
+@dataclass
+class Event:
+    type: str
+    project_id: str | None
+    owner_id: str | None = None
+    data: dict = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "Event":
+        return cls(**json.loads(payload))
+
+
+class Transport(ABC):
+    """Carries published events to the broker of every worker."""
+
+    @abstractmethod
+    async def start(self, deliver: Callable[[Event], None]): ...
+
+    @abstractmethod
+    def publish(self, event: Event): ...
+
+    async def stop(self):
+        pass
+
+
+class LocalTransport(Transport):
+    """Single-process transport: events only reach this worker's subscribers."""
+
+    async def start(self, deliver: Callable[[Event], None]):
+        self._loop = asyncio.get_running_loop()
+        self._deliver = deliver
+
+    def publish(self, event: Event):
+        self._loop.call_soon_threadsafe(self._deliver, event)
+
+
+class PostgresTransport(Transport):
+    """Cross-worker transport over PostgreSQL LISTEN/NOTIFY.
+
+    Request threads only queue events. A publisher thread sends whatever
+    has queued up in one NOTIFY round trip over its own connection, and a
+    listener thread delivers notifications from every worker.
+    """
+
+    channel = "app_events"
+    max_payload = 7900
+    max_batch = 100
+
+    def __init__(self, engine, queue_size: int = 10000):
+        self._engine = engine
+        self._stopping = threading.Event()
+        self._outbox: queue.Queue[str | None] = queue.Queue(queue_size)
+        self.dropped = 0
+
+    async def start(self, deliver: Callable[[Event], None]):
+        self._loop = asyncio.get_running_loop()
+        self._deliver = deliver
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._listen, name="events-listener", daemon=True
+        )
+        self._thread.start()
+        self._publisher = threading.Thread(
+            target=self._publish_queued, name="events-publisher", daemon=True
+        )
+        self._publisher.start()
+
+    def publish(self, event: Event):
+        payload = event.to_json()
+        if len(payload) > self.max_payload:
+            # NOTIFY payloads are capped at 8000 bytes; send ids only and let
+            # clients refetch the row.
+            event = Event(event.type, event.project_id, event.owner_id, {})
+            payload = event.to_json()
+        try:
+            self._outbox.put_nowait(payload)
+        except queue.Full:
+            # Clients that miss an event catch up through the sync API.
+            self.dropped += 1
+
+    async def stop(self):
+        # Events queued before the sentinel are still sent.
+        await asyncio.to_thread(self._outbox.put, None)
+        await asyncio.to_thread(self._publisher.join, 5)
+        self._stopping.set()
+        await asyncio.to_thread(self._thread.join, 5)
+
+    def _connect(self):
+        connection = self._engine.raw_connection()
+        connection.detach()
+        connection.dbapi_connection.autocommit = True
+        return connection
+
+    def _publish_queued(self):
+        connection = None
+        stopping = False
+        while not stopping:
+            payloads = [self._outbox.get()]
+            while len(payloads) < self.max_batch and not self._outbox.empty():
+                payloads.append(self._outbox.get_nowait())
+            if None in payloads:
+                stopping = True
+                payloads = payloads[: payloads.index(None)]
+            if not payloads:
+                continue
+            try:
+                if connection is None:
+                    connection = self._connect()
+                connection.cursor().execute(
+                    "SELECT pg_notify(%(channel)s, payload)"
+                    " FROM unnest(%(payloads)s::text[]) AS payload",
+                    {"channel": self.channel, "payloads": payloads},
+                )
+            except Exception:
+                logger.exception("Failed to publish %d events", len(payloads))
+                self.dropped += len(payloads)
+                if connection is not None:
+                    connection.close()
+                connection = None
+        if connection is not None:
+            connection.close()
+
+    def _listen(self):
+        connection = self._connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"LISTEN {self.channel}")
+            dbapi_connection = connection.dbapi_connection
+            while not self._stopping.is_set():
+                if select.select([dbapi_connection], [], [], 1.0) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    self._loop.call_soon_threadsafe(
+                        self._deliver, Event.from_json(notify.payload)
+                    )
+        finally:
+            connection.close()
+
+
+class Subscriber:
+    def __init__(
+        self,
+        user_id: UUID,
+        project_ids: set[UUID],
+        queue_size: int,
+        team_ids: set[UUID] = frozenset(),
+    ):
+        self.user_id = str(user_id)
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=queue_size)
+        self.dropped = asyncio.Event()
+        # Set when the user's access may have changed; the consumer reloads it
+        # before sending anything else.
+        self.stale = False
+        self.set_access(project_ids, team_ids)
+
+    def set_access(self, project_ids: set[UUID], team_ids: set[UUID]):
+        self.project_ids = {str(project_id) for project_id in project_ids}
+        self.team_ids = {str(team_id) for team_id in team_ids}
+        # Events already queued were admitted under the old access.
+        self.recheck = self.queue.qsize()
+
+    def affected_by(self, event: Event) -> bool:
+        if "users" not in event.data:
+            # Trimmed to fit a NOTIFY payload; assume everyone is affected.
+            return True
+        return self.user_id in event.data["users"] or not self.team_ids.isdisjoint(
+            event.data["teams"]
+        )
+
+    def visible(self, event: Event) -> bool:
+        return (
+            event.type == "project.deleted"
+            or event.owner_id == self.user_id
+            or event.project_id in self.project_ids
+        )
+
+    def checked(self, event: Event) -> Event | None:
+        """The event, or None if it was queued before a loss of access."""
+        if self.recheck:
+            self.recheck -= 1
+            if not self.visible(event):
+                return None
+        return event
+
+    def wants(self, event: Event) -> bool:
+        if event.owner_id == self.user_id:
+            if event.type == "project.created":
+                self.project_ids.add(event.project_id)
+            elif event.type == "project.imported":
+                self.project_ids.update(event.data["ids"])
+            return True
+        return event.project_id in self.project_ids
+
+    def offer(self, event: Event) -> bool:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped.set()
+            return False
+        if event.type == "project.deleted":
+            self.project_ids.discard(event.project_id)
+        return True
+
+
+class EventBroker:
+    """In-process fan-out of change events to bounded per-connection queues.
+
+    Consumers that fall behind are dropped instead of buffering without
+    bound; they reconnect and catch up through the sync API.
+    """
+
+    def __init__(self):
+        self._subscribers: set[Subscriber] = set()
+        self._transport: Transport | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._transport is not None
+
+    async def start(self, transport: Transport):
+        await transport.start(self._deliver)
+        self._transport = transport
+
+    async def stop(self):
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            await transport.stop()
+        for subscriber in self._subscribers:
+            subscriber.dropped.set()
+        self._subscribers.clear()
+
+    def publish(self, event: Event):
+        # Called from request threads; a stopped broker silently drops events.
+        if self._transport is not None:
+            self._transport.publish(event)
+
+    def subscribe(
+        self,
+        user_id: UUID,
+        project_ids: set[UUID],
+        queue_size: int,
+        team_ids: set[UUID] = frozenset(),
+    ) -> Subscriber:
+        subscriber = Subscriber(user_id, project_ids, queue_size, team_ids)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def _deliver(self, event: Event):
+        if event.type == ACCESS_CHANGED:
+            for subscriber in self._subscribers:
+                if subscriber.affected_by(event):
+                    subscriber.stale = True
+            return
+        for subscriber in list(self._subscribers):
+            if subscriber.wants(event) and not subscriber.offer(event):
+                self._subscribers.discard(subscriber)
+
+
+broker = EventBroker()
+
+
+def build_transport(name: str, engine) -> Transport:
+    if name == "local":
+        return LocalTransport()
+    if name == "postgres":
+        return PostgresTransport(engine)
+    raise ValueError(f"Unknown events transport: {name}")
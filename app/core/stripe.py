@@ -0,0 +1,182 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, TypeVar
+
+import stripe
+from fastapi import HTTPException, status
+
+from app.core import app_settings
+
+T = TypeVar("T")
+
+stripe.api_key = app_settings.STRIPE_SECRET_KEY
+# Overridden to run against the local stand-in in benchmarks/fake_stripe.py.
+stripe.api_base = app_settings.STRIPE_API_BASE
+# The SDK timeout is what frees a worker thread stuck on a slow response.
+stripe.default_http_client = stripe.new_default_http_client(
+    timeout=app_settings.STRIPE_TIMEOUT_SECONDS
+)
+# Retries happen in call_stripe, where the circuit breaker can see them.
+stripe.max_network_retries = 0
+
+# At most STRIPE_MAX_CONCURRENCY Stripe calls are in flight per worker. The
+# caller still blocks while its call is queued and running: the subscription
+# endpoints reach call_stripe through run_in_threadpool, so each one holds a
+# request threadpool thread for up to two STRIPE_TIMEOUT_SECONDS plus
+# RUNNING_GRACE_SECONDS. What this executor bounds is the number of
+# concurrent calls to Stripe, not how long those threads are held.
+_executor = ThreadPoolExecutor(
+    max_workers=app_settings.STRIPE_MAX_CONCURRENCY, thread_name_prefix="stripe"
+)
+# Slack on top of the SDK timeout for a call that has already started.
+RUNNING_GRACE_SECONDS = 1.0
+
+
+class QueuedTimeout(FutureTimeoutError):
+    """No executor thread was free in time; the call never reached Stripe."""
+
+
+# Failures that say nothing about the request itself; they count against the
+# circuit breaker.
+PROVIDER_ERRORS = (
+    stripe.APIConnectionError,
+    stripe.APIError,
+    stripe.RateLimitError,
+    FutureTimeoutError,
+)
+# The subset a retry can fix. Stripe stores a 5xx under the idempotency key and
+# replays it, and a call that timed out while running may still land.
+RETRYABLE_ERRORS = (
+    stripe.APIConnectionError,
+    stripe.RateLimitError,
+    QueuedTimeout,
+)
+
+
+class CircuitBreaker:
+    """Fail fast after repeated provider failures.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    rejects calls for `reset_timeout` seconds. Then a single trial call is let
+    through: success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running:
+                return False
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or (
+                self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+
+
+breaker = CircuitBreaker(
+    app_settings.STRIPE_BREAKER_FAILURES, app_settings.STRIPE_BREAKER_RESET_SECONDS
+)
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter keeps retries from many workers from lining up.
+    cap = min(
+        app_settings.STRIPE_RETRY_MAX_BACKOFF_SECONDS,
+        app_settings.STRIPE_RETRY_BACKOFF_SECONDS * 2**attempt,
+    )
+    return random.uniform(0, cap)
+
+
+def _call_once(fn: Callable[..., T], args, kwargs) -> T:
+    started = threading.Event()
+
+    def run():
+        started.set()
+        return fn(*args, **kwargs)
+
+    future = _executor.submit(run)
+    # A call still queued when the timeout expires is cancelled and never
+    # reaches Stripe.
+    if not started.wait(app_settings.STRIPE_TIMEOUT_SECONDS) and future.cancel():
+        raise QueuedTimeout()
+    # A running call cannot be cancelled. The SDK's HTTP timeout ends it, so
+    # wait for that instead of returning while the thread is still busy.
+    return future.result(
+        timeout=app_settings.STRIPE_TIMEOUT_SECONDS + RUNNING_GRACE_SECONDS
+    )
+
+
+def call_stripe(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run a Stripe SDK call on the bounded executor.
+
+    Connection errors, rate limits and calls that never left the queue are
+    retried with exponential backoff, so calls that create or change objects
+    must pass an `idempotency_key`. Errors caused by
+    the request itself (invalid parameters, declined cards) are raised as is.
+    """
+    if not breaker.allow():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Payment provider unavailable",
+        )
+
+    attempt = 0
+    while True:
+        try:
+            result = _call_once(fn, args, kwargs)
+        except PROVIDER_ERRORS as e:
+            breaker.record_failure()
+            if (
+                not isinstance(e, RETRYABLE_ERRORS)
+                or attempt >= app_settings.STRIPE_MAX_RETRIES
+                or not breaker.allow()
+            ):
+                if isinstance(e, FutureTimeoutError):
+                    raise HTTPException(
+                        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                        detail="Payment provider timed out",
+                    )
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail="Payment provider error",
+                )
+            time.sleep(_backoff(attempt))
+            attempt += 1
+            continue
+        except Exception:
+            # Stripe answered (or the call itself is broken); either way the
+            # provider is not what failed.
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
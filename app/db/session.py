@@ -1,12 +1,21 @@
+from contextvars import ContextVar
 from sqlalchemy import create_engine
 from ..core import app_settings
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 engine = create_engine(app_settings.DATABASE_URL, echo=app_settings.DEBUG)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Set by the batch endpoint so its sequential sub-requests share one session.
+shared_session: ContextVar[Session | None] = ContextVar("shared_session", default=None)
+
 
 def get_db():
+    db = shared_session.get()
+    if db is not None:
+        # Closed by whoever shared it.
+        yield db
+        return
     db = SessionLocal()
     try:
         yield db
@@ -0,0 +1,112 @@
+import logging
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+
+from app.core import app_settings
+from app.db.session import SessionLocal
+from app.models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ActivityWriter:
+    """Background writer that batches activity entries into multi-row INSERTs.
+
+    Request threads only enqueue; when the queue is full the entry is dropped
+    and counted rather than slowing the request down.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_queue: int = app_settings.ACTIVITY_QUEUE_SIZE,
+        batch_size: int = app_settings.ACTIVITY_BATCH_SIZE,
+        flush_interval: float = app_settings.ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    ):
+        self._session_factory = session_factory
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._thread: threading.Thread | None = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="activity-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 30):
+        """Flush everything still queued and stop the writer thread."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def record(self, entry: dict):
+        if self._thread is None:
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        batch: list[dict] = []
+        deadline = time.monotonic() + self._flush_interval
+        while True:
+            try:
+                entry = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                entry = None
+
+            if entry is _STOP:
+                self._drain(batch)
+                self._flush(batch)
+                return
+            if entry is not None:
+                batch.append(entry)
+
+            if len(batch) >= self._batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self._flush_interval
+
+    def _drain(self, batch: list[dict]):
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if entry is not _STOP:
+                batch.append(entry)
+
+    def _flush(self, batch: list[dict]):
+        for start in range(0, len(batch), self._batch_size):
+            chunk = batch[start : start + self._batch_size]
+            db = self._session_factory()
+            try:
+                db.execute(insert(ActivityLog), chunk)
+                db.commit()
+                self.written += len(chunk)
+            except Exception:
+                db.rollback()
+                self.failed += len(chunk)
+                logger.exception("Failed to write %d activity entries", len(chunk))
+            finally:
+                db.close()
+
+
+activity_writer = ActivityWriter()
@@ -0,0 +1,77 @@
+import logging
+import threading
+
+from app.core import app_settings
+from app.db.session import SessionLocal
+from app.services.stripe_events import process_next_stripe_event
+
+logger = logging.getLogger(__name__)
+
+
+class StripeEventWorkers:
+    """Thread pool applying stored Stripe webhook events.
+
+    Workers are woken when the webhook stores an event and otherwise poll the
+    inbox, which also picks up events stored by other processes.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        workers: int = app_settings.STRIPE_EVENT_WORKERS,
+        poll_interval: float = app_settings.STRIPE_EVENT_POLL_SECONDS,
+    ):
+        self._session_factory = session_factory
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self):
+        if self._threads:
+            return
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"stripe-events-{i}", daemon=True)
+            for i in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float | None = 30):
+        threads, self._threads = self._threads, []
+        self._stopping.set()
+        self._wake.set()
+        for thread in threads:
+            thread.join(timeout)
+
+    def notify(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            # Clear first so an event stored while processing is not missed.
+            self._wake.clear()
+            if not self._process_pending():
+                self._wake.wait(self._poll_interval)
+
+    def _process_pending(self) -> bool:
+        db = self._session_factory()
+        try:
+            processed = False
+            while not self._stopping.is_set() and process_next_stripe_event(db):
+                processed = True
+            return processed
+        except Exception:
+            logger.exception("Stripe event worker failed")
+            return False
+        finally:
+            db.close()
+
+
+stripe_event_workers = StripeEventWorkers()
@@ -0,0 +1,117 @@
+import logging
+import sys
+import threading
+import time
+
+from app.core import app_settings
+from app.db.session import SessionLocal
+from app.services.subscription import deactivate_expired_subscriptions
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionSweeper:
+    """Periodically deactivates subscriptions whose end date has passed.
+
+    Each sweep works in batches of `batch_size` rows, one transaction each,
+    until a batch comes back short or `max_batches` have run.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        interval: float = app_settings.SUBSCRIPTION_SWEEP_INTERVAL_SECONDS,
+        batch_size: int = app_settings.SUBSCRIPTION_SWEEP_BATCH_SIZE,
+        max_batches: int = app_settings.SUBSCRIPTION_SWEEP_MAX_BATCHES,
+    ):
+        self._session_factory = session_factory
+        self._interval = interval
+        self._batch_size = batch_size
+        self._max_batches = max_batches
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.sweeps = 0
+        self.batches = 0
+        self.deactivated = 0
+        self.failed = 0
+        self.last_sweep_at: float | None = None
+        self.last_sweep_seconds: float | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def metrics(self) -> dict:
+        return {
+            "sweeps": self.sweeps,
+            "batches": self.batches,
+            "deactivated": self.deactivated,
+            "failed": self.failed,
+            "last_sweep_at": self.last_sweep_at,
+            "last_sweep_seconds": self.last_sweep_seconds,
+        }
+
+    def start(self):
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="subscription-sweeper", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 30):
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            thread.join(timeout)
+
+    def sweep(self) -> int:
+        started = time.monotonic()
+        deactivated = 0
+        db = self._session_factory()
+        try:
+            for _ in range(self._max_batches):
+                if self._stopping.is_set():
+                    break
+                count = deactivate_expired_subscriptions(db, self._batch_size)
+                self.batches += 1
+                deactivated += count
+                if count < self._batch_size:
+                    break
+        except Exception:
+            db.rollback()
+            self.failed += 1
+            logger.exception("Subscription sweep failed")
+        finally:
+            db.close()
+
+        self.sweeps += 1
+        self.deactivated += deactivated
+        self.last_sweep_at = time.time()
+        self.last_sweep_seconds = time.monotonic() - started
+        if deactivated:
+            logger.info(
+                "Deactivated %d expired subscriptions in %.2fs",
+                deactivated,
+                self.last_sweep_seconds,
+            )
+        return deactivated
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self.sweep()
+            self._stopping.wait(self._interval)
+
+
+subscription_sweeper = SubscriptionSweeper()
+
+
+# Runs one sweep by hand, e.g. after downtime:
+#
+#   python -m app.jobs.subscriptions
+def main(argv: list[str]):
+    print(SubscriptionSweeper(max_batches=sys.maxsize).sweep())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
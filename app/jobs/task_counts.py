@@ -0,0 +1,25 @@
+import sys
+from uuid import UUID
+
+from app.db.session import SessionLocal
+from app.services.counters import rebuild_project_task_counts
+
+
+# Repair job for the per-project status counters. Run it from cron or by hand:
+#
+#   python -m app.jobs.task_counts [project_id ...]
+#
+# Without arguments every project is recomputed from the tasks table.
+def main(argv: list[str]):
+    db = SessionLocal()
+    try:
+        if not argv:
+            rebuild_project_task_counts(db)
+        for project_id in argv:
+            rebuild_project_task_counts(db, UUID(project_id))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
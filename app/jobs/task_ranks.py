@@ -0,0 +1,41 @@
+import sys
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models import Task
+from app.models.task import TaskStatus
+from app.services.task import rebalance_task_ranks
+
+
+def rebalance_column(project_id: UUID, task_status: TaskStatus):
+    """Background entry point: respace one column in its own session."""
+    db = SessionLocal()
+    try:
+        rebalance_task_ranks(db, project_id, task_status)
+    finally:
+        db.close()
+
+
+# Respaces task ranks. Run it by hand after bulk changes:
+#
+#   python -m app.jobs.task_ranks [project_id ...]
+#
+# Without arguments every column of every project is rebalanced.
+def main(argv: list[str]):
+    db = SessionLocal()
+    try:
+        query = select(Task.project_id, Task.status).distinct()
+        if argv:
+            query = query.where(
+                Task.project_id.in_([UUID(project_id) for project_id in argv])
+            )
+        for project_id, task_status in db.execute(query).all():
+            rebalance_task_ranks(db, project_id, task_status)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,8 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 
 from .core import app_settings
+from .core.admission import AdmissionMiddleware, build_limiters
+from .core.compression import CompressionMiddleware
+from .core.events import broker, build_transport
+from .db import engine
+from .jobs.activity import activity_writer
+from .jobs.stripe_events import stripe_event_workers
+from .jobs.subscriptions import subscription_sweeper
 from .utils import create_tables
 from .api.v1.endpoints import (
     auth_router,
@@ -10,6 +18,10 @@ from .api.v1.endpoints import (
     projects_router,
     tasks_router,
     teams_router,
+    imports_router,
+    sync_router,
+    events_router,
+    batch_router,
 )
 
 
@@ -19,7 +31,16 @@ from .api.v1.endpoints import (
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_tables()
+    await broker.start(build_transport(app_settings.EVENTS_TRANSPORT, engine))
+    activity_writer.start()
+    stripe_event_workers.start()
+    subscription_sweeper.start()
     yield
+    await broker.stop()
+    await run_in_threadpool(subscription_sweeper.stop)
+    await run_in_threadpool(stripe_event_workers.stop)
+    # Flush buffered activity entries before the process exits.
+    await run_in_threadpool(activity_writer.stop)
 
 
 app = FastAPI(
@@ -35,12 +56,27 @@ app.include_router(
 app.include_router(projects_router, prefix="/api/v1/projects", tags=["Projects"])
 app.include_router(tasks_router, prefix="/api/v1/tasks", tags=["tasks"])
 app.include_router(teams_router, prefix="/api/v1/teams", tags=["Teams"])
+app.include_router(imports_router, prefix="/api/v1/import", tags=["Import"])
+app.include_router(sync_router, prefix="/api/v1/sync", tags=["Sync"])
+app.include_router(events_router, prefix="/api/v1/events", tags=["Events"])
+app.include_router(batch_router, prefix="/api/v1/batch", tags=["Batch"])
 
 
 # Include/Register API routers
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["Authentication"])
 
 
+# Shed load per route class before it reaches the threadpool.
+app.add_middleware(
+    AdmissionMiddleware,
+    limiters=build_limiters(
+        app_settings.ADMISSION_LIMITS,
+        app_settings.ADMISSION_TARGET_LATENCY_SECONDS,
+        app_settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+    retry_after=app_settings.ADMISSION_RETRY_AFTER_SECONDS,
+)
+
 # Set up CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -49,3 +85,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+
+# Compress large responses; streams are compressed chunk by chunk.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=app_settings.COMPRESSION_MINIMUM_SIZE,
+    level=app_settings.COMPRESSION_LEVEL,
+    content_types=app_settings.COMPRESSION_CONTENT_TYPES,
+    cache_bytes=app_settings.COMPRESSION_CACHE_BYTES,
+    offload_size=app_settings.COMPRESSION_OFFLOAD_SIZE,
+)
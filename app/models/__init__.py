@@ -4,3 +4,9 @@ from .project import Project
 from .task import Task
 from .team import Team
 from .team_members_association import TeamMember
+from .sync_change import SyncChange, SyncEntity
+from .project_task_count import ProjectTaskCount
+from .activity import ActivityLog
+from .task_dependency import TaskDependency
+from .task_graph_version import TaskGraphVersion
+from .stripe_event import StripeEvent
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import JSON, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+# Append-only: rows are never updated and outlive the entities they describe,
+# so there are deliberately no foreign keys.
+class ActivityLog(Base):
+    __tablename__ = "activity_log"
+    __table_args__ = (Index("ix_activity_log_project_id_id", "project_id", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    project_id: Mapped[UUID] = mapped_column(nullable=False)
+    actor_id: Mapped[UUID | None] = mapped_column(nullable=True)
+    entity: Mapped[str] = mapped_column(nullable=False)
+    entity_id: Mapped[UUID] = mapped_column(nullable=False)
+    action: Mapped[str] = mapped_column(nullable=False)
+    details: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc), nullable=False
+    )
@@ -13,7 +13,9 @@ class Project(Base):
     description: Mapped[str | None] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
     owner_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
-    team_id: Mapped[UUID | None] = mapped_column(ForeignKey("teams.id"), nullable=True)
+    team_id: Mapped[UUID | None] = mapped_column(
+        ForeignKey("teams.id"), nullable=True, index=True
+    )
 
     # Relationships
     owner = relationship("User", back_populates="projects")
@@ -0,0 +1,15 @@
+from uuid import UUID
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+from .task import TaskStatus
+
+
+class ProjectTaskCount(Base):
+    __tablename__ = "project_task_counts"
+
+    project_id: Mapped[UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    status: Mapped[TaskStatus] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(default=0, nullable=False)
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+# Inbox of verified Stripe webhook events. The Stripe event id is the primary
+# key, so redeliveries of the same event are stored once.
+class StripeEvent(Base):
+    __tablename__ = "stripe_events"
+    __table_args__ = (
+        Index(
+            "ix_stripe_events_processed_at_received_at", "processed_at", "received_at"
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(primary_key=True)
+    type: Mapped[str] = mapped_column(nullable=False)
+    # Id of the object the event is about, e.g. the checkout session.
+    object_id: Mapped[str | None] = mapped_column(nullable=True, index=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    received_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+    processed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    last_error: Mapped[str | None] = mapped_column(nullable=True)
+    # Failed events wait until then before they are claimed again.
+    next_attempt_at: Mapped[datetime | None] = mapped_column(nullable=True)
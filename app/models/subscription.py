@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from uuid import UUID, uuid4
 
-from sqlalchemy import Enum as SQLEnum, ForeignKey
+from sqlalchemy import Enum as SQLEnum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -15,10 +15,14 @@ class SubscriptionType(str, Enum):
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
+    # Serves the expiry sweep: active rows ordered by end date.
+    __table_args__ = (
+        Index("ix_subscriptions_is_active_end_date", "is_active", "end_date"),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, index=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
-    stripe_subscription_id: Mapped[str] = mapped_column(nullable=False)
+    stripe_subscription_id: Mapped[str] = mapped_column(nullable=False, index=True)
     subscription_type: Mapped[SubscriptionType] = mapped_column(
         SQLEnum(SubscriptionType), nullable=False
     )
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+from enum import Enum
+from uuid import UUID
+
+from sqlalchemy import Enum as SQLEnum, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class SyncEntity(str, Enum):
+    project = "project"
+    task = "task"
+
+
+# Latest change of every task/project, ordered by a monotonic sequence. Each
+# write replaces the entity's previous row, so the table holds one row per live
+# entity plus one tombstone per deleted entity.
+class SyncChange(Base):
+    __tablename__ = "sync_changes"
+    __table_args__ = (
+        Index("ix_sync_changes_owner_id_seq", "owner_id", "seq"),
+        Index("ix_sync_changes_project_id_seq", "project_id", "seq"),
+        # Never reuse the sequence of a replaced row.
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    entity: Mapped[SyncEntity] = mapped_column(SQLEnum(SyncEntity), nullable=False)
+    entity_id: Mapped[UUID] = mapped_column(unique=True, nullable=False)
+    project_id: Mapped[UUID] = mapped_column(nullable=False)
+    owner_id: Mapped[UUID] = mapped_column(nullable=False)
+    deleted: Mapped[bool] = mapped_column(default=False, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc), nullable=False
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from .base import Base
 from enum import Enum as PyEnum
@@ -14,6 +14,9 @@ class TaskStatus(PyEnum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_id_status_rank", "project_id", "status", "rank"),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, index=True, default=uuid4)
     title: Mapped[str] = mapped_column(nullable=False)
@@ -24,5 +27,11 @@ class Task(Base):
     updated_at: Mapped[datetime] = mapped_column(
         onupdate=datetime.now(timezone.utc), nullable=True, default=None
     )
+    version: Mapped[int] = mapped_column(default=1, nullable=False)
+    # Position within the (project_id, status) column; see app.utils.ranking.
+    rank: Mapped[str] = mapped_column(nullable=False)
 
     project = relationship("Project", back_populates="tasks")
+
+    # ORM flushes check and bump the version, so PUT edits detect conflicts too.
+    __mapper_args__ = {"version_id_col": version}
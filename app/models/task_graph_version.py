@@ -0,0 +1,16 @@
+from uuid import UUID
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+
+# Bumped by every write that changes a project's dependency graph (edges,
+# tasks, or whether a task is done). Cached graphs are tagged with it, and the
+# row lock taken by the bump serializes graph writes within a project.
+class TaskGraphVersion(Base):
+    __tablename__ = "task_graph_versions"
+
+    project_id: Mapped[UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    version: Mapped[int] = mapped_column(default=0, nullable=False)
@@ -8,4 +8,7 @@ class TeamMember(Base):
     __tablename__ = "team_members"
 
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
-    team_id: Mapped[UUID] = mapped_column(ForeignKey("teams.id"), primary_key=True)
+    # The primary key leads with user_id; team lookups need their own index.
+    team_id: Mapped[UUID] = mapped_column(
+        ForeignKey("teams.id"), primary_key=True, index=True
+    )
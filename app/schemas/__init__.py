@@ -4,8 +4,8 @@ from .subscription import (
     SubscriptionResponse,
     SubscriptionCheckoutInformation,
 )
-from .project import ProjectCreate, ProjectResponse, ProjectUpdate
-from .task import TaskCreate, TaskUpdate, TaskInDB
+from .project import ProjectCreate, ProjectResponse, ProjectUpdate, ProjectProgress
+from .task import TaskCreate, TaskUpdate, TaskPatch, TaskMove, TaskInDB
 from .team import (
     TeamBase,
     TeamCreate,
@@ -14,4 +14,21 @@ from .team import (
     RemoveTeamMember,
     Team,
     TeamWithMembers,
+    TeamSummary,
+    TeamSummaryPage,
+    TeamMembersBatch,
+    TeamMemberStatus,
+    TeamMemberOutcome,
+    TeamMembersBatchResult,
+)
+from .imports import ImportFormat, ImportRowError, ImportChunkReport, ImportReport
+from .sync import SyncResponse
+from .batch import BatchRequest, BatchRequestItem, BatchResponse, BatchResponseItem
+from .activity import ActivityEntry, ActivityPage
+from .dependency import (
+    TaskDependencyCreate,
+    TaskDependencyResponse,
+    ProjectTaskOrder,
+    ProjectBlockedTasks,
+    ProjectCriticalPath,
 )
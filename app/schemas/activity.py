@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+
+
+class ActivityEntry(BaseModel):
+    id: int
+    project_id: UUID
+    actor_id: UUID | None
+    entity: str
+    entity_id: UUID
+    action: str
+    details: dict
+    created_at: datetime
+
+
+class ActivityPage(BaseModel):
+    items: list[ActivityEntry]
+    next_before: int | None = None
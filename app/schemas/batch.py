@@ -0,0 +1,22 @@
+from typing import Any, Literal
+from pydantic import BaseModel, Field
+
+
+class BatchRequestItem(BaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    # Relative to /api/v1, e.g. "/projects/?limit=20".
+    path: str = Field(pattern=r"^/")
+    body: Any = None
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchRequestItem] = Field(min_length=1)
+
+
+class BatchResponseItem(BaseModel):
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: list[BatchResponseItem]
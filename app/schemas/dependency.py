@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from uuid import UUID
+
+
+class TaskDependencyCreate(BaseModel):
+    depends_on_id: UUID
+
+
+class TaskDependencyResponse(BaseModel):
+    task_id: UUID
+    depends_on_id: UUID
+    project_id: UUID
+
+
+class ProjectTaskOrder(BaseModel):
+    project_id: UUID
+    order: list[UUID]
+
+
+class ProjectBlockedTasks(BaseModel):
+    project_id: UUID
+    blocked: list[UUID]
+
+
+class ProjectCriticalPath(BaseModel):
+    project_id: UUID
+    path: list[UUID]
+    length: int
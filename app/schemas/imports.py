@@ -0,0 +1,28 @@
+from enum import Enum
+from pydantic import BaseModel
+
+
+class ImportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportChunkReport(BaseModel):
+    chunk: int
+    rows: int
+    imported: int
+    failed: int
+
+
+class ImportReport(BaseModel):
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    chunks: list[ImportChunkReport] = []
+    errors: list[ImportRowError] = []
+    errors_truncated: bool = False
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, UUID4
 from datetime import datetime
 from typing import Optional
+from app.models.task import TaskStatus
 
 
 class ProjectBase(BaseModel):
@@ -9,15 +10,23 @@ class ProjectBase(BaseModel):
 
 
 class ProjectCreate(ProjectBase):
-    pass
+    team_id: Optional[UUID4] = None
 
 
 class ProjectUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
+    team_id: Optional[UUID4] = None
 
 
 class ProjectResponse(ProjectBase):
     id: UUID4
     owner_id: UUID4
+    team_id: Optional[UUID4] = None
     created_at: datetime
+
+
+class ProjectProgress(BaseModel):
+    project_id: UUID4
+    total: int
+    counts: dict[TaskStatus, int]
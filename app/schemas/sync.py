@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from uuid import UUID
+from .project import ProjectResponse
+from .task import TaskInDB
+
+
+class SyncResponse(BaseModel):
+    cursor: str
+    has_more: bool
+    projects: list[ProjectResponse] = []
+    tasks: list[TaskInDB] = []
+    deleted_projects: list[UUID] = []
+    deleted_tasks: list[UUID] = []
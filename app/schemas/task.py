@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
@@ -19,8 +19,31 @@ class TaskUpdate(TaskBase):
     status: Optional[TaskStatus] = None
 
 
+class TaskPatch(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    version: int
+
+    @field_validator("title", "status")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("Field cannot be null")
+        return value
+
+
+class TaskMove(BaseModel):
+    status: Optional[TaskStatus] = None
+    # Neighbours at the destination; omit both to move to the end.
+    after_id: Optional[UUID] = None
+    before_id: Optional[UUID] = None
+
+
 class TaskInDB(TaskBase):
     id: UUID
     project_id: UUID
     created_at: datetime
     updated_at: Optional[datetime]
+    version: int
+    rank: str
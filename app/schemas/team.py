@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from enum import Enum
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from uuid import UUID
 
 
@@ -25,6 +26,19 @@ class Team(TeamInDBBase):
 
 class TeamWithMembers(TeamInDBBase):
     members: list[UUID]
+    # Pass as `members_after` to fetch the next page of members.
+    next_members_after: UUID | None = None
+
+
+class TeamSummary(TeamInDBBase):
+    member_count: int
+    project_count: int
+
+
+class TeamSummaryPage(BaseModel):
+    items: list[TeamSummary]
+    # Pass as `after` to fetch the next page.
+    next_after: UUID | None = None
 
 
 class TeamWithProjects(TeamInDBBase):
@@ -39,3 +53,35 @@ class AddTeamMember(BaseModel):
 class RemoveTeamMember(BaseModel):
     team_id: UUID
     user_to_remove_id: UUID
+
+
+class TeamMembersBatch(BaseModel):
+    team_id: UUID
+    user_ids: list[UUID] = Field(default_factory=list, max_length=1000)
+    emails: list[EmailStr] = Field(default_factory=list, max_length=1000)
+
+    @model_validator(mode="after")
+    def not_empty(self):
+        if not self.user_ids and not self.emails:
+            raise ValueError("Provide user_ids or emails")
+        return self
+
+
+class TeamMemberStatus(str, Enum):
+    ADDED = "added"
+    ALREADY_MEMBER = "already_member"
+    REMOVED = "removed"
+    NOT_MEMBER = "not_member"
+    NOT_FOUND = "not_found"
+    OWNER = "owner"
+
+
+class TeamMemberOutcome(BaseModel):
+    user_id: UUID | None = None
+    email: str | None = None
+    status: TeamMemberStatus
+
+
+class TeamMembersBatchResult(BaseModel):
+    team_id: UUID
+    results: list[TeamMemberOutcome]
@@ -5,17 +5,23 @@ from .subscription import (
     create_subscription,
     cancel_subscription,
     verify_user_subscription,
+    deactivate_expired_subscriptions,
 )
 from .projects import (
     create_project,
     get_project,
     get_user_projects,
+    get_project_progress,
+    get_project_activity,
     update_project,
     delete_project,
 )
 from .task import (
     create_task,
     update_task,
+    patch_task,
+    move_task,
+    rebalance_task_ranks,
     delete_task,
     get_tasks,
     get_task_by_id,
@@ -28,5 +34,20 @@ from .team import (
     delete_team,
     add_member_to_team,
     remove_member_from_team,
-    get_team_by_owned_by,
+    get_team_row,
+    get_team_summaries,
+    get_team_member_ids,
+    is_team_member,
+    add_members_to_team,
+    remove_members_from_team,
+)
+from .imports import import_rows, import_tasks_chunk, import_projects_chunk
+from .sync import get_changes
+from .counters import get_project_task_counts, rebuild_project_task_counts
+from .dependencies import (
+    add_task_dependency,
+    remove_task_dependency,
+    get_topological_order,
+    get_blocked_tasks,
+    get_critical_path,
 )
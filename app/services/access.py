@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core import app_settings
+from app.core.events import ACCESS_CHANGED, Event, broker
+from app.models import Project, Task, TeamMember, User
+
+
+@dataclass(frozen=True)
+class UserAccess:
+    team_ids: frozenset[UUID]
+    project_ids: frozenset[UUID]
+    owned_project_ids: frozenset[UUID]
+    expires_at: float
+
+    def can_access(self, project_id: UUID) -> bool:
+        return project_id in self.project_ids
+
+    def owns(self, project_id: UUID) -> bool:
+        return project_id in self.owned_project_ids
+
+
+# user_id -> access, least recently used first. Entries are built on first use
+# and dropped by the team and project services after every committed change.
+_index: OrderedDict[UUID, UserAccess] = OrderedDict()
+# team_id -> users with a cached entry listing that team.
+_team_users: dict[UUID, set[UUID]] = {}
+# Bumped on every invalidation, so a build that raced one is not cached.
+_generation = 0
+_lock = threading.Lock()
+
+
+def _load_access(db: Session, user_id: UUID) -> UserAccess:
+    team_ids = frozenset(
+        db.scalars(select(TeamMember.team_id).where(TeamMember.user_id == user_id))
+    )
+    condition = Project.owner_id == user_id
+    if team_ids:
+        condition = or_(condition, Project.team_id.in_(team_ids))
+    projects = db.execute(select(Project.id, Project.owner_id).where(condition))
+
+    project_ids, owned_project_ids = set(), set()
+    for project_id, owner_id in projects:
+        project_ids.add(project_id)
+        if owner_id == user_id:
+            owned_project_ids.add(project_id)
+
+    return UserAccess(
+        team_ids=team_ids,
+        project_ids=frozenset(project_ids),
+        owned_project_ids=frozenset(owned_project_ids),
+        # Other workers cannot invalidate this process; bound how stale it gets.
+        expires_at=time.monotonic() + app_settings.ACCESS_INDEX_TTL_SECONDS,
+    )
+
+
+def _forget(user_id: UUID):
+    access = _index.pop(user_id, None)
+    if access is None:
+        return
+    for team_id in access.team_ids:
+        users = _team_users.get(team_id)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del _team_users[team_id]
+
+
+def _store(user_id: UUID, access: UserAccess):
+    _forget(user_id)
+    _index[user_id] = access
+    for team_id in access.team_ids:
+        _team_users.setdefault(team_id, set()).add(user_id)
+    while len(_index) > app_settings.ACCESS_INDEX_SIZE:
+        _forget(next(iter(_index)))
+
+
+def get_user_access(db: Session, user_id: UUID) -> UserAccess:
+    with _lock:
+        access = _index.get(user_id)
+        if access is not None and access.expires_at > time.monotonic():
+            _index.move_to_end(user_id)
+            return access
+        generation = _generation
+
+    access = _load_access(db, user_id)
+    with _lock:
+        if generation == _generation:
+            _store(user_id, access)
+    return access
+
+
+def _announce(users: list[UUID] = (), teams: list[UUID | None] = ()):
+    # Open event streams in every worker reload their access.
+    broker.publish(
+        Event(
+            ACCESS_CHANGED,
+            None,
+            data={
+                "users": [str(user_id) for user_id in users],
+                "teams": [str(team_id) for team_id in teams if team_id],
+            },
+        )
+    )
+
+
+def invalidate_users(user_ids: Iterable[UUID]):
+    global _generation
+    user_ids = list(user_ids)
+    with _lock:
+        _generation += 1
+        for user_id in user_ids:
+            _forget(user_id)
+    _announce(users=user_ids)
+
+
+def invalidate_teams(team_ids: Iterable[UUID | None]):
+    global _generation
+    team_ids = list(team_ids)
+    with _lock:
+        _generation += 1
+        for team_id in team_ids:
+            for user_id in list(_team_users.get(team_id, ())):
+                _forget(user_id)
+    _announce(teams=team_ids)
+
+
+def reload_user_access(db: Session, user_id: UUID) -> UserAccess:
+    """Rebuild a user's entry, which another worker may have invalidated."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _forget(user_id)
+    return get_user_access(db, user_id)
+
+
+def clear_access_index():
+    global _generation
+    with _lock:
+        _generation += 1
+        _index.clear()
+        _team_users.clear()
+
+
+def can_access_project(db: Session, user: User, project_id: UUID) -> bool:
+    return get_user_access(db, user.id).can_access(project_id)
+
+
+def require_project_access(db: Session, user: User, project_id: UUID):
+    if not can_access_project(db, user, project_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+        )
+
+
+def authorize_task(db: Session, user: User, task_id: UUID) -> UUID:
+    """Return the task's project id, or 404 if the user cannot reach it."""
+    project_id = db.scalar(select(Task.project_id).where(Task.id == task_id))
+    if project_id is None or not can_access_project(db, user, project_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    return project_id
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from app.jobs.activity import activity_writer
+from app.models import Project, Task
+
+# Entries are recorded after the commit succeeds and written asynchronously,
+# so an entry never describes a rolled-back change and never blocks a request.
+
+
+def record_activity(
+    project_id: UUID,
+    actor_id: UUID | None,
+    entity: str,
+    entity_id: UUID,
+    action: str,
+    **details,
+):
+    activity_writer.record(
+        {
+            "project_id": project_id,
+            "actor_id": actor_id,
+            "entity": entity,
+            "entity_id": entity_id,
+            "action": action,
+            "details": details,
+            "created_at": datetime.now(timezone.utc),
+        }
+    )
+
+
+def record_project_activity(
+    project: Project, actor_id: UUID | None, action: str, **details
+):
+    record_activity(project.id, actor_id, "project", project.id, action, **details)
+
+
+def record_task_activity(task: Task, actor_id: UUID | None, action: str, **details):
+    record_activity(task.project_id, actor_id, "task", task.id, action, **details)
+
+
+def record_task_changes(
+    task: Task, actor_id: UUID | None, old_title: str | None, old_status, fields
+):
+    """Record a rename and a status change separately from other edits."""
+    fields = set(fields)
+    if "title" in fields and old_title != task.title:
+        record_task_activity(
+            task, actor_id, "renamed", **{"from": old_title, "to": task.title}
+        )
+    fields.discard("title")
+    if old_status is not None and old_status != task.status:
+        record_task_activity(
+            task,
+            actor_id,
+            "status_changed",
+            **{"from": _status_value(old_status), "to": _status_value(task.status)},
+        )
+    fields.discard("status")
+    if fields:
+        record_task_activity(task, actor_id, "updated", fields=sorted(fields))
+
+
+def _status_value(status) -> str:
+    return getattr(status, "value", status)
@@ -1,3 +1,4 @@
+from contextvars import ContextVar
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from app.models.user import User
@@ -10,6 +11,10 @@ from app.core.security import (
 )
 from app.db import get_db
 
+# Set by the batch endpoint once it has checked the caller's token, so its
+# sub-requests skip the user lookup.
+verified_token: ContextVar[str | None] = ContextVar("verified_token", default=None)
+
 
 def get_user_by_email(db: Session, email: str) -> User | None:
     """Retrieve a user by email."""
@@ -48,6 +53,8 @@ def login_user(db: Session, login_data: UserLogin):
 
 def verify_token(db: Session, token: Token):
     data = decode_access_token(token.access_token)
+    if token.access_token == verified_token.get():
+        return True
     user = db.query(User).filter(User.email == data.get("sub")).first()
     return user is not None
 
@@ -0,0 +1,85 @@
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import ProjectTaskCount, Task
+from app.models.task import TaskStatus
+from app.utils.db import upsert
+
+
+def adjust_task_counts(db: Session, deltas: Counter):
+    """Apply {(project_id, status): delta} within the current transaction."""
+    values = [
+        {"project_id": project_id, "status": status, "count": delta}
+        for (project_id, status), delta in deltas.items()
+        if delta
+    ]
+    if not values:
+        return
+
+    stmt = upsert(db, ProjectTaskCount)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ProjectTaskCount.project_id, ProjectTaskCount.status],
+            set_={"count": ProjectTaskCount.count + stmt.excluded.count},
+        ),
+        values,
+    )
+
+
+def adjust_task_count(db: Session, project_id: UUID, status: TaskStatus, delta: int):
+    adjust_task_counts(db, Counter({(project_id, status): delta}))
+
+
+def move_task_count(
+    db: Session, project_id: UUID, old_status: TaskStatus, new_status: TaskStatus
+):
+    if old_status == new_status:
+        return
+    adjust_task_counts(
+        db, Counter({(project_id, old_status): -1, (project_id, new_status): 1})
+    )
+
+
+def delete_project_task_counts(db: Session, project_id: UUID):
+    db.execute(
+        delete(ProjectTaskCount).where(ProjectTaskCount.project_id == project_id)
+    )
+
+
+def get_project_task_counts(db: Session, project_id: UUID) -> dict[TaskStatus, int]:
+    counts = {status: 0 for status in TaskStatus}
+    counts.update(
+        db.execute(
+            select(ProjectTaskCount.status, ProjectTaskCount.count).where(
+                ProjectTaskCount.project_id == project_id
+            )
+        ).all()
+    )
+    return counts
+
+
+def rebuild_project_task_counts(db: Session, project_id: UUID | None = None):
+    """Recompute counters from the tasks table, for one project or all of them."""
+    clear = delete(ProjectTaskCount)
+    source = select(Task.project_id, Task.status, func.count()).group_by(
+        Task.project_id, Task.status
+    )
+    if project_id is not None:
+        clear = clear.where(ProjectTaskCount.project_id == project_id)
+        source = source.where(Task.project_id == project_id)
+
+    db.execute(clear)
+    db.execute(
+        insert(ProjectTaskCount).from_select(
+            [
+                ProjectTaskCount.project_id,
+                ProjectTaskCount.status,
+                ProjectTaskCount.count,
+            ],
+            source,
+        )
+    )
+    db.commit()
@@ -0,0 +1,279 @@
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Callable
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from app.core import app_settings
+from app.models import Task, TaskDependency, TaskGraphVersion, User
+from app.models.task import TaskStatus
+from app.schemas.dependency import (
+    ProjectBlockedTasks,
+    ProjectCriticalPath,
+    ProjectTaskOrder,
+)
+from app.services.activity import record_activity
+from app.services.projects import get_project
+from app.utils.db import upsert
+from app.utils.graph import DependencyGraph
+
+GraphChange = Callable[[DependencyGraph], None]
+
+# project_id -> (graph version, graph), least recently used first. Graphs are
+# mutated lazily on reads too, so every access goes through the lock.
+_graphs: OrderedDict[UUID, tuple[int, DependencyGraph]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def bump_graph_version(db: Session, project_id: UUID) -> int:
+    """Bump the project's graph version inside the current transaction.
+
+    The row stays locked until commit, so graph writes to one project are
+    serialized across workers.
+    """
+    stmt = upsert(db, TaskGraphVersion).values(project_id=project_id, version=1)
+    return db.scalar(
+        stmt.on_conflict_do_update(
+            index_elements=[TaskGraphVersion.project_id],
+            set_={"version": TaskGraphVersion.version + 1},
+        ).returning(TaskGraphVersion.version)
+    )
+
+
+def apply_graph_change(project_id: UUID, version: int, change: GraphChange):
+    """Apply a committed change to the cached graph, or drop a stale graph."""
+    with _lock:
+        cached = _graphs.get(project_id)
+        if cached is not None and cached[0] == version - 1:
+            change(cached[1])
+            _graphs[project_id] = (version, cached[1])
+        else:
+            _graphs.pop(project_id, None)
+
+
+def change_graph(db: Session, project_id: UUID, change: GraphChange):
+    """Bump the version now; call the returned function after committing."""
+    version = bump_graph_version(db, project_id)
+    return partial(apply_graph_change, project_id, version, change)
+
+
+def _unchanged():
+    pass
+
+
+def track_task_added(
+    db: Session, task_id: UUID, project_id: UUID, task_status: TaskStatus
+):
+    done = task_status == TaskStatus.DONE
+    return change_graph(db, project_id, lambda graph: graph.add_task(task_id, done))
+
+
+def track_tasks_added(db: Session, project_id: UUID, tasks: list[tuple[UUID, bool]]):
+    def add_tasks(graph: DependencyGraph):
+        for task_id, done in tasks:
+            graph.add_task(task_id, done)
+
+    return change_graph(db, project_id, add_tasks)
+
+
+def track_task_status(
+    db: Session,
+    task_id: UUID,
+    project_id: UUID,
+    old_status: TaskStatus,
+    new_status: TaskStatus,
+):
+    # Only finishing or reopening a task changes what is blocked.
+    done = new_status == TaskStatus.DONE
+    if (old_status == TaskStatus.DONE) == done:
+        return _unchanged
+    return change_graph(db, project_id, lambda graph: graph.set_done(task_id, done))
+
+
+def track_task_removed(db: Session, task_id: UUID, project_id: UUID):
+    db.execute(
+        delete(TaskDependency).where(
+            or_(
+                TaskDependency.task_id == task_id,
+                TaskDependency.depends_on_id == task_id,
+            )
+        )
+    )
+    return change_graph(db, project_id, lambda graph: graph.remove_task(task_id))
+
+
+def _current_version(db: Session, project_id: UUID) -> int:
+    return (
+        db.scalar(
+            select(TaskGraphVersion.version).where(
+                TaskGraphVersion.project_id == project_id
+            )
+        )
+        or 0
+    )
+
+
+def _load_graph(db: Session, project_id: UUID) -> DependencyGraph:
+    tasks = db.execute(
+        select(Task.id, Task.status).where(Task.project_id == project_id)
+    )
+    edges = db.execute(
+        select(TaskDependency.task_id, TaskDependency.depends_on_id).where(
+            TaskDependency.project_id == project_id
+        )
+    )
+    return DependencyGraph(
+        ((task_id, task_status == TaskStatus.DONE) for task_id, task_status in tasks),
+        edges,
+    )
+
+
+def _store(project_id: UUID, version: int, graph: DependencyGraph):
+    _graphs[project_id] = (version, graph)
+    _graphs.move_to_end(project_id)
+    while len(_graphs) > app_settings.TASK_GRAPH_CACHE_SIZE:
+        _graphs.popitem(last=False)
+
+
+def _cached_graph(project_id: UUID, version: int) -> DependencyGraph | None:
+    cached = _graphs.get(project_id)
+    if cached is None or cached[0] != version:
+        return None
+    _graphs.move_to_end(project_id)
+    return cached[1]
+
+
+def _read_graph(db: Session, project_id: UUID, read: Callable):
+    version = _current_version(db, project_id)
+    with _lock:
+        graph = _cached_graph(project_id, version)
+        if graph is not None:
+            return read(graph)
+
+    graph = _load_graph(db, project_id)
+    # A write may have committed while loading; only a graph known to match
+    # its version can be updated incrementally later on.
+    unchanged = _current_version(db, project_id) == version
+    with _lock:
+        if unchanged:
+            _store(project_id, version, graph)
+        return read(graph)
+
+
+def add_task_dependency(
+    db: Session, user: User, task_id: UUID, depends_on_id: UUID
+) -> TaskDependency:
+    projects = dict(
+        db.execute(
+            select(Task.id, Task.project_id).where(
+                Task.id.in_({task_id, depends_on_id})
+            )
+        ).all()
+    )
+    if task_id not in projects or depends_on_id not in projects:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    project_id = projects[task_id]
+    if projects[depends_on_id] != project_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tasks belong to different projects",
+        )
+    get_project(db, project_id, user)
+    actor_id = user.id
+
+    version = bump_graph_version(db, project_id)
+    # The bump locked the graph, so the previous version is the current state.
+    with _lock:
+        graph = _cached_graph(project_id, version - 1)
+    if graph is None:
+        graph = _load_graph(db, project_id)
+        with _lock:
+            _store(project_id, version - 1, graph)
+
+    with _lock:
+        exists = graph.has_edge(task_id, depends_on_id)
+        cycle = not exists and graph.creates_cycle(task_id, depends_on_id)
+
+    dependency = TaskDependency(
+        task_id=task_id, depends_on_id=depends_on_id, project_id=project_id
+    )
+    if exists:
+        db.rollback()
+        return dependency
+    if cycle:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Dependency would create a cycle",
+        )
+
+    db.add(dependency)
+    db.commit()
+    apply_graph_change(
+        project_id, version, lambda graph: graph.add_edge(task_id, depends_on_id)
+    )
+    record_activity(
+        project_id,
+        actor_id,
+        "task",
+        task_id,
+        "dependency_added",
+        depends_on=str(depends_on_id),
+    )
+    return dependency
+
+
+def remove_task_dependency(db: Session, user: User, task_id: UUID, depends_on_id: UUID):
+    dependency = db.get(TaskDependency, (task_id, depends_on_id))
+    if not dependency:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Dependency not found"
+        )
+    project_id = dependency.project_id
+    get_project(db, project_id, user)
+    actor_id = user.id
+
+    after_commit = change_graph(
+        db, project_id, lambda graph: graph.remove_edge(task_id, depends_on_id)
+    )
+    db.delete(dependency)
+    db.commit()
+    after_commit()
+    record_activity(
+        project_id,
+        actor_id,
+        "task",
+        task_id,
+        "dependency_removed",
+        depends_on=str(depends_on_id),
+    )
+    return {"message": "Dependency removed successfully"}
+
+
+def get_topological_order(db: Session, project_id: UUID, user: User):
+    project = get_project(db, project_id, user)
+    return ProjectTaskOrder(
+        project_id=project.id,
+        order=_read_graph(db, project.id, DependencyGraph.topological_order),
+    )
+
+
+def get_blocked_tasks(db: Session, project_id: UUID, user: User):
+    project = get_project(db, project_id, user)
+
+    return ProjectBlockedTasks(
+        project_id=project.id,
+        blocked=_read_graph(db, project.id, DependencyGraph.blocked),
+    )
+
+
+def get_critical_path(db: Session, project_id: UUID, user: User):
+    project = get_project(db, project_id, user)
+    path = _read_graph(db, project.id, DependencyGraph.critical_path)
+    return ProjectCriticalPath(project_id=project.id, path=path, length=len(path))
@@ -0,0 +1,113 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core import app_settings
+from app.models import Subscription, User
+
+
+@dataclass(frozen=True)
+class Entitlement:
+    user_id: UUID | None
+    # None when the user has no active subscription.
+    active_until: datetime | None
+    expires_at: float
+
+    def is_active(self, now: datetime | None = None) -> bool:
+        if self.active_until is None:
+            return False
+        return self.active_until > (now or datetime.now(timezone.utc))
+
+
+# user_id -> entitlement, plus email -> user_id since callers only know the
+# email from the token. Entries live at most ENTITLEMENT_TTL_SECONDS and never
+# past the subscription's end date. Users without an active subscription are
+# only cached for ENTITLEMENT_NEGATIVE_TTL_SECONDS: the webhook worker that
+# activates it may run in another process.
+_entitlements: dict[UUID, Entitlement] = {}
+_user_ids: dict[str, UUID] = {}
+_generation = 0
+_lock = threading.Lock()
+
+
+def _utc(value: datetime) -> datetime:
+    # Columns are timezone-naive; values are written in UTC.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _load(db: Session, user_email: str) -> Entitlement | None:
+    row = db.execute(
+        select(User.id, Subscription.end_date)
+        .outerjoin(
+            Subscription,
+            (Subscription.id == User.subscription_id) & Subscription.is_active,
+        )
+        .where(User.email == user_email)
+    ).first()
+    if row is None:
+        return None
+
+    user_id, end_date = row
+    ttl = app_settings.ENTITLEMENT_TTL_SECONDS
+    active_until = _utc(end_date) if end_date is not None else None
+    if active_until is not None:
+        remaining = (active_until - datetime.now(timezone.utc)).total_seconds()
+        # Recheck at the end date in case a renewal landed meanwhile.
+        if remaining > 0:
+            ttl = min(ttl, remaining)
+    if active_until is None or active_until <= datetime.now(timezone.utc):
+        ttl = min(ttl, app_settings.ENTITLEMENT_NEGATIVE_TTL_SECONDS)
+    return Entitlement(user_id, active_until, time.monotonic() + ttl)
+
+
+def _cached(user_email: str) -> Entitlement | None:
+    user_id = _user_ids.get(user_email)
+    entitlement = _entitlements.get(user_id) if user_id is not None else None
+    if entitlement is not None and entitlement.expires_at > time.monotonic():
+        return entitlement
+    return None
+
+
+def get_entitlement(db: Session, user_email: str) -> Entitlement | None:
+    """The user's entitlement, or None for an unknown email."""
+    with _lock:
+        entitlement = _cached(user_email)
+        if entitlement is not None:
+            return entitlement
+        generation = _generation
+
+    entitlement = _load(db, user_email)
+    with _lock:
+        if entitlement is not None and generation == _generation:
+            if len(_entitlements) >= app_settings.ENTITLEMENT_CACHE_SIZE:
+                # Entries are cheap to rebuild; start over rather than track LRU.
+                _entitlements.clear()
+                _user_ids.clear()
+            _user_ids[user_email] = entitlement.user_id
+            _entitlements[entitlement.user_id] = entitlement
+    return entitlement
+
+
+def has_active_subscription(db: Session, user_email: str) -> bool:
+    entitlement = get_entitlement(db, user_email)
+    return entitlement is not None and entitlement.is_active()
+
+
+def invalidate_entitlement(user_id: UUID):
+    global _generation
+    with _lock:
+        _generation += 1
+        _entitlements.pop(user_id, None)
+
+
+def clear_entitlements():
+    global _generation
+    with _lock:
+        _generation += 1
+        _entitlements.clear()
+        _user_ids.clear()
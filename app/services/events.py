@@ -0,0 +1,68 @@
+from uuid import UUID
+from app.core.events import Event, broker
+from app.models import Project, Task
+from app.schemas.project import ProjectResponse
+from app.schemas.task import TaskInDB
+
+
+def publish_project_event(event_type: str, project: Project):
+    if not broker.running:
+        return
+    data = (
+        {"id": str(project.id)}
+        if event_type == "project.deleted"
+        else ProjectResponse.model_validate(project, from_attributes=True).model_dump(
+            mode="json"
+        )
+    )
+    broker.publish(
+        Event(event_type, str(project.id), owner_id=str(project.owner_id), data=data)
+    )
+
+
+def publish_task_event(event_type: str, task: Task):
+    if not broker.running:
+        return
+    data = (
+        {"id": str(task.id), "project_id": str(task.project_id)}
+        if event_type == "task.deleted"
+        else TaskInDB.model_validate(task, from_attributes=True).model_dump(mode="json")
+    )
+    broker.publish(Event(event_type, str(task.project_id), data=data))
+
+
+def publish_tasks_imported(project_id: UUID, count: int):
+    if not broker.running:
+        return
+    broker.publish(
+        Event(
+            "task.imported",
+            str(project_id),
+            data={"project_id": str(project_id), "count": count},
+        )
+    )
+
+
+def publish_tasks_reranked(project_id: UUID, status: str):
+    if not broker.running:
+        return
+    broker.publish(
+        Event(
+            "task.reranked",
+            str(project_id),
+            data={"project_id": str(project_id), "status": status},
+        )
+    )
+
+
+def publish_projects_imported(owner_id: UUID, project_ids: list[UUID]):
+    if not broker.running:
+        return
+    broker.publish(
+        Event(
+            "project.imported",
+            None,
+            owner_id=str(owner_id),
+            data={"ids": [str(project_id) for project_id in project_ids]},
+        )
+    )
@@ -0,0 +1,265 @@
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from functools import partial
+from typing import AsyncIterator, Callable
+from uuid import uuid4
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core import app_settings
+from app.models import Project, SyncEntity, Task, User
+from app.models.task import TaskStatus
+from app.schemas.imports import ImportChunkReport, ImportReport, ImportRowError
+from app.schemas.project import ProjectCreate
+from app.schemas.task import TaskCreate
+from app.services.access import get_user_access, invalidate_users
+from app.services.activity import record_activity
+from app.services.counters import adjust_task_counts
+from app.services.dependencies import track_tasks_added
+from app.services.events import publish_projects_imported, publish_tasks_imported
+from app.services.response_cache import (
+    bump_generations,
+    bump_project_generations,
+)
+from app.services.sync import record_changes
+from app.utils.imports import ParsedRow, chunked
+from app.utils.ranking import ranks_after
+
+logger = logging.getLogger(__name__)
+
+ChunkImporter = Callable[
+    [Session, User, list[ParsedRow]], tuple[int, list[ImportRowError]]
+]
+
+
+def _validate_rows(rows: list[ParsedRow], schema):
+    valid, errors = [], []
+    for parsed in rows:
+        if parsed.error:
+            errors.append(ImportRowError(row=parsed.row, error=parsed.error))
+            continue
+        try:
+            valid.append((parsed.row, schema.model_validate(parsed.data)))
+        except ValidationError as e:
+            errors.append(ImportRowError(row=parsed.row, error=_format_error(e)))
+    return valid, errors
+
+
+def _format_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+def _insert_chunk(
+    db: Session,
+    model,
+    values: list[dict],
+    rows: list[int],
+    record: Callable[[Session, list[dict]], list[Callable[[], None]]],
+):
+    if not values:
+        return 0, []
+    try:
+        db.execute(insert(model), values)
+        after_commit = record(db, values)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        message = f"Chunk insert failed: {e.__class__.__name__}"
+        return 0, [ImportRowError(row=row, error=message) for row in rows]
+    for callback in after_commit:
+        callback()
+    return len(values), []
+
+
+def _record_tasks(user: User, db: Session, values: list[dict]):
+    record_changes(
+        db,
+        SyncEntity.task,
+        user.id,
+        [(value["id"], value["project_id"]) for value in values],
+    )
+    adjust_task_counts(
+        db, Counter((value["project_id"], value["status"]) for value in values)
+    )
+    tasks_by_project = defaultdict(list)
+    for value in values:
+        tasks_by_project[value["project_id"]].append(
+            (value["id"], value["status"] == TaskStatus.DONE)
+        )
+    return [
+        *(
+            track_tasks_added(db, project_id, tasks)
+            for project_id, tasks in tasks_by_project.items()
+        ),
+        partial(bump_project_generations, db, list(tasks_by_project)),
+    ]
+
+
+def _record_projects(user: User, db: Session, values: list[dict]):
+    record_changes(
+        db,
+        SyncEntity.project,
+        user.id,
+        [(value["id"], value["id"]) for value in values],
+    )
+    return [
+        partial(invalidate_users, [user.id]),
+        partial(bump_generations, users=[user.id]),
+    ]
+
+
+def _assign_ranks(db: Session, values: list[dict]):
+    # Imported tasks are appended to their columns in file order.
+    columns = Counter((value["project_id"], value["status"]) for value in values)
+    if not columns:
+        return
+    last_ranks = {
+        (project_id, task_status): rank
+        for project_id, task_status, rank in db.execute(
+            select(Task.project_id, Task.status, func.max(Task.rank))
+            .where(Task.project_id.in_({project_id for project_id, _ in columns}))
+            .group_by(Task.project_id, Task.status)
+        )
+    }
+    ranks = {
+        column: iter(ranks_after(last_ranks.get(column), count))
+        for column, count in columns.items()
+    }
+    for value in values:
+        value["rank"] = next(ranks[(value["project_id"], value["status"])])
+
+
+def import_tasks_chunk(db: Session, user: User, rows: list[ParsedRow]):
+    valid, errors = _validate_rows(rows, TaskCreate)
+    # Read before the commit expires the user.
+    actor_id = user.id
+
+    project_ids = get_user_access(db, actor_id).project_ids
+
+    now = datetime.now(timezone.utc)
+    values, inserted_rows = [], []
+    for row, task in valid:
+        if task.project_id not in project_ids:
+            errors.append(ImportRowError(row=row, error="Project not found"))
+            continue
+        values.append(
+            {
+                "id": uuid4(),
+                "title": task.title,
+                "description": task.description,
+                "status": task.status,
+                "project_id": task.project_id,
+                "created_at": now,
+            }
+        )
+        inserted_rows.append(row)
+    _assign_ranks(db, values)
+
+    imported, insert_errors = _insert_chunk(
+        db, Task, values, inserted_rows, partial(_record_tasks, user)
+    )
+    if imported:
+        for project_id, count in Counter(v["project_id"] for v in values).items():
+            publish_tasks_imported(project_id, count)
+            record_activity(
+                project_id, actor_id, "project", project_id, "imported", tasks=count
+            )
+    return imported, errors + insert_errors
+
+
+def import_projects_chunk(db: Session, user: User, rows: list[ParsedRow]):
+    valid, errors = _validate_rows(rows, ProjectCreate)
+
+    names = {project.name for _, project in valid}
+    existing_names = (
+        set(db.scalars(select(Project.name).where(Project.name.in_(names))))
+        if names
+        else set()
+    )
+
+    now = datetime.now(timezone.utc)
+    values, inserted_rows = [], []
+    for row, project in valid:
+        if project.name in existing_names:
+            errors.append(ImportRowError(row=row, error="Project already exists"))
+            continue
+        existing_names.add(project.name)
+        values.append(
+            {
+                "id": uuid4(),
+                "name": project.name,
+                "description": project.description,
+                "owner_id": user.id,
+                "created_at": now,
+            }
+        )
+        inserted_rows.append(row)
+
+    imported, insert_errors = _insert_chunk(
+        db, Project, values, inserted_rows, partial(_record_projects, user)
+    )
+    if imported:
+        owner_id = values[0]["owner_id"]
+        publish_projects_imported(owner_id, [value["id"] for value in values])
+        for value in values:
+            record_activity(
+                value["id"],
+                owner_id,
+                "project",
+                value["id"],
+                "imported",
+                name=value["name"],
+            )
+    return imported, errors + insert_errors
+
+
+async def import_rows(
+    db: Session,
+    user: User,
+    rows: AsyncIterator[ParsedRow],
+    import_chunk: ChunkImporter,
+) -> ImportReport:
+    report = ImportReport()
+    chunk_number = 0
+    user_id = user.id
+
+    async for chunk in chunked(rows, app_settings.IMPORT_CHUNK_SIZE):
+        chunk_number += 1
+        # Validation and the INSERT are blocking; keep them off the event loop.
+        imported, errors = await run_in_threadpool(import_chunk, db, user, chunk)
+
+        report.total_rows += len(chunk)
+        report.imported += imported
+        report.failed += len(chunk) - imported
+        report.chunks.append(
+            ImportChunkReport(
+                chunk=chunk_number,
+                rows=len(chunk),
+                imported=imported,
+                failed=len(chunk) - imported,
+            )
+        )
+
+        room = app_settings.IMPORT_MAX_REPORTED_ERRORS - len(report.errors)
+        if len(errors) > room:
+            report.errors_truncated = True
+        report.errors.extend(sorted(errors, key=lambda e: e.row)[: max(room, 0)])
+
+        logger.info(
+            "Import chunk %d for user %s: %d/%d rows imported (%d total)",
+            chunk_number,
+            user_id,
+            imported,
+            len(chunk),
+            report.imported,
+        )
+
+    return report
@@ -1,7 +1,35 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session, load_only
 from fastapi import HTTPException, status
-from app.models import Project, User
-from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.models import (
+    ActivityLog,
+    Project,
+    TaskDependency,
+    TaskGraphVersion,
+    User,
+)
+from app.schemas.activity import ActivityEntry, ActivityPage
+from app.schemas.project import (
+    ProjectCreate,
+    ProjectProgress,
+    ProjectResponse,
+    ProjectUpdate,
+)
+from app.services.access import (
+    can_access_project,
+    get_user_access,
+    invalidate_teams,
+    invalidate_users,
+)
+from app.services.activity import record_project_activity
+from app.services.counters import (
+    delete_project_task_counts,
+    get_project_task_counts,
+)
+from app.services.events import publish_project_event
+from app.services.response_cache import bump_generations
+from app.services.sync import record_project_change, record_project_deleted
+from app.utils.db import columns_for
 from datetime import datetime
 from uuid import UUID
 
@@ -18,22 +46,46 @@ def create_project(db: Session, user: User, project_data: ProjectCreate):
             status_code=status.HTTP_400_BAD_REQUEST, detail="Project already exists"
         )
 
+    if project_data.team_id:
+        _check_team_member(db, user, project_data.team_id)
+
     project = Project(
         name=project_data.name,
         description=project_data.description,
         owner_id=user.id,
+        team_id=project_data.team_id,
     )
     db.add(project)
+    db.flush()
+    record_project_change(db, project)
     db.commit()
+    invalidate_users([user.id])
+    invalidate_teams([project_data.team_id])
+    bump_generations(users=[user.id], teams=[project_data.team_id])
     db.refresh(project)
+    publish_project_event("project.created", project)
+    record_project_activity(project, user.id, "created", name=project.name)
     return project
 
 
-def get_project(db: Session, project_id: UUID, user: User):
+def _check_team_member(db: Session, user: User, team_id: UUID):
+    if team_id not in get_user_access(db, user.id).team_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not a member of this team",
+        )
+
+
+def get_project(
+    db: Session, project_id: UUID, user: User, fields: tuple[str, ...] | None = None
+):
+    query = db.query(Project)
+    if fields:
+        query = query.options(load_only(*columns_for(Project, ProjectResponse, fields)))
     project = (
-        db.query(Project)
-        .filter(Project.id == project_id, Project.owner_id == user.id)
-        .first()
+        query.filter(Project.id == project_id).first()
+        if can_access_project(db, user, project_id)
+        else None
     )
     if not project:
         raise HTTPException(
@@ -42,31 +94,123 @@ def get_project(db: Session, project_id: UUID, user: User):
     return project
 
 
-def get_user_projects(db: Session, user: User, skip: int = 0, limit: int = 10):
-    return (
-        db.query(Project)
-        .filter(Project.owner_id == user.id)
+def _get_owned_project(db: Session, project_id: UUID, user: User):
+    project = get_project(db, project_id, user)
+    if project.owner_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not the owner of this project",
+        )
+    return project
+
+
+def get_user_projects(
+    db: Session,
+    user: User,
+    skip: int = 0,
+    limit: int = 10,
+    fields: tuple[str, ...] | None = None,
+):
+    project_ids = get_user_access(db, user.id).project_ids
+    return db.execute(
+        select(*columns_for(Project, ProjectResponse, fields))
+        .where(Project.id.in_(project_ids))
         .offset(skip)
         .limit(limit)
-        .all()
+    ).all()
+
+
+def get_project_progress(db: Session, project_id: UUID, user: User):
+    project = get_project(db, project_id, user)
+    counts = get_project_task_counts(db, project.id)
+    return ProjectProgress(
+        project_id=project.id, total=sum(counts.values()), counts=counts
+    )
+
+
+def get_project_activity(
+    db: Session,
+    project_id: UUID,
+    user: User,
+    before: int | None = None,
+    limit: int = 50,
+):
+    project = get_project(db, project_id, user)
+
+    stmt = (
+        select(ActivityLog)
+        .where(ActivityLog.project_id == project.id)
+        .order_by(ActivityLog.id.desc())
+        .limit(limit + 1)
+    )
+    if before is not None:
+        stmt = stmt.where(ActivityLog.id < before)
+
+    entries = db.scalars(stmt).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    return ActivityPage(
+        items=[
+            ActivityEntry.model_validate(entry, from_attributes=True)
+            for entry in entries
+        ],
+        next_before=entries[-1].id if has_more else None,
     )
 
 
 def update_project(
     db: Session, project_id: UUID, user: User, project_data: ProjectUpdate
 ):
-    project = get_project(db, project_id, user)
+    project = _get_owned_project(db, project_id, user)
+    old_name, old_team_id = project.name, project.team_id
     if project_data.name:
         project.name = project_data.name
     if project_data.description:
         project.description = project_data.description
+    # An explicit null moves the project out of its team.
+    team_changed = (
+        "team_id" in project_data.model_fields_set
+        and project_data.team_id != old_team_id
+    )
+    if team_changed:
+        if project_data.team_id:
+            _check_team_member(db, user, project_data.team_id)
+        project.team_id = project_data.team_id
+    record_project_change(db, project)
     db.commit()
+    if team_changed:
+        invalidate_teams([old_team_id, project_data.team_id])
+    bump_generations(
+        users=[user.id],
+        teams=[old_team_id, project_data.team_id] if team_changed else [old_team_id],
+        projects=[project_id],
+    )
     db.refresh(project)
+    publish_project_event("project.updated", project)
+    if project.name != old_name:
+        record_project_activity(
+            project, user.id, "renamed", **{"from": old_name, "to": project.name}
+        )
+    if project_data.description:
+        record_project_activity(project, user.id, "updated", fields=["description"])
     return project
 
 
 def delete_project(db: Session, project_id: UUID, user: User):
-    project = get_project(db, project_id, user)
+    project = _get_owned_project(db, project_id, user)
+    team_id = project.team_id
+    record_project_deleted(db, project)
+    delete_project_task_counts(db, project.id)
+    db.execute(delete(TaskDependency).where(TaskDependency.project_id == project.id))
+    db.execute(
+        delete(TaskGraphVersion).where(TaskGraphVersion.project_id == project.id)
+    )
     db.delete(project)
     db.commit()
+    invalidate_users([user.id])
+    invalidate_teams([team_id])
+    bump_generations(users=[user.id], teams=[team_id], projects=[project_id])
+    publish_project_event("project.deleted", project)
+    record_project_activity(project, user.id, "deleted", name=project.name)
     return {"message": "Project deleted successfully"}
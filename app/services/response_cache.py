@@ -0,0 +1,174 @@
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+from uuid import UUID
+
+from fastapi import Request, Response
+from jwt import InvalidTokenError
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core import app_settings
+from app.core.cache import NullCache, build_cache
+from app.core.security import decode_access_token
+from app.models import Project, User
+from app.services.access import get_user_access
+from app.services.entitlements import get_entitlement
+from app.utils.serialization import RawJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Entries are keyed by (user, route, params) and stamped with the generation
+# of every scope they were built from: users, teams and projects. Writes bump
+# the generations of the scopes they touch, which makes stale entries miss.
+# A project write also bumps its owner and team, so reads spanning all of a
+# user's projects only need the user and team scopes.
+cache = build_cache(
+    app_settings.RESPONSE_CACHE_BACKEND,
+    app_settings.RESPONSE_CACHE_URL,
+    app_settings.RESPONSE_CACHE_SIZE,
+    app_settings.RESPONSE_CACHE_TTL_SECONDS,
+    app_settings.WEB_CONCURRENCY,
+)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def _generation_keys(scopes: list[str]) -> list[str]:
+    return [f"gen:{scope}" for scope in scopes]
+
+
+def _entry_key(user_id: UUID, request: Request) -> str:
+    params = sorted(request.query_params.multi_items())
+    query = "&".join(f"{name}={value}" for name, value in params)
+    return f"response:{user_id}:{request.url.path}?{query}"
+
+
+def user_scopes(db: Session, user: User) -> list[str]:
+    """Scopes of reads spanning everything the user can reach."""
+    access = get_user_access(db, user.id)
+    return [f"user:{user.id}", *(f"team:{team_id}" for team_id in access.team_ids)]
+
+
+def project_scopes(db: Session, user: User, project_id: UUID) -> list[str]:
+    """Scopes of reads of a single project."""
+    access = get_user_access(db, user.id)
+    return [
+        f"user:{user.id}",
+        *(f"team:{team_id}" for team_id in access.team_ids),
+        f"project:{project_id}",
+    ]
+
+
+def team_scopes(team_id: UUID) -> list[str]:
+    return [f"team:{team_id}"]
+
+
+def bump_generations(
+    users: Iterable[UUID] = (),
+    teams: Iterable[UUID] = (),
+    projects: Iterable[UUID] = (),
+):
+    """Invalidate cached reads built from these users, teams or projects.
+
+    Call after the write has been committed.
+    """
+    scopes = [
+        *(f"user:{user_id}" for user_id in users),
+        *(f"team:{team_id}" for team_id in teams if team_id is not None),
+        *(f"project:{project_id}" for project_id in projects),
+    ]
+    try:
+        cache.incr(_generation_keys(scopes))
+    except Exception:
+        # Entries still expire after RESPONSE_CACHE_TTL_SECONDS.
+        logger.exception("Failed to bump response cache generations")
+
+
+def bump_project_generations(db: Session, project_ids: Iterable[UUID]):
+    """bump_generations for writes to existing projects and their tasks."""
+    project_ids = list(project_ids)
+    owners = db.execute(
+        select(Project.owner_id, Project.team_id).where(Project.id.in_(project_ids))
+    ).all()
+    bump_generations(
+        users=[owner_id for owner_id, _ in owners],
+        teams=[team_id for _, team_id in owners],
+        projects=project_ids,
+    )
+
+
+def get_cached_response(db: Session, request: Request) -> RawJSONResponse | None:
+    """A cached response for this request, checked without touching the DB.
+
+    The user is resolved through the entitlement cache, so a hit costs a token
+    decode and two cache lookups. Returns None on any miss.
+    """
+    token = request.headers.get("Authorization")
+    if not token or isinstance(cache, NullCache):
+        return None
+    try:
+        entitlement = get_entitlement(db, decode_access_token(token).get("sub"))
+    except InvalidTokenError:
+        return None
+    if entitlement is None:
+        return None
+
+    try:
+        entry = cache.get(_entry_key(entitlement.user_id, request))
+        if entry is None:
+            return None
+        header, _, body = entry.partition(b"\n")
+        scopes, generations = json.loads(header)
+        if cache.get_counters(_generation_keys(scopes)) != generations:
+            return None
+    except Exception:
+        logger.exception("Response cache lookup failed")
+        return None
+    return RawJSONResponse(body)
+
+
+def cached_response(
+    request: Request,
+    user_id: UUID,
+    scopes: list[str],
+    response_type,
+    build: Callable[[], Any],
+):
+    """Run `build`, encode its result as `response_type` and cache it.
+
+    Generations are read before building, so a write landing meanwhile
+    leaves the entry already stale. `build` may also return an encoded
+    response, whose body is cached as is.
+    """
+    if isinstance(cache, NullCache):
+        return build()
+    try:
+        generations = cache.get_counters(_generation_keys(scopes))
+    except Exception:
+        logger.exception("Response cache lookup failed")
+        generations = None
+
+    result = build()
+    if isinstance(result, Response):
+        body = result.body
+    else:
+        adapter = _adapter(response_type)
+        body = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+
+    if generations is not None:
+        header = json.dumps([scopes, generations]).encode()
+        try:
+            cache.set(
+                _entry_key(user_id, request),
+                header + b"\n" + body,
+                app_settings.RESPONSE_CACHE_TTL_SECONDS,
+            )
+        except Exception:
+            logger.exception("Failed to store cached response")
+    return RawJSONResponse(body)
@@ -0,0 +1,215 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core import app_settings
+from app.models import StripeEvent, Subscription, User
+from app.models.subscription import SubscriptionType
+from app.services.entitlements import invalidate_entitlement
+from app.services.subscription import (
+    end_subscription,
+    start_subscription,
+    subscription_response,
+)
+from app.utils.db import upsert
+from app.utils.subscription import get_end_subscription
+
+logger = logging.getLogger(__name__)
+
+CHECKOUT_COMPLETED = "checkout.session.completed"
+
+
+class InvalidStripeEvent(ValueError):
+    """An event that will fail the same way however often it is retried."""
+
+
+def store_stripe_event(db: Session, event: dict) -> bool:
+    """Store a verified event in the inbox; False if it was already there."""
+    obj = event.get("data", {}).get("object", {})
+    stored = db.scalar(
+        upsert(db, StripeEvent)
+        .values(
+            id=event["id"],
+            type=event["type"],
+            object_id=obj.get("id"),
+            payload=obj,
+            received_at=datetime.now(timezone.utc),
+        )
+        .on_conflict_do_nothing()
+        .returning(StripeEvent.id)
+    )
+    db.commit()
+    return stored is not None
+
+
+def _get_subscription(db: Session, stripe_subscription_id: str | None):
+    if not stripe_subscription_id:
+        return None
+    return db.scalars(
+        select(Subscription).where(
+            Subscription.stripe_subscription_id == stripe_subscription_id
+        )
+    ).first()
+
+
+def _checkout_completed(db: Session, session: dict):
+    if session.get("mode") != "subscription":
+        return
+    stripe_subscription_id = session.get("subscription")
+    if _get_subscription(db, stripe_subscription_id) is not None:
+        return
+
+    email = session.get("customer_email") or (
+        session.get("customer_details") or {}
+    ).get("email")
+    user = db.scalars(select(User).where(User.email == email)).first()
+    if user is None:
+        raise ValueError(f"No user with email {email!r}")
+
+    subscription_type = (session.get("metadata") or {}).get("subscription_type")
+    if subscription_type not in SubscriptionType.__members__:
+        raise InvalidStripeEvent(
+            f"Checkout session {session.get('id')!r} has invalid "
+            f"subscription_type metadata {subscription_type!r}"
+        )
+
+    active = db.scalar(
+        select(Subscription.stripe_subscription_id).where(
+            Subscription.user_id == user.id, Subscription.is_active
+        )
+    )
+    if active is not None:
+        # Same guard as create_subscription. A second paid checkout needs an
+        # operator to cancel or refund one of the Stripe subscriptions.
+        raise InvalidStripeEvent(
+            f"User {user.id} already has active subscription {active!r}; "
+            f"not starting {stripe_subscription_id!r}"
+        )
+
+    start_subscription(
+        db, user, stripe_subscription_id, SubscriptionType(subscription_type)
+    )
+    return user.id
+
+
+def _subscription_deleted(db: Session, stripe_subscription: dict):
+    subscription = _get_subscription(db, stripe_subscription.get("id"))
+    # Already gone when the cancellation started from our own endpoint.
+    if subscription is not None:
+        end_subscription(db, db.get(User, subscription.user_id), subscription)
+        return subscription.user_id
+
+
+def _period_end(invoice: dict) -> datetime | None:
+    # The subscription line's period is the one just paid for.
+    for line in (invoice.get("lines") or {}).get("data") or []:
+        end = (line.get("period") or {}).get("end")
+        if end:
+            return datetime.fromtimestamp(end, timezone.utc)
+    return None
+
+
+def _invoice_paid(db: Session, invoice: dict):
+    if invoice.get("billing_reason") != "subscription_cycle":
+        return
+    subscription = _get_subscription(db, invoice.get("subscription"))
+    if subscription is None:
+        return
+    subscription.end_date = _period_end(invoice) or get_end_subscription(
+        datetime.now(timezone.utc), subscription.subscription_type
+    )
+    subscription.is_active = True
+    # The sweeper may have expired the subscription before the renewal came.
+    user = db.get(User, subscription.user_id)
+    if user is not None and user.subscription_id is None:
+        user.subscription_id = subscription.id
+    return subscription.user_id
+
+
+_HANDLERS = {
+    CHECKOUT_COMPLETED: _checkout_completed,
+    "customer.subscription.deleted": _subscription_deleted,
+    "invoice.paid": _invoice_paid,
+}
+
+
+def apply_stripe_event(db: Session, event_type: str, payload: dict):
+    """Apply an event without committing; unknown types are ignored.
+
+    Handlers are idempotent so an event retried after a crash is harmless.
+    Returns the id of the user whose subscription changed, if any.
+    """
+    handler = _HANDLERS.get(event_type)
+    if handler is not None:
+        return handler(db, payload)
+    return None
+
+
+def process_next_stripe_event(db: Session) -> bool:
+    """Claim, apply and mark one pending event; False if none is pending."""
+    now = datetime.now(timezone.utc)
+    event = db.scalars(
+        select(StripeEvent)
+        .where(
+            StripeEvent.processed_at.is_(None),
+            StripeEvent.attempts < app_settings.STRIPE_EVENT_MAX_ATTEMPTS,
+            or_(
+                StripeEvent.next_attempt_at.is_(None),
+                StripeEvent.next_attempt_at <= now,
+            ),
+        )
+        .order_by(StripeEvent.attempts, StripeEvent.received_at)
+        .limit(1)
+        # Concurrent workers skip rows another worker is applying.
+        .with_for_update(skip_locked=True)
+    ).first()
+    if event is None:
+        db.rollback()
+        return False
+
+    event_id = event.id
+    attempts = event.attempts + 1
+    try:
+        user_id = apply_stripe_event(db, event.type, event.payload)
+        event.attempts += 1
+        event.processed_at = datetime.now(timezone.utc)
+        db.commit()
+        if user_id is not None:
+            invalidate_entitlement(user_id)
+    except Exception as e:
+        db.rollback()
+        logger.exception("Failed to apply Stripe event %s", event_id)
+        if isinstance(e, InvalidStripeEvent):
+            # Retrying cannot help; park it with the exhausted events.
+            attempts = max(attempts, app_settings.STRIPE_EVENT_MAX_ATTEMPTS)
+        delay = app_settings.STRIPE_EVENT_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+        db.execute(
+            update(StripeEvent)
+            .where(StripeEvent.id == event_id)
+            .values(
+                attempts=attempts,
+                last_error=repr(e),
+                next_attempt_at=now + timedelta(seconds=delay),
+            )
+        )
+        db.commit()
+    return True
+
+
+def get_checkout_subscription(db: Session, session_id: str):
+    """The subscription a processed checkout webhook created, if any."""
+    event = db.scalars(
+        select(StripeEvent).where(
+            StripeEvent.object_id == session_id,
+            StripeEvent.type == CHECKOUT_COMPLETED,
+            StripeEvent.processed_at.is_not(None),
+        )
+    ).first()
+    if event is None:
+        return None
+    subscription = _get_subscription(db, event.payload.get("subscription"))
+    if subscription is None:
+        return None
+    return subscription_response(subscription)
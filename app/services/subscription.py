@@ -1,3 +1,4 @@
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models import User, Subscription
@@ -6,15 +7,17 @@ from app.schemas.subscription import (
     SubscriptionType,
     SubscriptionResponse,
 )
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import threading
+import time
 import stripe
 from app.core import app_settings
+from app.core.stripe import call_stripe
+from app.services.entitlements import has_active_subscription, invalidate_entitlement
 from app.utils.subscription import get_end_subscription
 
 
-stripe.api_key = app_settings.STRIPE_SECRET_KEY
-
-
 def create_subscription(
     db: Session,
     user_email: str,
@@ -38,6 +41,24 @@ def create_subscription(
             detail="User already has an active subscription.",
         )
 
+    subscription = start_subscription(
+        db, user, stripe_subscription_id, subscription_type
+    )
+    db.commit()
+    invalidate_entitlement(user.id)
+    db.refresh(subscription)
+    db.refresh(user)
+
+    return subscription_response(subscription)
+
+
+def start_subscription(
+    db: Session,
+    user: User,
+    stripe_subscription_id: str,
+    subscription_type: SubscriptionType,
+):
+    """Add an active subscription for the user without committing."""
     subscription_data = SubscriptionCreate(
         user_id=user.id,
         stripe_subscription_id=stripe_subscription_id,
@@ -56,13 +77,19 @@ def create_subscription(
     )
 
     db.add(subscription)
-    db.commit()
-    db.refresh(subscription)
-
+    db.flush()
     user.subscription_id = subscription.id
-    db.commit()
-    db.refresh(user)
+    return subscription
+
 
+def end_subscription(db: Session, user: User | None, subscription: Subscription):
+    """Drop the subscription locally without committing."""
+    if user is not None and user.subscription_id == subscription.id:
+        user.subscription_id = None
+    db.delete(subscription)
+
+
+def subscription_response(subscription: Subscription):
     return SubscriptionResponse(
         user_id=subscription.user_id,
         subscription_type=subscription.subscription_type,
@@ -91,8 +118,11 @@ def cancel_subscription(db: Session, user_email: str):
             detail="User does not have an active subscription.",
         )
 
-    subscription_canceled = stripe.Subscription.cancel(
-        user_unactive_subscription.stripe_subscription_id
+    stripe_subscription_id = user_unactive_subscription.stripe_subscription_id
+    subscription_canceled = call_stripe(
+        stripe.Subscription.cancel,
+        stripe_subscription_id,
+        idempotency_key=f"cancel-{stripe_subscription_id}",
     )
 
     if subscription_canceled.status != "canceled":
@@ -101,9 +131,9 @@ def cancel_subscription(db: Session, user_email: str):
             detail="Failed to cancel subscription.",
         )
 
-    user.subscription_id = None
-    db.delete(user_unactive_subscription)
+    end_subscription(db, user, user_unactive_subscription)
     db.commit()
+    invalidate_entitlement(user.id)
 
     return {"message": "Subscription canceled successfully."}
 
@@ -111,8 +141,6 @@ def cancel_subscription(db: Session, user_email: str):
 def create_checkout_session(
     return_url: str, subscription_type: SubscriptionType, customer_email: str
 ):
-    stripe.api_key = app_settings.STRIPE_SECRET_KEY
-
     if subscription_type == SubscriptionType.monthly:
         price_id = app_settings.STRIPE_MONTHLY_PRICE_ID
     elif subscription_type == SubscriptionType.annual:
@@ -120,7 +148,8 @@ def create_checkout_session(
     else:
         raise ValueError("Invalid subscription type")
     try:
-        session = stripe.checkout.Session.create(
+        session = call_stripe(
+            stripe.checkout.Session.create,
             ui_mode="embedded",
             payment_method_types=["card"],
             line_items=[
@@ -132,23 +161,100 @@ def create_checkout_session(
             mode="subscription",
             return_url=return_url,
             customer_email=customer_email,
+            # Read back by the webhook worker to activate the right plan.
+            metadata={"subscription_type": subscription_type.value},
+            # Shared by the retries of this one request.
+            idempotency_key=f"checkout-{uuid4()}",
         )
         return session
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# session_id -> (expires_at, session). Clients poll the status of the same
+# session repeatedly; answer those polls without a Stripe round trip.
+_sessions: dict[str, tuple[float, stripe.checkout.Session]] = {}
+_sessions_lock = threading.Lock()
+_SESSION_CACHE_SIZE = 10000
+
+
 def get_stripe_session(session_id: str):
-    session = stripe.checkout.Session.retrieve(session_id)
+    with _sessions_lock:
+        cached = _sessions.get(session_id)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    session = call_stripe(stripe.checkout.Session.retrieve, session_id)
+    now = time.monotonic()
+    with _sessions_lock:
+        if len(_sessions) >= _SESSION_CACHE_SIZE:
+            for key in [
+                key for key, (expires, _) in _sessions.items() if expires <= now
+            ]:
+                del _sessions[key]
+            if len(_sessions) >= _SESSION_CACHE_SIZE:
+                _sessions.clear()
+        _sessions[session_id] = (
+            now + app_settings.STRIPE_SESSION_CACHE_SECONDS,
+            session,
+        )
     return session
 
 
 def verify_user_subscription(db: Session, user_email: str):
-    user = db.query(User).filter(User.email == user_email).first()
-
-    if not user or not user.subscription_id:
-
+    # Served from the entitlement cache; expired subscriptions do not pass.
+    if not has_active_subscription(db, user_email):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="The user is not subscribed"
         )
-    return user.subscription_id is not None
+    return True
+
+
+def deactivate_expired_subscriptions(
+    db: Session, limit: int, now: datetime | None = None
+) -> int:
+    """Deactivate one batch of expired subscriptions and clear their users.
+
+    Subscriptions are only swept once SUBSCRIPTION_EXPIRY_GRACE_SECONDS past
+    their end date, leaving time for the renewal webhook to arrive. Rows
+    locked by a concurrent sweep are skipped, so several workers can sweep
+    at once. Returns how many subscriptions were deactivated.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=app_settings.SUBSCRIPTION_EXPIRY_GRACE_SECONDS)
+    batch = (
+        select(Subscription.id)
+        .where(Subscription.is_active, Subscription.end_date < cutoff)
+        .order_by(Subscription.end_date)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    expired = db.execute(
+        update(Subscription)
+        .where(Subscription.id.in_(batch.scalar_subquery()))
+        .values(is_active=False)
+        .returning(Subscription.id, Subscription.user_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not expired:
+        db.rollback()
+        return 0
+
+    user_ids = {user_id for _, user_id in expired}
+    db.execute(
+        update(User)
+        .where(
+            User.id.in_(user_ids),
+            User.subscription_id.in_(
+                [subscription_id for subscription_id, _ in expired]
+            ),
+        )
+        .values(subscription_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    for user_id in user_ids:
+        invalidate_entitlement(user_id)
+    return len(expired)
@@ -0,0 +1,219 @@
+import base64
+import binascii
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, event, func, insert, literal, or_, select
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.models import Project, SyncChange, SyncEntity, Task, User
+from app.schemas.project import ProjectResponse
+from app.schemas.sync import SyncResponse
+from app.schemas.task import TaskInDB
+from app.services.access import get_user_access
+
+# If a later sequence could commit first, a client syncing in between would
+# move its cursor past the earlier one and never see it. So the record_*
+# functions only queue their statements on the session. The inserts, which
+# allocate the sequences, run at commit under a transaction-level lock. That
+# keeps sequences committing in order while the lock is held only for the
+# inserts and the COMMIT itself.
+SEQUENCE_LOCK_KEY = 0x53594E43
+_PENDING = "sync_changes"
+
+
+def _lock_sequence(db: Session):
+    # SQLite already allows a single writer at a time.
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(SEQUENCE_LOCK_KEY)))
+
+
+def _defer(db: Session, statement, params=None):
+    db.info.setdefault(_PENDING, []).append((statement, params))
+
+
+@event.listens_for(Session, "before_commit")
+def _write_changes(db: Session):
+    pending = db.info.pop(_PENDING, None)
+    if not pending:
+        return
+    _lock_sequence(db)
+    for statement, params in pending:
+        db.execute(statement, params)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_changes(db: Session, transaction: SessionTransaction):
+    # Rolled back or closed without a commit.
+    if transaction.parent is None:
+        db.info.pop(_PENDING, None)
+
+
+def encode_cursor(seq: int) -> str:
+    return base64.urlsafe_b64encode(f"v1:{seq}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> int:
+    if not cursor:
+        return 0
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        version, seq = raw.split(":", 1)
+        if version != "v1":
+            raise ValueError(version)
+        return int(seq)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync cursor"
+        )
+
+
+def record_project_change(db: Session, project: Project, deleted: bool = False):
+    _defer(db, delete(SyncChange).where(SyncChange.entity_id == project.id))
+    _defer(
+        db,
+        insert(SyncChange).values(
+            entity=SyncEntity.project,
+            entity_id=project.id,
+            project_id=project.id,
+            owner_id=project.owner_id,
+            deleted=deleted,
+        ),
+    )
+
+
+def record_task_change(
+    db: Session, task_id: UUID, project_id: UUID, deleted: bool = False
+):
+    _defer(db, delete(SyncChange).where(SyncChange.entity_id == task_id))
+    # Resolve the owner in the same statement instead of loading the project.
+    _defer(
+        db,
+        insert(SyncChange).from_select(
+            ["entity", "entity_id", "project_id", "owner_id", "deleted"],
+            select(
+                literal(SyncEntity.task, SyncChange.entity.type),
+                literal(task_id, Task.id.type),
+                Project.id,
+                Project.owner_id,
+                literal(deleted),
+            ).where(Project.id == project_id),
+        ),
+    )
+
+
+def record_changes(
+    db: Session, entity: SyncEntity, owner_id: UUID, ids: list[tuple[UUID, UUID]]
+):
+    """Record a batch of (entity_id, project_id) upserts owned by one user."""
+    if not ids:
+        return
+    _defer(
+        db,
+        delete(SyncChange).where(
+            SyncChange.entity_id.in_([entity_id for entity_id, _ in ids])
+        ),
+    )
+    _defer(
+        db,
+        insert(SyncChange),
+        [
+            {
+                "entity": entity,
+                "entity_id": entity_id,
+                "project_id": project_id,
+                "owner_id": owner_id,
+                "deleted": False,
+            }
+            for entity_id, project_id in ids
+        ],
+    )
+
+
+def record_project_deleted(db: Session, project: Project):
+    # Tombstone the project and every task removed by the cascade. The tasks
+    # are gone by commit time, so their ids are read now.
+    task_ids = db.scalars(select(Task.id).where(Task.project_id == project.id)).all()
+    _defer(
+        db,
+        delete(SyncChange).where(
+            SyncChange.project_id == project.id,
+            SyncChange.entity == SyncEntity.task,
+        ),
+    )
+    if task_ids:
+        _defer(
+            db,
+            insert(SyncChange),
+            [
+                {
+                    "entity": SyncEntity.task,
+                    "entity_id": task_id,
+                    "project_id": project.id,
+                    "owner_id": project.owner_id,
+                    "deleted": True,
+                }
+                for task_id in task_ids
+            ],
+        )
+    record_project_change(db, project, deleted=True)
+
+
+def get_changes(db: Session, user: User, cursor: str | None, limit: int = 500):
+    after = decode_cursor(cursor)
+    # Nothing changed anywhere since the cursor: one probe of the primary key
+    # answers the common polling case.
+    latest = db.scalar(select(func.max(SyncChange.seq)))
+    if latest is None or latest <= after:
+        return SyncResponse(cursor=encode_cursor(after), has_more=False)
+
+    # Changes to team projects reach every member. Tombstones of the user's
+    # own projects outlive their access entry, so those match by owner too.
+    # Each branch is a range scan of its (owner_id|project_id, seq) index.
+    scope = SyncChange.owner_id == user.id
+    project_ids = get_user_access(db, user.id).project_ids
+    if project_ids:
+        scope = or_(scope, SyncChange.project_id.in_(project_ids))
+
+    changes = db.scalars(
+        select(SyncChange)
+        .where(scope, SyncChange.seq > after)
+        .order_by(SyncChange.seq)
+        .limit(limit + 1)
+    ).all()
+
+    if not changes:
+        return SyncResponse(cursor=encode_cursor(after), has_more=False)
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    live = {SyncEntity.project: [], SyncEntity.task: []}
+    deleted = {SyncEntity.project: [], SyncEntity.task: []}
+    for change in changes:
+        (deleted if change.deleted else live)[change.entity].append(change.entity_id)
+
+    projects = (
+        db.scalars(
+            select(Project).where(Project.id.in_(live[SyncEntity.project]))
+        ).all()
+        if live[SyncEntity.project]
+        else []
+    )
+    tasks = (
+        db.scalars(select(Task).where(Task.id.in_(live[SyncEntity.task]))).all()
+        if live[SyncEntity.task]
+        else []
+    )
+
+    return SyncResponse(
+        cursor=encode_cursor(changes[-1].seq),
+        has_more=has_more,
+        projects=[
+            ProjectResponse.model_validate(project, from_attributes=True)
+            for project in projects
+        ],
+        tasks=[TaskInDB.model_validate(task, from_attributes=True) for task in tasks],
+        deleted_projects=deleted[SyncEntity.project],
+        deleted_tasks=deleted[SyncEntity.task],
+    )
@@ -1,77 +1,393 @@
-from sqlalchemy.orm import Session
-from app.models import Task, User, Project
-from app.schemas.task import TaskCreate, TaskUpdate
+from datetime import datetime, timezone
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, exists, func, select, update
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.exc import StaleDataError
+from app.models import SyncEntity, Task, User, Project
+from app.models.task import TaskStatus
+from app.schemas.task import TaskCreate, TaskInDB, TaskUpdate, TaskPatch, TaskMove
+from app.services.access import can_access_project, get_user_access
+from app.services.activity import record_task_activity, record_task_changes
+from app.services.counters import adjust_task_count, move_task_count
+from app.services.dependencies import (
+    track_task_added,
+    track_task_removed,
+    track_task_status,
+)
+from app.services.events import publish_task_event, publish_tasks_reranked
+from app.services.response_cache import bump_project_generations
+from app.services.sync import record_changes, record_task_change
+from app.utils.db import columns_for
+from app.utils.ranking import rank_between, spread_ranks
 from uuid import UUID
 
 
-def create_task(db: Session, task_data: TaskCreate):
+def _column(project_id: UUID, status: TaskStatus):
+    return Task.project_id == project_id, Task.status == status
+
+
+def get_last_rank(db: Session, project_id: UUID, status: TaskStatus):
+    return db.scalar(select(func.max(Task.rank)).where(*_column(project_id, status)))
+
+
+def _set_ranks(db: Session, ranks: list[tuple[UUID, str]]):
+    # A Core UPDATE, so rank-only rewrites leave the version alone and do not
+    # fail the next edit of a client holding one of these tasks.
+    table = Task.__table__
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("task_id"))
+        .values(rank=bindparam("new_rank")),
+        [{"task_id": task_id, "new_rank": rank} for task_id, rank in ranks],
+    )
+
+
+def _break_rank_ties(db: Session, column, ranks: set[str]) -> list[UUID]:
+    """Give tasks sharing one of `ranks` distinct ranks, in id order.
+
+    Concurrent creates can append with the same rank. Returns the ids of the
+    tasks that were given new ranks.
+    """
+    if not ranks:
+        return []
+    tied = db.scalars(
+        select(Task.rank)
+        .where(*column, Task.rank.in_(ranks))
+        .group_by(Task.rank)
+        .having(func.count() > 1)
+    ).all()
+    new_ranks = []
+    for rank in tied:
+        task_ids = db.scalars(
+            select(Task.id)
+            .where(*column, Task.rank == rank)
+            .order_by(Task.id)
+            .with_for_update()
+        ).all()
+        upper = db.scalar(select(func.min(Task.rank)).where(*column, Task.rank > rank))
+        previous = rank
+        for task_id in task_ids[1:]:
+            previous = rank_between(previous, upper)
+            new_ranks.append((task_id, previous))
+    if new_ranks:
+        _set_ranks(db, new_ranks)
+    return [task_id for task_id, _ in new_ranks]
+
+
+def create_task(db: Session, task_data: TaskCreate, actor_id: UUID | None = None):
     db_task = Task(
         title=task_data.title,
         description=task_data.description,
+        status=task_data.status,
         project_id=task_data.project_id,
+        rank=rank_between(
+            get_last_rank(db, task_data.project_id, task_data.status), None
+        ),
     )
     db.add(db_task)
+    db.flush()
+    record_task_change(db, db_task.id, db_task.project_id)
+    adjust_task_count(db, db_task.project_id, db_task.status, 1)
+    graph_changed = track_task_added(db, db_task.id, db_task.project_id, db_task.status)
     db.commit()
+    graph_changed()
+    bump_project_generations(db, [task_data.project_id])
     db.refresh(db_task)
+    publish_task_event("task.created", db_task)
+    record_task_activity(db_task, actor_id, "created", title=db_task.title)
     return db_task
 
 
-def update_task(db: Session, task_id: UUID, task_data: TaskUpdate):
+def update_task(
+    db: Session, task_id: UUID, task_data: TaskUpdate, actor_id: UUID | None = None
+):
     task = db.query(Task).filter(Task.id == task_id).first()
 
     if not task:
         return None
 
+    old_title, old_status = task.title, task.status
     task.title = task_data.title or task.title
     task.description = task_data.description or task.description
     task.status = task_data.status or task.status
+    if task.status != old_status:
+        # A new column gets the task at its end.
+        task.rank = rank_between(get_last_rank(db, task.project_id, task.status), None)
 
-    db.commit()
+    record_task_change(db, task.id, task.project_id)
+    move_task_count(db, task.project_id, old_status, task.status)
+    try:
+        # Write the task row before the graph version, like every other path.
+        db.flush()
+        graph_changed = track_task_status(
+            db, task.id, task.project_id, old_status, task.status
+        )
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task was modified concurrently",
+        )
+    graph_changed()
     db.refresh(task)
+    bump_project_generations(db, [task.project_id])
+    publish_task_event("task.updated", task)
+    record_task_changes(
+        task,
+        actor_id,
+        old_title,
+        old_status,
+        task_data.model_dump(exclude_none=True).keys(),
+    )
+    return task
+
+
+def patch_task(
+    db: Session, task_id: UUID, task_patch: TaskPatch, actor_id: UUID | None = None
+):
+    fields = task_patch.model_dump(exclude_unset=True, exclude={"version"})
+    matches_version = (Task.id == task_id, Task.version == task_patch.version)
+
+    # The counters need the previous status and the activity log the previous
+    # title; only patches touching either pay for the read.
+    old_title = old_status = None
+    if "status" in fields or "title" in fields:
+        current = db.execute(
+            select(Task.title, Task.status, Task.project_id).where(*matches_version)
+        ).first()
+        if current is None:
+            return _missing_or_conflict(db, task_id)
+        old_title, current_status, project_id = current
+        if "status" in fields:
+            old_status = current_status
+        if old_status is not None and fields["status"] != old_status:
+            # A new column gets the task at its end.
+            fields["rank"] = rank_between(
+                get_last_rank(db, project_id, fields["status"]), None
+            )
+
+    task = db.scalars(
+        update(Task)
+        .where(*matches_version)
+        .values(
+            **fields,
+            version=Task.version + 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(Task)
+    ).first()
+
+    if not task:
+        return _missing_or_conflict(db, task_id)
+
+    record_task_change(db, task.id, task.project_id)
+    graph_changed = None
+    if old_status is not None:
+        move_task_count(db, task.project_id, old_status, task.status)
+        graph_changed = track_task_status(
+            db, task.id, task.project_id, old_status, task.status
+        )
+
+    # Keep the RETURNING values instead of reloading the row after commit.
+    db.expunge(task)
+    db.commit()
+    if graph_changed:
+        graph_changed()
+    bump_project_generations(db, [task.project_id])
+    publish_task_event("task.updated", task)
+    record_task_changes(task, actor_id, old_title, old_status, fields.keys())
     return task
 
 
-def delete_task(db: Session, task_id: UUID):
+# Neighbour rows are read FOR UPDATE: rebalance_task_ranks locks the whole
+# column, so a move either sees the rewritten ranks or holds the rebalance off
+# until it commits, and never mixes ranks from both key spaces.
+def _neighbour_ranks(db: Session, column, targets: set[UUID]) -> dict[UUID, str]:
+    if not targets:
+        return {}
+    return dict(
+        db.execute(
+            select(Task.id, Task.rank)
+            .where(*column, Task.id.in_(targets))
+            .with_for_update()
+        ).all()
+    )
+
+
+def _bounding_rank(db: Session, column, *criteria, last: bool) -> str | None:
+    return db.scalar(
+        select(Task.rank)
+        .where(*column, *criteria)
+        .order_by(Task.rank.desc() if last else Task.rank)
+        .limit(1)
+        .with_for_update()
+    )
+
+
+def move_task(
+    db: Session, task_id: UUID, task_move: TaskMove, actor_id: UUID | None = None
+):
+    current = db.execute(
+        select(Task.project_id, Task.status, Task.version).where(Task.id == task_id)
+    ).first()
+    if not current:
+        return None
+
+    project_id, old_status, version = current
+    new_status = task_move.status or old_status
+    column = (*_column(project_id, new_status), Task.id != task_id)
+
+    targets = {task_move.after_id, task_move.before_id} - {None}
+    neighbours = _neighbour_ranks(db, column, targets)
+    if len(neighbours) != len(targets):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Neighbour task not found in the target column",
+        )
+    # Tasks are ordered by (rank, id); a neighbour sharing its rank leaves no
+    # key to fit between, so spread the tie out first.
+    reranked = _break_rank_ties(db, column, set(neighbours.values()))
+    if reranked:
+        for reranked_id in reranked:
+            record_task_change(db, reranked_id, project_id)
+        neighbours = _neighbour_ranks(db, column, targets)
+
+    after = neighbours.get(task_move.after_id)
+    before = neighbours.get(task_move.before_id)
+    if after is not None and before is None:
+        before = _bounding_rank(db, column, Task.rank > after, last=False)
+    elif before is not None and after is None:
+        after = _bounding_rank(db, column, Task.rank < before, last=True)
+    elif not targets:
+        after = _bounding_rank(db, column, last=True)
+
+    try:
+        rank = rank_between(after, before)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Neighbour tasks are not adjacent",
+        )
+
+    # A single-row UPDATE; the version guard keeps the counters consistent
+    # with a concurrent status change.
+    task = db.scalars(
+        update(Task)
+        .where(Task.id == task_id, Task.version == version)
+        .values(
+            status=new_status,
+            rank=rank,
+            version=Task.version + 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(Task)
+    ).first()
+
+    if not task:
+        return _missing_or_conflict(db, task_id)
+
+    record_task_change(db, task.id, task.project_id)
+    move_task_count(db, task.project_id, old_status, task.status)
+    graph_changed = track_task_status(
+        db, task.id, task.project_id, old_status, task.status
+    )
+
+    db.expunge(task)
+    db.commit()
+    graph_changed()
+    bump_project_generations(db, [task.project_id])
+    publish_task_event("task.updated", task)
+    # Moves never rename the task.
+    record_task_changes(task, actor_id, task.title, old_status, ["status"])
+    return task
+
+
+def rebalance_task_ranks(db: Session, project_id: UUID, task_status: TaskStatus):
+    """Respace the ranks of one column once keys have grown too long."""
+    task_ids = db.scalars(
+        select(Task.id)
+        .where(*_column(project_id, task_status))
+        .order_by(Task.rank, Task.id)
+        .with_for_update()
+    ).all()
+    if not task_ids:
+        return
+
+    _set_ranks(db, list(zip(task_ids, spread_ranks(len(task_ids)))))
+    owner_id = db.scalar(select(Project.owner_id).where(Project.id == project_id))
+    record_changes(
+        db, SyncEntity.task, owner_id, [(task_id, project_id) for task_id in task_ids]
+    )
+    db.commit()
+    bump_project_generations(db, [project_id])
+    publish_tasks_reranked(project_id, task_status.value)
+
+
+def _missing_or_conflict(db: Session, task_id: UUID):
+    if not db.scalar(select(exists().where(Task.id == task_id))):
+        return None
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Task was modified concurrently",
+    )
+
+
+def delete_task(db: Session, task_id: UUID, actor_id: UUID | None = None):
     task = db.query(Task).filter(Task.id == task_id).first()
     if task:
+        record_task_change(db, task.id, task.project_id, deleted=True)
+        adjust_task_count(db, task.project_id, task.status, -1)
         db.delete(task)
+        db.flush()
+        graph_changed = track_task_removed(db, task.id, task.project_id)
         db.commit()
+        graph_changed()
+        bump_project_generations(db, [task.project_id])
+        publish_task_event("task.deleted", task)
+        record_task_activity(task, actor_id, "deleted", title=task.title)
     return task
 
 
-def get_task_by_id(db: Session, task_id: UUID):
-    return db.query(Task).filter(Task.id == task_id).first()
+def get_task_by_id(db: Session, task_id: UUID, fields: tuple[str, ...] | None = None):
+    query = db.query(Task)
+    if fields:
+        query = query.options(load_only(*columns_for(Task, TaskInDB, fields)))
+    return query.filter(Task.id == task_id).first()
 
 
-def get_tasks(db: Session, user_email: str):
-    user = db.query(User).filter(User.email == user_email).first()
+def get_tasks(db: Session, user_email: str, fields: tuple[str, ...] | None = None):
+    user_id = db.scalar(select(User.id).where(User.email == user_email))
 
-    if not user:
+    if not user_id:
         return None
 
-    projects = db.query(Project).filter(Project.owner_id == user.id).all()
-
-    return (
-        db.query(Task)
-        .filter(Task.project_id.in_([project.id for project in projects]))
-        .all()
-    )
+    project_ids = get_user_access(db, user_id).project_ids
 
+    return db.execute(
+        select(*columns_for(Task, TaskInDB, fields))
+        .where(Task.project_id.in_(project_ids))
+        .order_by(Task.project_id, Task.status, Task.rank, Task.id)
+    ).all()
 
-def get_tasks_by_project(db: Session, project_id: UUID, user_email: str):
 
-    user_projects = db.query(Project).filter(Project.owner_id == user_email).all()
+def get_tasks_by_project(
+    db: Session,
+    project_id: UUID,
+    user_email: str,
+    task_status: TaskStatus | None = None,
+    fields: tuple[str, ...] | None = None,
+):
+    user = db.query(User).filter(User.email == user_email).first()
 
-    if not user_projects or not [project.id == project_id for project in user_projects]:
+    if not user or not can_access_project(db, user, project_id):
         return None
 
-    tasks = (
-        db.query(Task)
-        .filter(Task.project_id.in_([project.id for project in user_projects]))
-        .all()
+    query = select(*columns_for(Task, TaskInDB, fields)).where(
+        Task.project_id == project_id
     )
+    if task_status:
+        query = query.where(Task.status == task_status)
 
-    if not tasks:
-        return None
-
-    return tasks
+    # Served by the (project_id, status, rank) index.
+    return db.execute(query.order_by(Task.status, Task.rank, Task.id)).all()
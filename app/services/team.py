@@ -1,6 +1,22 @@
+from sqlalchemy import delete, exists, func, or_, select
 from sqlalchemy.orm import Session
-from app.models import User, TeamMember, Team
-from app.schemas import TeamCreate, TeamUpdate, AddTeamMember, RemoveTeamMember
+from app.models import Project, User, TeamMember, Team
+from app.schemas import (
+    TeamCreate,
+    TeamUpdate,
+    AddTeamMember,
+    RemoveTeamMember,
+    TeamMembersBatch,
+    TeamMemberStatus,
+    TeamMemberOutcome,
+    TeamMembersBatchResult,
+    TeamSummary,
+    TeamSummaryPage,
+)
+from app.schemas.team import TeamInDBBase
+from app.services.access import invalidate_teams, invalidate_users
+from app.services.response_cache import bump_generations
+from app.utils.db import columns_for, upsert
 from fastapi import HTTPException, status
 from uuid import UUID
 
@@ -29,6 +45,7 @@ def create_team(db: Session, team_data: TeamCreate):
     team_member = TeamMember(user_id=user.id, team_id=team.id)
     db.add(team_member)
     db.commit()
+    invalidate_users([user.id])
 
     # Refresh to get the updated team with the new member
     db.refresh(team)
@@ -45,8 +62,91 @@ def get_team(db: Session, team_id: UUID):
     return team
 
 
-def get_team_by_owned_by(db: Session, owner_id: UUID):
-    return db.query(Team).filter(Team.owner_id == owner_id).all()
+def get_team_row(db: Session, team_id: UUID):
+    """The team's response columns as a Core row, for read-only paths."""
+    team = db.execute(
+        select(*columns_for(Team, TeamInDBBase)).where(Team.id == team_id)
+    ).first()
+    if team is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
+        )
+    return team
+
+
+def is_team_member(db: Session, team_id: UUID, user_id: UUID) -> bool:
+    return db.scalar(
+        select(
+            exists().where(TeamMember.team_id == team_id, TeamMember.user_id == user_id)
+        )
+    )
+
+
+def get_team_member_ids(
+    db: Session, team_id: UUID, after: UUID | None = None, limit: int = 100
+) -> list[UUID]:
+    # Keyset pagination over team_members only; users are never loaded.
+    query = (
+        select(TeamMember.user_id)
+        .where(TeamMember.team_id == team_id)
+        .order_by(TeamMember.user_id)
+        .limit(limit)
+    )
+    if after is not None:
+        query = query.where(TeamMember.user_id > after)
+    return list(db.scalars(query))
+
+
+def _user_exists(db: Session, user_id: UUID) -> bool:
+    return db.scalar(select(exists().where(User.id == user_id)))
+
+
+def get_team_summaries(
+    db: Session, owner_id: UUID, after: UUID | None = None, limit: int = 50
+) -> TeamSummaryPage:
+    page = select(Team.id, Team.name, Team.owner_id).where(Team.owner_id == owner_id)
+    if after is not None:
+        page = page.where(Team.id > after)
+    page = page.order_by(Team.id).limit(limit + 1).cte("page")
+
+    # Counts are grouped over the page's teams only, never the whole tables.
+    members = (
+        select(TeamMember.team_id, func.count().label("count"))
+        .where(TeamMember.team_id.in_(select(page.c.id)))
+        .group_by(TeamMember.team_id)
+        .subquery()
+    )
+    projects = (
+        select(Project.team_id, func.count().label("count"))
+        .where(Project.team_id.in_(select(page.c.id)))
+        .group_by(Project.team_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            page.c.id,
+            page.c.name,
+            page.c.owner_id,
+            func.coalesce(members.c.count, 0),
+            func.coalesce(projects.c.count, 0),
+        )
+        .outerjoin(members, members.c.team_id == page.c.id)
+        .outerjoin(projects, projects.c.team_id == page.c.id)
+        .order_by(page.c.id)
+    ).all()
+
+    has_more = len(rows) > limit
+    items = [
+        TeamSummary(
+            id=team_id,
+            name=name,
+            owner_id=team_owner_id,
+            member_count=member_count,
+            project_count=project_count,
+        )
+        for team_id, name, team_owner_id, member_count, project_count in rows[:limit]
+    ]
+    return TeamSummaryPage(items=items, next_after=items[-1].id if has_more else None)
 
 
 def update_team(db: Session, team_id: UUID, user_id: UUID, team_data: TeamUpdate):
@@ -66,6 +166,7 @@ def update_team(db: Session, team_id: UUID, user_id: UUID, team_data: TeamUpdate
         setattr(team, key, value)
 
     db.commit()
+    bump_generations(teams=[team_id])
     db.refresh(team)
     return team
 
@@ -83,15 +184,19 @@ def delete_team(db: Session, user_id: UUID, team_id: UUID):
             detail="You are not the owner of this team",
         )
 
+    # Clear memberships up front so the ORM finds no collection to load.
+    db.execute(delete(TeamMember).where(TeamMember.team_id == team.id))
+    team_id = team.id
     db.delete(team)
     db.commit()
+    invalidate_teams([team_id])
+    bump_generations(teams=[team_id])
     return {"message": "Team deleted successfully"}
 
 
 def add_member_to_team(db: Session, user_id: UUID, add_team_member: AddTeamMember):
     team = get_team(db, add_team_member.team_id)
-    user = db.query(User).filter(User.id == add_team_member.user_to_add_id).first()
-    if not team or not user:
+    if not team or not _user_exists(db, add_team_member.user_to_add_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Team or user not found"
         )
@@ -102,13 +207,17 @@ def add_member_to_team(db: Session, user_id: UUID, add_team_member: AddTeamMembe
             detail="You are not the owner of this team",
         )
 
-    if user in team.members:
+    if is_team_member(db, team.id, add_team_member.user_to_add_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="User already in team"
         )
 
-    team.members.append(user)
+    db.add(TeamMember(user_id=add_team_member.user_to_add_id, team_id=team.id))
     db.commit()
+    invalidate_users([add_team_member.user_to_add_id])
+    bump_generations(
+        users=[add_team_member.user_to_add_id], teams=[add_team_member.team_id]
+    )
     db.refresh(team)
     return team
 
@@ -117,8 +226,7 @@ def remove_member_from_team(
     db: Session, user_id: UUID, user_to_remove: RemoveTeamMember
 ):
     team = get_team(db, user_to_remove.team_id)
-    user = db.query(User).filter(User.id == user_to_remove.user_to_remove_id).first()
-    if not team or not user:
+    if not team or not _user_exists(db, user_to_remove.user_to_remove_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Team or user not found"
         )
@@ -135,7 +243,140 @@ def remove_member_from_team(
             detail="You are not the owner of this team",
         )
 
-    team.members.remove(user)
+    removed = db.execute(
+        delete(TeamMember).where(
+            TeamMember.team_id == team.id,
+            TeamMember.user_id == user_to_remove.user_to_remove_id,
+        )
+    )
+    if not removed.rowcount:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="User not in team"
+        )
+
     db.commit()
+    invalidate_users([user_to_remove.user_to_remove_id])
+    bump_generations(
+        users=[user_to_remove.user_to_remove_id], teams=[user_to_remove.team_id]
+    )
     db.refresh(team)
     return team
+
+
+def _get_owned_team(db: Session, team_id: UUID, user_id: UUID):
+    team = get_team(db, team_id)
+    if team.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not the owner of this team",
+        )
+    return team
+
+
+def _resolve_users(db: Session, batch: TeamMembersBatch):
+    """Resolve every requested id and email with a single query."""
+    conditions = []
+    if batch.user_ids:
+        conditions.append(User.id.in_(set(batch.user_ids)))
+    if batch.emails:
+        conditions.append(User.email.in_(set(batch.emails)))
+
+    found = db.execute(select(User.id, User.email).where(or_(*conditions))).all()
+    known_ids = {user_id for user_id, _ in found}
+    ids_by_email = {email: user_id for user_id, email in found}
+
+    requests = [
+        (user_id, None, user_id if user_id in known_ids else None)
+        for user_id in batch.user_ids
+    ]
+    requests += [(None, email, ids_by_email.get(email)) for email in batch.emails]
+    return requests
+
+
+def _outcomes(requests, status_of) -> list[TeamMemberOutcome]:
+    return [
+        TeamMemberOutcome(
+            user_id=resolved if resolved is not None else requested_id,
+            email=email,
+            status=(
+                status_of(resolved)
+                if resolved is not None
+                else TeamMemberStatus.NOT_FOUND
+            ),
+        )
+        for requested_id, email, resolved in requests
+    ]
+
+
+def add_members_to_team(db: Session, user_id: UUID, batch: TeamMembersBatch):
+    team = _get_owned_team(db, batch.team_id, user_id)
+    team_id = team.id
+    requests = _resolve_users(db, batch)
+    user_ids = {resolved for _, _, resolved in requests if resolved is not None}
+
+    added = set()
+    if user_ids:
+        # Existing memberships are skipped by the database, not checked first.
+        added = set(
+            db.scalars(
+                upsert(db, TeamMember)
+                .values(
+                    [
+                        {"user_id": member_id, "team_id": team_id}
+                        for member_id in user_ids
+                    ]
+                )
+                .on_conflict_do_nothing()
+                .returning(TeamMember.user_id)
+            )
+        )
+        db.commit()
+        invalidate_users(added)
+        bump_generations(users=added, teams=[team_id])
+
+    return TeamMembersBatchResult(
+        team_id=team_id,
+        results=_outcomes(
+            requests,
+            lambda member_id: (
+                TeamMemberStatus.ADDED
+                if member_id in added
+                else TeamMemberStatus.ALREADY_MEMBER
+            ),
+        ),
+    )
+
+
+def remove_members_from_team(db: Session, user_id: UUID, batch: TeamMembersBatch):
+    team = _get_owned_team(db, batch.team_id, user_id)
+    team_id, owner_id = team.id, team.owner_id
+    requests = _resolve_users(db, batch)
+    user_ids = {
+        resolved
+        for _, _, resolved in requests
+        if resolved is not None and resolved != owner_id
+    }
+
+    removed = set()
+    if user_ids:
+        removed = set(
+            db.scalars(
+                delete(TeamMember)
+                .where(TeamMember.team_id == team_id, TeamMember.user_id.in_(user_ids))
+                .returning(TeamMember.user_id)
+            )
+        )
+        db.commit()
+        invalidate_users(removed)
+        bump_generations(users=removed, teams=[team_id])
+
+    def status_of(member_id):
+        if member_id == owner_id:
+            return TeamMemberStatus.OWNER
+        if member_id in removed:
+            return TeamMemberStatus.REMOVED
+        return TeamMemberStatus.NOT_MEMBER
+
+    return TeamMembersBatchResult(
+        team_id=team_id, results=_outcomes(requests, status_of)
+    )
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.main import app
+from app.models import Base, Subscription, User
+from app.models.subscription import SubscriptionType
+from app.core import app_settings
+from app.core.security import create_access_token
+
+engine = create_engine(
+    app_settings.TEST_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    user = User(email="batch@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    subscription = Subscription(
+        user_id=user.id,
+        stripe_subscription_id="sub_batch",
+        subscription_type=SubscriptionType.monthly,
+        start_date=now,
+        end_date=now + timedelta(days=30),
+        is_active=True,
+    )
+    db.add(subscription)
+    db.flush()
+    user.subscription_id = subscription.id
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def sessions(setup_db):
+    # Patch the factory rather than override get_db, so sub-requests go
+    # through the real get_db and its shared session.
+    sessions = MagicMock(side_effect=TestingSessionLocal)
+    with patch("app.db.session.SessionLocal", sessions):
+        yield sessions
+
+
+@pytest.fixture
+def client(sessions):
+    return TestClient(app)
+
+
+HEADERS = {"Authorization": create_access_token({"sub": "batch@example.com"})}
+
+
+class TestBatchEndpoint:
+    def test_runs_sub_requests_in_order(self, client):
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"method": "POST", "path": "/projects/new", "body": {"name": "B"}},
+                    {"path": "/projects/"},
+                    {"path": "/auth/userinfo"},
+                    {"path": "/projects/00000000-0000-0000-0000-000000000000"},
+                ]
+            },
+            headers=HEADERS,
+        )
+
+        assert response.status_code == 200
+        created, projects, userinfo, missing = response.json()["responses"]
+        assert created["status"] == 201
+        assert projects["status"] == 200
+        assert [p["id"] for p in projects["body"]] == [created["body"]["id"]]
+        assert userinfo["body"]["email"] == "batch@example.com"
+        assert missing["status"] == 404
+
+    def test_rejects_unauthenticated_batches(self, client):
+        response = client.post(
+            "/api/v1/batch", json={"requests": [{"path": "/projects/"}]}
+        )
+
+        assert response.status_code == 401
+
+    def test_rejects_streams_and_oversized_batches(self, client):
+        response = client.post(
+            "/api/v1/batch",
+            json={"requests": [{"path": "/events/stream"}]},
+            headers=HEADERS,
+        )
+        assert response.json()["responses"][0]["status"] == 400
+
+        with patch.object(app_settings, "BATCH_MAX_REQUESTS", 1):
+            response = client.post(
+                "/api/v1/batch",
+                json={"requests": [{"path": "/projects/"}] * 2},
+                headers=HEADERS,
+            )
+        assert response.status_code == 400
+
+    def test_rejects_excluded_paths_behind_dot_segments(self, client):
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {
+                        "method": "POST",
+                        "path": "/projects/../batch",
+                        "body": {"requests": [{"path": "/projects/"}]},
+                    },
+                    {"path": "/projects/../events/stream"},
+                    {"path": "/./subscription/webhook"},
+                    {"path": "/../../docs"},
+                ]
+            },
+            headers=HEADERS,
+        )
+
+        assert response.status_code == 200
+        assert [item["status"] for item in response.json()["responses"]] == [400] * 4
+
+    def test_writes_share_the_batch_session(self, client, sessions):
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"method": "POST", "path": "/projects/new", "body": {"name": "S1"}},
+                    {"method": "POST", "path": "/projects/new", "body": {}},
+                    {"method": "POST", "path": "/projects/new", "body": {"name": "S2"}},
+                    {"path": "/projects/"},
+                ]
+            },
+            headers=HEADERS,
+        )
+
+        first, invalid, second, projects = response.json()["responses"]
+        assert (first["status"], invalid["status"], second["status"]) == (
+            201,
+            422,
+            201,
+        )
+        names = {project["name"] for project in projects["body"]}
+        assert {"S1", "S2"} <= names
+        # Only the batch itself opened a session.
+        assert sessions.call_count == 1
@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import patch
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.endpoints.events import _next_event
+from app.core import app_settings
+from app.core.events import Event, LocalTransport, broker
+from app.models import Base, Project, Team, TeamMember, User
+from app.schemas.team import AddTeamMember, RemoveTeamMember
+from app.services.access import clear_access_index, get_user_access
+from app.services.team import add_member_to_team, remove_member_from_team
+
+engine = create_engine(
+    app_settings.TEST_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    clear_access_index()
+    db = TestingSessionLocal()
+    with patch(
+        "app.api.v1.endpoints.events.SessionLocal", TestingSessionLocal
+    ), patch.object(app_settings, "EVENTS_KEEPALIVE_SECONDS", 0.05):
+        yield db
+    db.close()
+    clear_access_index()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def team(db):
+    owner = User(email="owner@example.com", hashed_password="x")
+    member = User(email="member@example.com", hashed_password="x")
+    db.add_all([owner, member])
+    db.flush()
+    team = Team(name="Events", owner_id=owner.id)
+    db.add(team)
+    db.flush()
+    db.add(TeamMember(user_id=member.id, team_id=team.id))
+    project = Project(name="Shared", owner_id=owner.id, team_id=team.id)
+    db.add(project)
+    db.commit()
+    return team, owner, member, project
+
+
+def _subscribe(db, user):
+    access = get_user_access(db, user.id)
+    return broker.subscribe(user.id, access.project_ids, 10, access.team_ids)
+
+
+def _task_event(project):
+    return Event("task.updated", str(project.id), data={"id": "1"})
+
+
+class TestEventAccess:
+    def test_removed_member_stops_receiving_events(self, db, team):
+        team, owner, member, project = team
+
+        async def scenario():
+            await broker.start(LocalTransport())
+            try:
+                subscriber = _subscribe(db, member)
+                broker.publish(_task_event(project))
+                await asyncio.sleep(0)
+
+                await asyncio.to_thread(
+                    remove_member_from_team,
+                    db,
+                    owner.id,
+                    RemoveTeamMember(team_id=team.id, user_to_remove_id=member.id),
+                )
+                # Admitted under the old access until the consumer reloads it.
+                broker.publish(_task_event(project))
+                await asyncio.sleep(0)
+
+                assert subscriber.queue.qsize() == 2
+                assert await _next_event(subscriber) is None
+                assert await _next_event(subscriber) is None
+                broker.publish(_task_event(project))
+                await asyncio.sleep(0)
+                assert subscriber.queue.empty()
+            finally:
+                await broker.stop()
+
+        asyncio.run(scenario())
+
+    def test_new_member_starts_receiving_events(self, db, team):
+        team, owner, member, project = team
+        newcomer = User(email="newcomer@example.com", hashed_password="x")
+        db.add(newcomer)
+        db.commit()
+
+        async def scenario():
+            await broker.start(LocalTransport())
+            try:
+                subscriber = _subscribe(db, newcomer)
+
+                await asyncio.to_thread(
+                    add_member_to_team,
+                    db,
+                    owner.id,
+                    AddTeamMember(team_id=team.id, user_to_add_id=newcomer.id),
+                )
+                await asyncio.sleep(0)
+                # The keepalive wait reloads the access.
+                assert await _next_event(subscriber) is None
+
+                broker.publish(_task_event(project))
+                await asyncio.sleep(0)
+                event = await _next_event(subscriber)
+                assert event.project_id == str(project.id)
+            finally:
+                await broker.stop()
+
+        asyncio.run(scenario())
@@ -0,0 +1,266 @@
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.main import app
+from app.db.session import get_db
+from app.models import Base, StripeEvent, Subscription, User
+from app.models.subscription import SubscriptionType
+from app.core import app_settings
+from app.services.stripe_events import (
+    get_checkout_subscription,
+    process_next_stripe_event,
+    store_stripe_event,
+)
+
+engine = create_engine(
+    app_settings.TEST_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def setup_db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add(User(email="webhook@example.com", hashed_password="x"))
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client(setup_db):
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+def _signed(event: dict):
+    payload = json.dumps(event)
+    timestamp = int(time.time())
+    signature = hmac.new(
+        app_settings.STRIPE_WEBHOOK_SECRET.encode(),
+        f"{timestamp}.{payload}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+    return payload, {"Stripe-Signature": f"t={timestamp},v1={signature}"}
+
+
+CHECKOUT_EVENT = {
+    "id": "evt_checkout",
+    "type": "checkout.session.completed",
+    "data": {
+        "object": {
+            "id": "cs_test",
+            "mode": "subscription",
+            "subscription": "sub_webhook",
+            "customer_email": "webhook@example.com",
+            "metadata": {"subscription_type": "monthly"},
+        }
+    },
+}
+
+
+class TestStripeWebhook:
+    def test_rejects_bad_signature(self, client):
+        payload, _ = _signed(CHECKOUT_EVENT)
+        response = client.post(
+            "/api/v1/subscription/webhook",
+            content=payload,
+            headers={"Stripe-Signature": "t=1,v1=invalid"},
+        )
+        assert response.status_code == 400
+
+    def test_stores_once_and_applies_in_background(self, client):
+        payload, headers = _signed(CHECKOUT_EVENT)
+        for _ in range(2):
+            response = client.post(
+                "/api/v1/subscription/webhook", content=payload, headers=headers
+            )
+            assert response.status_code == 200
+
+        db = TestingSessionLocal()
+        try:
+            assert db.query(StripeEvent).count() == 1
+            assert get_checkout_subscription(db, "cs_test") is None
+
+            assert process_next_stripe_event(db)
+            assert not process_next_stripe_event(db)
+
+            subscription = db.query(Subscription).one()
+            assert subscription.stripe_subscription_id == "sub_webhook"
+            user = db.query(User).filter_by(email="webhook@example.com").one()
+            assert user.subscription_id == subscription.id
+            assert get_checkout_subscription(db, "cs_test").is_active
+        finally:
+            db.close()
+
+    def test_renewal_restores_a_swept_subscription(self, setup_db):
+        db = TestingSessionLocal()
+        try:
+            user = User(email="renewal@example.com", hashed_password="x")
+            db.add(user)
+            db.flush()
+            now = datetime.now(timezone.utc)
+            # Expired and cleared by the sweeper before the invoice arrived.
+            db.add(
+                Subscription(
+                    user_id=user.id,
+                    stripe_subscription_id="sub_renewal",
+                    subscription_type=SubscriptionType.monthly,
+                    start_date=now - timedelta(days=31),
+                    end_date=now - timedelta(hours=1),
+                    is_active=False,
+                )
+            )
+            db.commit()
+            period_end = int((now + timedelta(days=31)).timestamp())
+            store_stripe_event(
+                db,
+                {
+                    "id": "evt_renewal",
+                    "type": "invoice.paid",
+                    "data": {
+                        "object": {
+                            "id": "in_renewal",
+                            "billing_reason": "subscription_cycle",
+                            "subscription": "sub_renewal",
+                            "lines": {"data": [{"period": {"end": period_end}}]},
+                        }
+                    },
+                },
+            )
+
+            with patch(
+                "app.services.stripe_events.invalidate_entitlement"
+            ) as invalidate:
+                while process_next_stripe_event(db):
+                    pass
+
+            subscription = (
+                db.query(Subscription)
+                .filter_by(stripe_subscription_id="sub_renewal")
+                .one()
+            )
+            db.refresh(user)
+            assert subscription.is_active
+            assert user.subscription_id == subscription.id
+            assert (
+                subscription.end_date.replace(tzinfo=timezone.utc).timestamp()
+                == period_end
+            )
+            invalidate.assert_called_once_with(user.id)
+        finally:
+            db.close()
+
+    def test_failed_events_back_off(self, setup_db):
+        db = TestingSessionLocal()
+        try:
+            store_stripe_event(
+                db,
+                {
+                    "id": "evt_unknown_user",
+                    "type": "checkout.session.completed",
+                    "data": {
+                        "object": {
+                            "id": "cs_unknown_user",
+                            "mode": "subscription",
+                            "subscription": "sub_unknown_user",
+                            "customer_email": "nobody@example.com",
+                            "metadata": {"subscription_type": "monthly"},
+                        }
+                    },
+                },
+            )
+
+            assert process_next_stripe_event(db)
+            # Not claimed again until the backoff has passed.
+            assert not process_next_stripe_event(db)
+
+            event = db.get(StripeEvent, "evt_unknown_user")
+            assert event.attempts == 1
+            assert event.next_attempt_at.replace(tzinfo=timezone.utc) > datetime.now(
+                timezone.utc
+            ) + timedelta(seconds=app_settings.STRIPE_EVENT_RETRY_BACKOFF_SECONDS / 2)
+        finally:
+            db.close()
+
+    def test_invalid_subscription_type_fails_for_good(self, setup_db):
+        db = TestingSessionLocal()
+        try:
+            store_stripe_event(
+                db,
+                {
+                    "id": "evt_bad_metadata",
+                    "type": "checkout.session.completed",
+                    "data": {
+                        "object": {
+                            "id": "cs_bad_metadata",
+                            "mode": "subscription",
+                            "subscription": "sub_bad_metadata",
+                            "customer_email": "webhook@example.com",
+                            "metadata": {},
+                        }
+                    },
+                },
+            )
+
+            assert process_next_stripe_event(db)
+
+            event = db.get(StripeEvent, "evt_bad_metadata")
+            assert event.processed_at is None
+            assert event.attempts == app_settings.STRIPE_EVENT_MAX_ATTEMPTS
+            assert "subscription_type" in event.last_error
+        finally:
+            db.close()
+
+    def test_second_checkout_does_not_add_an_active_subscription(self, setup_db):
+        db = TestingSessionLocal()
+        try:
+            store_stripe_event(
+                db,
+                {
+                    **CHECKOUT_EVENT,
+                    "id": "evt_second_checkout",
+                    "data": {
+                        "object": {
+                            **CHECKOUT_EVENT["data"]["object"],
+                            "id": "cs_second",
+                            "subscription": "sub_second",
+                        }
+                    },
+                },
+            )
+
+            assert process_next_stripe_event(db)
+
+            user = db.query(User).filter_by(email="webhook@example.com").one()
+            assert (
+                db.query(Subscription)
+                .filter_by(user_id=user.id, is_active=True)
+                .count()
+                == 1
+            )
+            event = db.get(StripeEvent, "evt_second_checkout")
+            assert event.processed_at is None
+            assert "already has active subscription" in event.last_error
+        finally:
+            db.close()
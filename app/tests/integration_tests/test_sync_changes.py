@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core import app_settings
+from app.models import Base, Project, SyncChange, Task, User
+from app.services.sync import (
+    record_project_change,
+    record_project_deleted,
+    record_task_change,
+)
+from app.utils.ranking import rank_between
+
+engine = create_engine(
+    app_settings.TEST_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def project(db):
+    user = User(email="sync@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    project = Project(name="Sync", owner_id=user.id)
+    db.add(project)
+    db.commit()
+    return project
+
+
+def _changes(db):
+    return db.execute(
+        select(SyncChange.entity_id, SyncChange.deleted).order_by(SyncChange.seq)
+    ).all()
+
+
+class TestSyncChanges:
+    def test_changes_are_written_at_commit(self, db, project):
+        record_project_change(db, project)
+        assert _changes(db) == []
+
+        db.commit()
+
+        assert _changes(db) == [(project.id, False)]
+
+    def test_rollback_discards_changes(self, db, project):
+        record_project_change(db, project)
+        db.rollback()
+        db.commit()
+
+        assert _changes(db) == []
+
+    def test_project_deletion_tombstones_its_tasks(self, db, project):
+        task = Task(title="Gone", project_id=project.id, rank=rank_between(None, None))
+        db.add(task)
+        db.flush()
+        record_task_change(db, task.id, project.id)
+        db.commit()
+
+        record_project_deleted(db, project)
+        db.delete(task)
+        db.delete(project)
+        db.commit()
+
+        assert _changes(db) == [(task.id, True), (project.id, True)]
@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core import app_settings
+from app.models import Base, Project, Task, User
+from app.models.task import TaskStatus
+from app.schemas.task import TaskCreate, TaskMove, TaskPatch, TaskUpdate
+from app.services import (
+    create_task,
+    move_task,
+    patch_task,
+    rebalance_task_ranks,
+    update_task,
+)
+
+engine = create_engine(
+    app_settings.TEST_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def project(db):
+    user = User(email="ranks@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    project = Project(name="Ranks", owner_id=user.id)
+    db.add(project)
+    db.commit()
+    return project
+
+
+def _create(db, project, title, task_status=TaskStatus.TODO):
+    return create_task(
+        db, TaskCreate(title=title, project_id=project.id, status=task_status)
+    )
+
+
+def _column(db, project, task_status=TaskStatus.TODO):
+    return db.scalars(
+        select(Task.title)
+        .where(Task.project_id == project.id, Task.status == task_status)
+        .order_by(Task.rank, Task.id)
+    ).all()
+
+
+class TestTaskRanks:
+    def test_rebalance_keeps_versions(self, db, project):
+        task = _create(db, project, "A")
+        _create(db, project, "B")
+
+        rebalance_task_ranks(db, project.id, TaskStatus.TODO)
+
+        # The version the client got from create_task is still current.
+        patched = patch_task(db, task.id, TaskPatch(title="A2", version=1))
+        assert patched.version == 2
+        assert _column(db, project) == ["A2", "B"]
+
+    def test_move_between_tied_ranks(self, db, project):
+        first = _create(db, project, "A")
+        second = _create(db, project, "B")
+        moving = _create(db, project, "C")
+        # Two concurrent creates appended with the same rank.
+        db.get(Task, second.id).rank = db.get(Task, first.id).rank
+        db.commit()
+        after, before = sorted([first, second], key=lambda task: task.id)
+
+        move_task(db, moving.id, TaskMove(after_id=after.id, before_id=before.id))
+
+        assert _column(db, project) == [after.title, "C", before.title]
+
+    def test_status_change_appends_to_the_new_column(self, db, project):
+        put = _create(db, project, "Put")
+        patched = _create(db, project, "Patched")
+        _create(db, project, "Done 1", TaskStatus.DONE)
+        _create(db, project, "Done 2", TaskStatus.DONE)
+
+        update_task(db, put.id, TaskUpdate(title="Put", status=TaskStatus.DONE))
+        patch_task(
+            db, patched.id, TaskPatch(status=TaskStatus.DONE, version=patched.version)
+        )
+
+        assert _column(db, project, TaskStatus.DONE) == [
+            "Done 1",
+            "Done 2",
+            "Put",
+            "Patched",
+        ]
@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import MagicMock
+from uuid import uuid4
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.models import User
+from app.services.access import (
+    authorize_task,
+    clear_access_index,
+    get_user_access,
+    invalidate_teams,
+    invalidate_users,
+)
+
+
+class TestAccessIndex(unittest.TestCase):
+    def setUp(self):
+        clear_access_index()
+        self.db = MagicMock(spec=Session)
+        self.user = User(id=uuid4(), email="test@example.com")
+        self.team_id = uuid4()
+        self.owned_id = uuid4()
+        self.team_project_id = uuid4()
+        self.db.scalars.return_value = [self.team_id]
+        self.db.execute.return_value = [
+            (self.owned_id, self.user.id),
+            (self.team_project_id, uuid4()),
+        ]
+
+    def tearDown(self):
+        clear_access_index()
+
+    def test_builds_access_once(self):
+        access = get_user_access(self.db, self.user.id)
+
+        self.assertEqual(access.team_ids, {self.team_id})
+        self.assertTrue(access.can_access(self.team_project_id))
+        self.assertTrue(access.owns(self.owned_id))
+        self.assertFalse(access.owns(self.team_project_id))
+
+        self.assertIs(get_user_access(self.db, self.user.id), access)
+        self.db.execute.assert_called_once()
+
+    def test_invalidate_user_rebuilds(self):
+        get_user_access(self.db, self.user.id)
+        invalidate_users([self.user.id])
+        get_user_access(self.db, self.user.id)
+
+        self.assertEqual(self.db.execute.call_count, 2)
+
+    def test_invalidate_team_drops_its_members(self):
+        get_user_access(self.db, self.user.id)
+        invalidate_teams([uuid4()])
+        get_user_access(self.db, self.user.id)
+        self.assertEqual(self.db.execute.call_count, 1)
+
+        invalidate_teams([self.team_id])
+        get_user_access(self.db, self.user.id)
+        self.assertEqual(self.db.execute.call_count, 2)
+
+    def test_build_racing_an_invalidation_is_not_cached(self):
+        def invalidate_while_loading(*args):
+            invalidate_users([self.user.id])
+            return []
+
+        self.db.execute.side_effect = invalidate_while_loading
+        get_user_access(self.db, self.user.id)
+        get_user_access(self.db, self.user.id)
+
+        self.assertEqual(self.db.execute.call_count, 2)
+
+    def test_authorize_task_outside_reach(self):
+        self.db.scalar.return_value = uuid4()
+
+        with self.assertRaises(HTTPException) as context:
+            authorize_task(self.db, self.user, uuid4())
+
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_authorize_task_in_team_project(self):
+        self.db.scalar.return_value = self.team_project_id
+
+        self.assertEqual(
+            authorize_task(self.db, self.user, uuid4()), self.team_project_id
+        )
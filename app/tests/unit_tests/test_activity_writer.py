@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import MagicMock
+from uuid import uuid4
+from app.jobs.activity import ActivityWriter
+
+
+def make_entry():
+    project_id = uuid4()
+    return {
+        "project_id": project_id,
+        "actor_id": None,
+        "entity": "project",
+        "entity_id": project_id,
+        "action": "created",
+        "details": {},
+    }
+
+
+class TestActivityWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.session_factory = MagicMock(return_value=self.db)
+
+    def test_record_is_ignored_when_not_running(self):
+        writer = ActivityWriter(self.session_factory)
+
+        writer.record(make_entry())
+        writer.stop()
+
+        self.session_factory.assert_not_called()
+
+    def test_stop_flushes_in_batches(self):
+        writer = ActivityWriter(self.session_factory, batch_size=2, flush_interval=60)
+        writer.start()
+
+        for _ in range(5):
+            writer.record(make_entry())
+        writer.stop()
+
+        self.assertEqual(writer.written, 5)
+        self.assertEqual(self.db.execute.call_count, 3)
+        self.assertEqual(self.db.commit.call_count, 3)
+
+    def test_full_queue_drops_entries(self):
+        writer = ActivityWriter(self.session_factory, max_queue=1)
+        # Pretend the thread is running without consuming the queue.
+        writer._thread = MagicMock()
+
+        writer.record(make_entry())
+        writer.record(make_entry())
+
+        self.assertEqual(writer.dropped, 1)
+
+    def test_failed_batch_is_rolled_back(self):
+        self.db.execute.side_effect = Exception("database unavailable")
+        writer = ActivityWriter(self.session_factory, flush_interval=60)
+        writer.start()
+
+        writer.record(make_entry())
+        writer.stop()
+
+        self.assertEqual(writer.failed, 1)
+        self.db.rollback.assert_called_once()
+        self.db.close.assert_called_once()
@@ -0,0 +1,155 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from app.core.admission import (
+    AdaptiveLimiter,
+    AdmissionMiddleware,
+    Overloaded,
+    classify,
+)
+
+
+class TestAdaptiveLimiter:
+    def test_fast_requests_grow_and_slow_ones_shrink_the_limit(self):
+        limiter = AdaptiveLimiter("reads", 8, target_latency=0.1, queue_timeout=1)
+        limiter.limit = 4.0
+
+        for _ in range(4):
+            limiter.in_flight += 1
+            limiter.release(0.01)
+        assert 4.9 < limiter.limit < 5
+
+        limiter.in_flight += 2
+        limiter.release(1.0)
+        limiter.release(1.0)
+        # One burst of slow requests backs off once.
+        assert limiter.limit == pytest.approx(limiter.backoff * 4.9, abs=0.1)
+        assert limiter.in_flight == 0
+
+    def test_limit_stays_within_bounds(self):
+        limiter = AdaptiveLimiter("auth", 2, target_latency=0, queue_timeout=1)
+
+        for _ in range(20):
+            limiter.in_flight += 1
+            limiter._last_decrease = 0.0
+            limiter.release(1.0)
+        assert limiter.capacity == 1
+
+        limiter.target_latency = 1.0
+        for _ in range(20):
+            limiter.in_flight += 1
+            limiter.release(0.0)
+        assert limiter.limit == 2
+
+    def test_waiters_get_freed_slots_or_time_out(self):
+        async def run():
+            limiter = AdaptiveLimiter("writes", 1, 1.0, queue_timeout=0.05)
+            await limiter.acquire()
+
+            waiting = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            limiter.release(0.0)
+            await waiting
+            assert limiter.in_flight == 1
+
+            with pytest.raises(Overloaded):
+                await limiter.acquire()
+            assert limiter.metrics()["rejected"] == 1
+            assert limiter.metrics()["queued"] == 0
+
+        asyncio.run(run())
+
+    def test_slot_granted_as_the_wait_times_out_is_kept(self):
+        async def run():
+            limiter = AdaptiveLimiter("writes", 1, 1.0, queue_timeout=1)
+            await limiter.acquire()
+
+            async def grant_then_time_out(waiter, timeout):
+                # The holder frees its slot to the waiter just as the timeout
+                # fires.
+                limiter.release(0.0)
+                assert waiter.done()
+                raise asyncio.TimeoutError
+
+            with patch("app.core.admission.asyncio.wait_for", grant_then_time_out):
+                await limiter.acquire()
+
+            assert limiter.in_flight == 1
+            assert limiter.metrics()["rejected"] == 0
+            limiter.release(0.0)
+            assert limiter.in_flight == 0
+
+        asyncio.run(run())
+
+
+def test_classify_routes():
+    assert classify("POST", "/api/v1/auth/login") == "auth"
+    assert classify("GET", "/api/v1/auth/userinfo") == "reads"
+    assert classify("POST", "/api/v1/subscription/create") == "stripe"
+    assert classify("POST", "/api/v1/subscription/webhook") == "writes"
+    assert classify("GET", "/api/v1/projects/") == "reads"
+    assert classify("DELETE", "/api/v1/tasks/1") == "writes"
+    assert classify("POST", "/api/v1/import/tasks") == "imports"
+    assert classify("GET", "/api/v1/events/stream") is None
+    assert classify("POST", "/api/v1/batch") is None
+    assert classify("GET", "/docs") is None
+
+
+def test_requests_over_the_queue_budget_get_503():
+    app = FastAPI()
+
+    @app.get("/api/v1/projects/")
+    async def slow():
+        await asyncio.sleep(0.2)
+        return []
+
+    limiter = AdaptiveLimiter("reads", 1, target_latency=1.0, queue_timeout=0.05)
+    app.add_middleware(AdmissionMiddleware, limiters={"reads": limiter}, retry_after=3)
+
+    async def run():
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            return await asyncio.gather(
+                client.get("/api/v1/projects/"), client.get("/api/v1/projects/")
+            )
+
+    first, second = asyncio.run(run())
+
+    assert first.status_code == 200
+    assert second.status_code == 503
+    assert second.headers["retry-after"] == "3"
+    assert limiter.in_flight == 0
+
+
+def test_latency_is_measured_to_the_response_start():
+    app = FastAPI()
+
+    @app.get("/api/v1/projects/")
+    async def streamed():
+        async def body():
+            await asyncio.sleep(0.2)
+            yield b"[]"
+
+        return StreamingResponse(body())
+
+    limiter = AdaptiveLimiter("reads", 4, target_latency=0.1, queue_timeout=1)
+    limiter.limit = 2.0
+    app.add_middleware(AdmissionMiddleware, limiters={"reads": limiter})
+
+    async def run():
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            return await client.get("/api/v1/projects/")
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    # A slow body does not count as a slow response.
+    assert limiter.limit == 2.5
+    assert limiter.in_flight == 0
@@ -0,0 +1,108 @@
+import gzip
+from unittest.mock import MagicMock, patch
+
+import anyio
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.core.compression import CompressedBodyCache, CompressionMiddleware
+
+BODY = b'{"items": [' + b",".join(b'{"id": %d}' % i for i in range(500)) + b"]}"
+
+
+@pytest.fixture
+def middleware_app():
+    app = FastAPI()
+
+    @app.get("/large")
+    def large():
+        return Response(BODY, media_type="application/json")
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/binary")
+    def binary():
+        return Response(BODY, media_type="application/octet-stream")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (b"chunk %d\n" % i for i in range(3)), media_type="text/plain"
+        )
+
+    @app.get("/encoded")
+    def encoded():
+        return PlainTextResponse(BODY, headers={"Content-Encoding": "identity"})
+
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=100,
+        content_types=["application/json", "text/plain"],
+        cache_bytes=1024 * 1024,
+        offload_size=len(BODY),
+    )
+    return app
+
+
+@pytest.fixture
+def client(middleware_app):
+    return TestClient(middleware_app, headers={"Accept-Encoding": "gzip"})
+
+
+class TestCompressionMiddleware:
+    def test_compresses_large_allowlisted_responses(self, client):
+        response = client.get("/large")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(BODY)
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == BODY
+
+    def test_skips_small_and_unlisted_responses(self, client):
+        for path in ("/small", "/binary", "/encoded"):
+            response = client.get(path)
+            assert response.headers.get("content-encoding") in (None, "identity")
+
+    def test_respects_accept_encoding(self, client):
+        for accept in ("identity", "gzip;q=0"):
+            response = client.get("/large", headers={"Accept-Encoding": accept})
+            assert "content-encoding" not in response.headers
+            assert response.content == BODY
+
+    def test_compresses_streams_chunk_by_chunk(self, client):
+        response = client.get("/stream")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == "chunk 0\nchunk 1\nchunk 2\n"
+
+    def test_large_bodies_are_compressed_off_the_event_loop(self, client):
+        run_sync = anyio.to_thread.run_sync
+        with patch.object(
+            anyio.to_thread, "run_sync", side_effect=run_sync
+        ) as offloaded:
+            response = client.get("/large")
+
+        assert response.content == BODY
+        assert any(call.args[1:] == (BODY,) for call in offloaded.call_args_list)
+
+    def test_cache_compresses_identical_bodies_once(self):
+        encoder = MagicMock(compress=MagicMock(side_effect=gzip.compress))
+        cache = CompressedBodyCache(max_bytes=1024 * 1024)
+
+        assert gzip.decompress(cache.compress(encoder, BODY)) == BODY
+        assert gzip.decompress(cache.compress(encoder, BODY)) == BODY
+        encoder.compress.assert_called_once()
+
+    def test_cache_evicts_over_budget(self):
+        encoder = MagicMock(compress=MagicMock(side_effect=lambda body: body))
+        cache = CompressedBodyCache(max_bytes=10)
+
+        cache.compress(encoder, b"a" * 6)
+        cache.compress(encoder, b"b" * 6)
+        cache.compress(encoder, b"a" * 6)
+
+        assert encoder.compress.call_count == 3
@@ -0,0 +1,54 @@
+import unittest
+from collections import Counter
+from unittest.mock import MagicMock
+from uuid import uuid4
+from sqlalchemy.orm import Session
+from app.models.task import TaskStatus
+from app.services.counters import (
+    adjust_task_counts,
+    move_task_count,
+    get_project_task_counts,
+)
+
+
+class TestCountersService(unittest.TestCase):
+    def setUp(self):
+        self.db = MagicMock(spec=Session)
+        self.db.get_bind.return_value.dialect.name = "sqlite"
+        self.project_id = uuid4()
+
+    def test_adjust_task_counts_is_one_upsert(self):
+        adjust_task_counts(
+            self.db,
+            Counter(
+                {
+                    (self.project_id, TaskStatus.TODO): 2,
+                    (self.project_id, TaskStatus.DONE): 1,
+                }
+            ),
+        )
+
+        self.db.execute.assert_called_once()
+        stmt, values = self.db.execute.call_args.args
+        self.assertIn("ON CONFLICT", str(stmt))
+        self.assertEqual(len(values), 2)
+
+    def test_zero_deltas_are_skipped(self):
+        adjust_task_counts(self.db, Counter({(self.project_id, TaskStatus.TODO): 0}))
+
+        self.db.execute.assert_not_called()
+
+    def test_move_to_same_status_is_a_noop(self):
+        move_task_count(self.db, self.project_id, TaskStatus.DONE, TaskStatus.DONE)
+
+        self.db.execute.assert_not_called()
+
+    def test_get_project_task_counts_fills_missing_statuses(self):
+        self.db.execute.return_value.all.return_value = [(TaskStatus.DONE, 3)]
+
+        counts = get_project_task_counts(self.db, self.project_id)
+
+        self.assertEqual(
+            counts,
+            {TaskStatus.TODO: 0, TaskStatus.IN_PROGRESS: 0, TaskStatus.DONE: 3},
+        )
@@ -0,0 +1,80 @@
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.core import app_settings
+from app.services import verify_user_subscription
+from app.services.entitlements import (
+    clear_entitlements,
+    get_entitlement,
+    has_active_subscription,
+    invalidate_entitlement,
+)
+
+EMAIL = "test@example.com"
+
+
+class TestEntitlements(unittest.TestCase):
+    def setUp(self):
+        clear_entitlements()
+        self.db = MagicMock(spec=Session)
+        self.user_id = uuid4()
+
+    def tearDown(self):
+        clear_entitlements()
+
+    def _subscribed_until(self, end_date):
+        self.db.execute.return_value.first.return_value = (self.user_id, end_date)
+
+    def test_active_subscription_is_cached(self):
+        self._subscribed_until(datetime.now(timezone.utc) + timedelta(days=30))
+
+        self.assertTrue(has_active_subscription(self.db, EMAIL))
+        self.assertTrue(verify_user_subscription(self.db, EMAIL))
+        self.db.execute.assert_called_once()
+
+    def test_expired_subscription_is_rejected(self):
+        # Naive datetimes, as read back from the database, are UTC.
+        self._subscribed_until(
+            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=1)
+        )
+
+        with self.assertRaises(HTTPException) as context:
+            verify_user_subscription(self.db, EMAIL)
+
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_cache_entry_expires_with_the_subscription(self):
+        self._subscribed_until(datetime.now(timezone.utc) + timedelta(seconds=30))
+
+        entitlement = get_entitlement(self.db, EMAIL)
+
+        self.assertLessEqual(entitlement.expires_at - time.monotonic(), 30)
+
+    def test_missing_subscription_is_cached_briefly(self):
+        self._subscribed_until(None)
+
+        entitlement = get_entitlement(self.db, EMAIL)
+
+        self.assertLessEqual(
+            entitlement.expires_at - time.monotonic(),
+            app_settings.ENTITLEMENT_NEGATIVE_TTL_SECONDS,
+        )
+
+    def test_invalidate_reloads(self):
+        self._subscribed_until(None)
+        self.assertFalse(has_active_subscription(self.db, EMAIL))
+
+        self._subscribed_until(datetime.now(timezone.utc) + timedelta(days=30))
+        self.assertFalse(has_active_subscription(self.db, EMAIL))
+
+        invalidate_entitlement(self.user_id)
+        self.assertTrue(has_active_subscription(self.db, EMAIL))
+
+    def test_unknown_user(self):
+        self.db.execute.return_value.first.return_value = None
+
+        self.assertFalse(has_active_subscription(self.db, EMAIL))
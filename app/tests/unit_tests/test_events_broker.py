@@ -0,0 +1,95 @@
+import asyncio
+from unittest.mock import MagicMock
+from uuid import uuid4
+from app.core.events import Event, EventBroker, LocalTransport, PostgresTransport
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestEventBroker:
+    def test_events_are_scoped_to_visible_projects(self):
+        async def scenario():
+            broker = EventBroker()
+            await broker.start(LocalTransport())
+            project_id = uuid4()
+            subscriber = broker.subscribe(uuid4(), {project_id}, queue_size=10)
+
+            broker.publish(Event("task.created", str(project_id)))
+            broker.publish(Event("task.created", str(uuid4())))
+            await asyncio.sleep(0)
+
+            assert subscriber.queue.qsize() == 1
+            await broker.stop()
+
+        run(scenario())
+
+    def test_owner_sees_new_projects(self):
+        async def scenario():
+            broker = EventBroker()
+            await broker.start(LocalTransport())
+            user_id = uuid4()
+            project_id = str(uuid4())
+            subscriber = broker.subscribe(user_id, set(), queue_size=10)
+
+            broker.publish(Event("project.created", project_id, str(user_id)))
+            broker.publish(Event("task.created", project_id))
+            await asyncio.sleep(0)
+
+            assert subscriber.queue.qsize() == 2
+            await broker.stop()
+
+        run(scenario())
+
+    def test_slow_consumer_is_dropped(self):
+        async def scenario():
+            broker = EventBroker()
+            await broker.start(LocalTransport())
+            project_id = uuid4()
+            subscriber = broker.subscribe(uuid4(), {project_id}, queue_size=2)
+
+            for _ in range(3):
+                broker.publish(Event("task.updated", str(project_id)))
+            await asyncio.sleep(0)
+
+            assert subscriber.dropped.is_set()
+            assert subscriber.queue.qsize() == 2
+            assert subscriber not in broker._subscribers
+            await broker.stop()
+
+        run(scenario())
+
+    def test_publish_without_transport_is_a_noop(self):
+        broker = EventBroker()
+
+        broker.publish(Event("task.created", str(uuid4())))
+
+        assert not broker.running
+
+
+class TestPostgresTransport:
+    def test_queued_events_share_one_connection_and_round_trip(self):
+        engine = MagicMock()
+        transport = PostgresTransport(engine)
+        project_id = str(uuid4())
+
+        for _ in range(3):
+            transport.publish(Event("task.updated", project_id))
+        transport._outbox.put(None)
+        transport._publish_queued()
+
+        engine.raw_connection.assert_called_once()
+        connection = engine.raw_connection.return_value
+        (_, params), _ = connection.cursor.return_value.execute.call_args
+        assert len(params["payloads"]) == 3
+        assert connection.cursor.return_value.execute.call_count == 1
+        connection.close.assert_called_once()
+
+    def test_full_queue_drops_events(self):
+        transport = PostgresTransport(MagicMock(), queue_size=1)
+
+        transport.publish(Event("task.created", str(uuid4())))
+        transport.publish(Event("task.created", str(uuid4())))
+
+        assert transport.dropped == 1
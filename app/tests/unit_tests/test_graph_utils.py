@@ -0,0 +1,66 @@
+import pytest
+from app.utils.graph import DependencyGraph
+
+
+@pytest.fixture
+def graph():
+    # b and d depend on a, c depends on b.
+    return DependencyGraph(
+        [("a", False), ("b", False), ("c", False), ("d", False)],
+        [("b", "a"), ("c", "b"), ("d", "a")],
+    )
+
+
+class TestDependencyGraph:
+    def test_topological_order(self, graph):
+        order = graph.topological_order()
+
+        assert order.index("a") < order.index("b") < order.index("c")
+        assert order.index("a") < order.index("d")
+
+    def test_creates_cycle(self, graph):
+        assert graph.creates_cycle("a", "c") is True
+        assert graph.creates_cycle("a", "a") is True
+        assert graph.creates_cycle("d", "c") is False
+        assert graph.creates_cycle("c", "d") is False
+
+    def test_blocked_follows_status(self, graph):
+        assert set(graph.blocked()) == {"b", "c", "d"}
+
+        graph.set_done("a", True)
+        assert graph.blocked() == ["c"]
+
+        graph.set_done("b", True)
+        assert graph.blocked() == []
+
+        graph.set_done("a", False)
+        assert set(graph.blocked()) == {"d"}
+
+    def test_critical_path_skips_done_tasks(self, graph):
+        assert graph.critical_path() == ["a", "b", "c"]
+
+        graph.set_done("a", True)
+        assert graph.critical_path() == ["b", "c"]
+
+    def test_order_is_updated_after_new_edges(self, graph):
+        graph.topological_order()
+        graph.add_edge("a", "d2")
+        graph.add_edge("d2", "c2")
+
+        order = graph.topological_order()
+        assert order.index("c2") < order.index("d2") < order.index("a")
+
+    def test_remove_task_unblocks_dependents(self, graph):
+        graph.remove_task("a")
+
+        assert "a" not in graph
+        assert graph.blocked() == ["c"]
+        order = graph.topological_order()
+        assert order.index("b") < order.index("c")
+
+    def test_remove_edge(self, graph):
+        graph.remove_edge("c", "b")
+
+        assert graph.has_edge("c", "b") is False
+        assert graph.creates_cycle("b", "c") is False
+        assert set(graph.blocked()) == {"b", "d"}
@@ -0,0 +1,156 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models import User
+from app.services import import_tasks_chunk, import_projects_chunk
+from app.utils.imports import (
+    ParsedRow,
+    chunked,
+    iter_lines,
+    iter_ndjson_rows,
+    iter_csv_rows,
+)
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+def parse(parser, *chunks, max_line_bytes=1024):
+    lines = iter_lines(_stream(*chunks), max_line_bytes)
+    if parser is iter_csv_rows:
+        return asyncio.run(_collect(parser(lines, max_line_bytes)))
+    return asyncio.run(_collect(parser(lines)))
+
+
+class TestImportParsing(unittest.TestCase):
+    def test_ndjson_rows_split_across_chunks(self):
+        rows = parse(iter_ndjson_rows, b'{"name": "A"}\n{"na', b'me": "B"}\n\n')
+
+        self.assertEqual(
+            rows, [ParsedRow(1, {"name": "A"}), ParsedRow(2, {"name": "B"})]
+        )
+
+    def test_ndjson_invalid_row_is_reported(self):
+        rows = parse(iter_ndjson_rows, b'{"name": "A"}\nnot json\n[1]\n')
+
+        self.assertEqual(rows[0].data, {"name": "A"})
+        self.assertTrue(rows[1].error.startswith("Invalid JSON"))
+        self.assertEqual(rows[2].error, "Row must be a JSON object")
+
+    def test_over_long_line_is_skipped(self):
+        rows = parse(
+            iter_ndjson_rows,
+            b'{"name": "' + b"x" * 64,
+            b'"}\n{"name": "B"}\n',
+            max_line_bytes=16,
+        )
+
+        self.assertEqual(rows[0].error, "Row exceeds the maximum line size")
+        self.assertEqual(rows[1], ParsedRow(2, {"name": "B"}))
+
+    def test_csv_rows_with_quoted_newlines(self):
+        rows = parse(
+            iter_csv_rows,
+            b'name,description\r\nA,"multi\nline"\nB,\n',
+        )
+
+        self.assertEqual(
+            rows,
+            [
+                ParsedRow(1, {"name": "A", "description": "multi\nline"}),
+                ParsedRow(2, {"name": "B"}),
+            ],
+        )
+
+    def test_csv_unbalanced_quote_is_capped(self):
+        rows = parse(
+            iter_csv_rows,
+            b'name,description\nA,"stray\n' + b"x" * 10 + b"\n",
+            b"B,ok\n",
+            max_line_bytes=16,
+        )
+
+        self.assertEqual(
+            rows,
+            [
+                ParsedRow(1, None, "Row exceeds the maximum record size"),
+                ParsedRow(2, {"name": "B", "description": "ok"}),
+            ],
+        )
+
+    def test_chunked(self):
+        rows = [ParsedRow(i, {}) for i in range(5)]
+
+        async def source():
+            for row in rows:
+                yield row
+
+        chunks = asyncio.run(_collect(chunked(source(), 2)))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+
+
+class TestImportChunks(unittest.TestCase):
+    def setUp(self):
+        self.db = MagicMock(spec=Session)
+        self.user = User(id=uuid4(), email="test@example.com")
+        self.project_id = uuid4()
+
+    def test_import_tasks_chunk(self):
+        access = MagicMock(project_ids=frozenset({self.project_id}))
+        rows = [
+            ParsedRow(1, {"title": "Task", "project_id": str(self.project_id)}),
+            ParsedRow(2, {"title": "Other", "project_id": str(uuid4())}),
+            ParsedRow(3, {"project_id": str(self.project_id)}),
+            ParsedRow(4, None, "Invalid JSON"),
+        ]
+
+        with patch("app.services.imports.get_user_access", return_value=access):
+            imported, errors = import_tasks_chunk(self.db, self.user, rows)
+
+        self.assertEqual(imported, 1)
+        self.assertEqual(
+            {error.row: error.error for error in errors}[2], "Project not found"
+        )
+        self.assertEqual(sorted(error.row for error in errors), [2, 3, 4])
+        inserted = [
+            call.args[1]
+            for call in self.db.execute.call_args_list
+            if len(call.args) > 1
+        ]
+        self.assertEqual(len(inserted[-1]), 1)
+        self.db.commit.assert_called_once()
+
+    def test_import_projects_chunk_skips_duplicates(self):
+        self.db.scalars.return_value = ["Existing"]
+        rows = [
+            ParsedRow(1, {"name": "Existing"}),
+            ParsedRow(2, {"name": "New"}),
+            ParsedRow(3, {"name": "New"}),
+        ]
+
+        imported, errors = import_projects_chunk(self.db, self.user, rows)
+
+        self.assertEqual(imported, 1)
+        self.assertEqual([error.row for error in errors], [1, 3])
+
+    def test_failed_chunk_is_rolled_back(self):
+        self.db.scalars.return_value = []
+        self.db.execute.side_effect = IntegrityError("INSERT", {}, Exception())
+        rows = [ParsedRow(1, {"name": "A"}), ParsedRow(2, {"name": "B"})]
+
+        imported, errors = import_projects_chunk(self.db, self.user, rows)
+
+        self.assertEqual(imported, 0)
+        self.assertEqual(len(errors), 2)
+        self.db.rollback.assert_called_once()
+        self.db.commit.assert_not_called()
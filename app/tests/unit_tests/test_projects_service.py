@@ -57,7 +57,7 @@ class TestProjectService(unittest.TestCase):
         # Mock a successful query response
         self.db.query.return_value.filter.return_value.first.return_value = self.project
 
-        with patch("app.services.get_project", return_value=self.project):
+        with patch("app.services.projects.can_access_project", return_value=True):
             found_project = get_project(self.db, self.project.id, self.user)
         self.assertEqual(found_project, self.project)
 
@@ -73,9 +73,13 @@ class TestProjectService(unittest.TestCase):
         self.assertEqual(context.exception.detail, "Project not found")
 
     def test_get_user_projects(self):
-        self.db.query().filter().offset().limit().all.return_value = [self.project]
+        self.db.execute.return_value.all.return_value = [self.project]
 
-        projects = get_user_projects(self.db, self.user)
+        with patch(
+            "app.services.projects.get_user_access",
+            return_value=MagicMock(project_ids={self.project.id}),
+        ):
+            projects = get_user_projects(self.db, self.user)
         print(projects)
 
         self.assertEqual(len(projects), 1)
@@ -87,9 +91,10 @@ class TestProjectService(unittest.TestCase):
         self.db.commit = MagicMock()
         self.db.refresh = MagicMock()
 
-        updated_project = update_project(
-            self.db, self.project.id, self.user, self.updated_project_data
-        )
+        with patch("app.services.projects.can_access_project", return_value=True):
+            updated_project = update_project(
+                self.db, self.project.id, self.user, self.updated_project_data
+            )
 
         self.db.commit.assert_called_once()
         self.db.refresh.assert_called_once()
@@ -98,13 +103,27 @@ class TestProjectService(unittest.TestCase):
             updated_project.description, self.updated_project_data.description
         )
 
+    def test_update_project_by_team_member_forbidden(self):
+        self.project.owner_id = uuid4()
+        self.db.query.return_value.filter.return_value.first.return_value = self.project
+
+        with patch("app.services.projects.can_access_project", return_value=True):
+            with self.assertRaises(HTTPException) as context:
+                update_project(
+                    self.db, self.project.id, self.user, self.updated_project_data
+                )
+
+        self.assertEqual(context.exception.status_code, 403)
+        self.db.commit.assert_not_called()
+
     def test_delete_project_success(self):
         # Mock successful retrieval and deletion
         self.db.query.return_value.filter.return_value.first.return_value = self.project
         self.db.delete = MagicMock()
         self.db.commit = MagicMock()
 
-        response = delete_project(self.db, self.project.id, self.user)
+        with patch("app.services.projects.can_access_project", return_value=True):
+            response = delete_project(self.db, self.project.id, self.user)
 
         self.db.delete.assert_called_once_with(self.project)
         self.db.commit.assert_called_once()
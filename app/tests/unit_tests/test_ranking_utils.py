@@ -0,0 +1,49 @@
+import random
+
+import pytest
+from app.utils.ranking import rank_between, ranks_after, spread_ranks
+
+
+class TestRanking:
+    def test_first_rank(self):
+        assert rank_between(None, None) == "i"
+
+    def test_rank_between_neighbours(self):
+        assert "a" < rank_between("a", "b") < "b"
+        assert "a" < rank_between("a", "a1") < "a1"
+        assert rank_between(None, "1") < "1"
+        assert rank_between("zz", None) > "zz"
+
+    def test_rank_between_rejects_unordered_neighbours(self):
+        with pytest.raises(ValueError):
+            rank_between("b", "a")
+        with pytest.raises(ValueError):
+            rank_between("a", "a")
+
+    def test_random_inserts_stay_ordered(self):
+        rng = random.Random(0)
+        ranks = []
+        for _ in range(1000):
+            i = rng.randint(0, len(ranks))
+            before = ranks[i - 1] if i > 0 else None
+            after = ranks[i] if i < len(ranks) else None
+            ranks.insert(i, rank_between(before, after))
+
+        assert ranks == sorted(ranks)
+        assert len(set(ranks)) == len(ranks)
+        assert not any(rank.endswith("0") for rank in ranks)
+
+    def test_spread_ranks_are_short_and_ordered(self):
+        ranks = spread_ranks(1000)
+
+        assert ranks == sorted(ranks)
+        assert len(set(ranks)) == 1000
+        assert max(len(rank) for rank in ranks) == 3
+
+    def test_ranks_after(self):
+        ranks = ranks_after("h", 50)
+
+        assert len(ranks) == 50
+        assert ranks == sorted(ranks)
+        assert ranks[0] > "h"
+        assert ranks_after(None, 3) == spread_ranks(3)
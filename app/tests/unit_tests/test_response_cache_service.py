@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+from typing import List
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import Request
+from app.core.cache import LocalCache, RedisCache, RedisError, build_cache
+from app.core.security import create_access_token
+from app.schemas.project import ProjectResponse
+from app.services.access import UserAccess
+from app.services.entitlements import Entitlement
+from app.services.response_cache import (
+    bump_generations,
+    bump_project_generations,
+    cached_response,
+    get_cached_response,
+    user_scopes,
+)
+from benchmarks.fake_redis import serve
+
+
+def _request(token: str, query: bytes = b"") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/projects/",
+            "query_string": query,
+            "headers": [(b"authorization", token.encode())],
+        }
+    )
+
+
+@pytest.fixture
+def user_id():
+    user_id = uuid4()
+    entitlement = Entitlement(user_id, None, time.monotonic() + 60)
+    with patch("app.services.response_cache.cache", LocalCache(100, 60)), patch(
+        "app.services.response_cache.get_entitlement", return_value=entitlement
+    ):
+        yield user_id
+
+
+class TestResponseCache:
+    token = create_access_token({"sub": "cache@example.com"})
+
+    def _project(self, user_id):
+        return ProjectResponse(
+            id=uuid4(), name="Cached", owner_id=user_id, created_at="2024-01-01T00:00"
+        )
+
+    def _fill(self, user_id, project_id, query=b""):
+        build = MagicMock(return_value=[self._project(user_id)])
+        response = cached_response(
+            _request(self.token, query),
+            user_id,
+            [f"user:{user_id}", f"project:{project_id}"],
+            List[ProjectResponse],
+            build,
+        )
+        return response, build
+
+    def test_repeat_read_is_served_from_cache(self, user_id):
+        db = MagicMock()
+        assert get_cached_response(db, _request(self.token)) is None
+
+        response, build = self._fill(user_id, uuid4())
+        cached = get_cached_response(db, _request(self.token))
+
+        build.assert_called_once()
+        assert cached.body == response.body
+        db.execute.assert_not_called()
+        assert get_cached_response(db, _request(self.token, b"limit=5")) is None
+
+    def test_write_to_a_scope_invalidates(self, user_id):
+        project_id = uuid4()
+        self._fill(user_id, project_id)
+
+        bump_generations(projects=[uuid4()], teams=[None])
+        assert get_cached_response(MagicMock(), _request(self.token)) is not None
+
+        bump_generations(projects=[project_id])
+        assert get_cached_response(MagicMock(), _request(self.token)) is None
+
+    def test_project_writes_reach_user_wide_reads(self, user_id):
+        team_id = uuid4()
+        access = UserAccess(
+            team_ids=frozenset([team_id]),
+            project_ids=frozenset(uuid4() for _ in range(50)),
+            owned_project_ids=frozenset(),
+            expires_at=0,
+        )
+        with patch("app.services.response_cache.get_user_access", return_value=access):
+            scopes = user_scopes(MagicMock(), MagicMock(id=user_id))
+        assert scopes == [f"user:{user_id}", f"team:{team_id}"]
+        cached_response(
+            _request(self.token),
+            user_id,
+            scopes,
+            List[ProjectResponse],
+            lambda: [self._project(user_id)],
+        )
+
+        db = MagicMock()
+        db.execute.return_value.all.return_value = [(uuid4(), team_id)]
+        bump_project_generations(db, [uuid4()])
+
+        assert get_cached_response(MagicMock(), _request(self.token)) is None
+
+    def test_invalid_token_is_a_miss(self, user_id):
+        self._fill(user_id, uuid4())
+
+        assert get_cached_response(MagicMock(), _request("not-a-token")) is None
+
+
+@pytest.fixture(scope="module")
+def redis_url():
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(serve("127.0.0.1", 0))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield f"redis://127.0.0.1:{port}/1"
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+class TestRedisCache:
+    def test_values_and_counters(self, redis_url):
+        cache = RedisCache(redis_url)
+
+        assert cache.get("missing") is None
+        cache.set("key", b"value\r\nwith newline", ttl=60)
+        assert cache.get("key") == b"value\r\nwith newline"
+
+        cache.incr(["gen:a", "gen:a", "gen:b"])
+        assert cache.get_counters(["gen:a", "gen:b", "gen:c"]) == [2, 1, 0]
+
+    def test_values_expire(self, redis_url):
+        cache = RedisCache(redis_url)
+
+        cache.set("short", b"value", ttl=0.01)
+        time.sleep(0.05)
+        assert cache.get("short") is None
+
+    def test_error_reply_does_not_desync_the_connection(self, redis_url):
+        cache = RedisCache(redis_url)
+        cache.set("first", b"1", ttl=60)
+        cache.set("second", b"2", ttl=60)
+
+        with pytest.raises(RedisError):
+            cache._execute([("GET", "first"), ("BOGUS",), ("GET", "first")])
+
+        assert cache.get("second") == b"2"
+
+
+class TestLocalCache:
+    def test_idle_counters_are_dropped(self):
+        cache = LocalCache(10, ttl=0.01)
+        cache.incr(["gen:old"])
+        time.sleep(0.03)
+
+        cache.incr(["gen:new"])
+
+        assert list(cache._counters) == ["gen:new"]
+        assert cache.get_counters(["gen:old", "gen:new"]) == [0, 1]
+
+    def test_too_many_live_counters_clear_the_cache(self):
+        cache = LocalCache(10, ttl=60, max_counters=2)
+        cache.set("entry", b"x", 60)
+
+        cache.incr(["gen:a", "gen:b", "gen:c"])
+
+        assert cache.get("entry") is None
+        assert cache.get_counters(["gen:a"]) == [0]
+
+    def test_refused_with_several_workers(self):
+        with pytest.raises(ValueError):
+            build_cache("local", "", 10, 60, workers=4)
@@ -0,0 +1,116 @@
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from app.models import Task
+from app.models.task import TaskStatus
+from app.schemas.task import TaskInDB
+from app.utils.db import columns_for
+from app.utils.serialization import (
+    RawJSONResponse,
+    dump_json,
+    item_response,
+    list_response,
+    parse_fields,
+)
+
+
+def _task(**kwargs):
+    now = datetime.now(timezone.utc)
+    values = dict(
+        id=uuid4(),
+        title="Task",
+        description=None,
+        status=TaskStatus.TODO,
+        project_id=uuid4(),
+        created_at=now,
+        updated_at=None,
+        version=1,
+        rank="i",
+    )
+    values.update(kwargs)
+    return Task(**values)
+
+
+class TestSerialization:
+    def test_dump_json_matches_fastapi_encoding(self):
+        tasks = [_task(), _task(description="Second", updated_at=datetime.now())]
+
+        expected = jsonable_encoder(
+            [TaskInDB.model_validate(task, from_attributes=True) for task in tasks]
+        )
+        assert json.loads(dump_json(TaskInDB, tasks)) == expected
+
+    def test_dump_json_falls_back_to_attributes(self):
+        class LazyRank:
+            # rank is missing from __dict__, like an expired column.
+            def __init__(self, task):
+                self.__dict__.update(
+                    (key, value)
+                    for key, value in task.__dict__.items()
+                    if key != "rank"
+                )
+
+            @property
+            def rank(self):
+                return "loaded"
+
+        row = json.loads(dump_json(TaskInDB, [LazyRank(_task())]))[0]
+        assert row["rank"] == "loaded"
+
+    def test_list_response_is_opt_in(self):
+        tasks = [_task()]
+
+        with patch("app.utils.serialization.app_settings.FAST_JSON_RESPONSES", False):
+            assert list_response(TaskInDB, tasks) is tasks
+
+        with patch("app.utils.serialization.app_settings.FAST_JSON_RESPONSES", True):
+            response = list_response(TaskInDB, tasks)
+        assert isinstance(response, RawJSONResponse)
+        assert response.body == dump_json(TaskInDB, tasks)
+
+    def test_dump_json_reads_core_rows(self):
+        engine = create_engine("sqlite://")
+        Task.__table__.create(engine)
+        tasks = [_task(), _task(description="Second")]
+        with Session(engine) as db:
+            db.add_all(tasks)
+            db.commit()
+            rows = db.execute(
+                select(*columns_for(Task, TaskInDB)).order_by(Task.id)
+            ).all()
+            objects = db.query(Task).order_by(Task.id).all()
+
+            assert dump_json(TaskInDB, rows) == dump_json(TaskInDB, objects)
+
+    def test_parse_fields(self):
+        assert parse_fields(TaskInDB, None) is None
+        assert parse_fields(TaskInDB, " , ") is None
+        # Schema order, so every subset is one partial model.
+        assert parse_fields(TaskInDB, "id, title,id") == ("title", "id")
+        assert parse_fields(TaskInDB, "title,id") == ("title", "id")
+
+        with pytest.raises(HTTPException) as error:
+            parse_fields(TaskInDB, "id,secret")
+        assert error.value.status_code == 400
+
+    def test_sparse_fieldsets_select_and_encode_only_those_fields(self):
+        fields = ("id", "title")
+        assert [column.key for column in columns_for(Task, TaskInDB, fields)] == [
+            "id",
+            "title",
+        ]
+
+        task = _task()
+        rows = json.loads(list_response(TaskInDB, [task], fields).body)
+        assert rows == [{"id": str(task.id), "title": task.title}]
+        assert json.loads(item_response(TaskInDB, task, ("status",)).body) == {
+            "status": "todo"
+        }
+        assert item_response(TaskInDB, task) is task
@@ -1,10 +1,22 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pytest
+import stripe
 from unittest.mock import patch, MagicMock
-from app.services import create_subscription, cancel_subscription
+from app.core import app_settings
+from app.core.stripe import CircuitBreaker, call_stripe
+from app.jobs.subscriptions import SubscriptionSweeper
+from app.services import (
+    create_subscription,
+    cancel_subscription,
+    deactivate_expired_subscriptions,
+    get_stripe_session,
+)
 from app.schemas.subscription import SubscriptionType
 from app.models import User, Subscription
 from fastapi import HTTPException
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 # Mock data for tests
@@ -148,3 +160,157 @@ class TestSubscription:
 
         assert excinfo.value.status_code == 404
         assert excinfo.value.detail == "User does not have an active subscription."
+
+
+class TestStripeCalls:
+
+    @pytest.fixture(autouse=True)
+    def fresh_breaker(self):
+        with patch("app.core.stripe.breaker", CircuitBreaker(2, 60)) as breaker:
+            with patch.object(app_settings, "STRIPE_RETRY_BACKOFF_SECONDS", 0):
+                yield breaker
+
+    def test_call_stripe_returns_result(self):
+        assert call_stripe(lambda value: value * 2, 21) == 42
+
+    def test_call_stripe_times_out(self):
+        release = threading.Event()
+        with patch.object(app_settings, "STRIPE_TIMEOUT_SECONDS", 0.01):
+            with patch.object(app_settings, "STRIPE_MAX_RETRIES", 0):
+                with patch("app.core.stripe.RUNNING_GRACE_SECONDS", 0.01):
+                    with pytest.raises(HTTPException) as excinfo:
+                        call_stripe(release.wait, 5)
+        release.set()
+
+        assert excinfo.value.status_code == 504
+
+    def test_call_stripe_waits_out_running_calls(self):
+        with patch.object(app_settings, "STRIPE_TIMEOUT_SECONDS", 0.05):
+            assert call_stripe(lambda: time.sleep(0.1) or "ok") == "ok"
+
+    def test_call_stripe_cancels_queued_calls(self, fresh_breaker):
+        release = threading.Event()
+        fn = MagicMock()
+        with patch("app.core.stripe._executor", ThreadPoolExecutor(1)) as executor:
+            executor.submit(release.wait, 5)
+            with patch.object(app_settings, "STRIPE_TIMEOUT_SECONDS", 0.01):
+                with patch.object(app_settings, "STRIPE_MAX_RETRIES", 0):
+                    with pytest.raises(HTTPException) as excinfo:
+                        call_stripe(fn)
+            release.set()
+            executor.shutdown()
+
+        assert excinfo.value.status_code == 504
+        fn.assert_not_called()
+
+    def test_call_stripe_retries_transient_errors(self):
+        fn = MagicMock(side_effect=[stripe.APIConnectionError("reset"), "ok"])
+
+        assert call_stripe(fn, idempotency_key="key") == "ok"
+        assert fn.call_count == 2
+        fn.assert_called_with(idempotency_key="key")
+
+    def test_call_stripe_retries_queued_calls(self, fresh_breaker):
+        release = threading.Event()
+        fn = MagicMock(return_value="ok")
+        with patch("app.core.stripe._executor", ThreadPoolExecutor(1)) as executor:
+            executor.submit(release.wait, 5)
+            with patch.object(app_settings, "STRIPE_TIMEOUT_SECONDS", 0.05):
+                threading.Timer(0.08, release.set).start()
+                assert call_stripe(fn) == "ok"
+            executor.shutdown()
+
+        fn.assert_called_once_with()
+
+    def test_call_stripe_does_not_retry_running_timeouts(self, fresh_breaker):
+        release = threading.Event()
+        fn = MagicMock(side_effect=lambda: release.wait(5))
+        with patch.object(app_settings, "STRIPE_TIMEOUT_SECONDS", 0.01):
+            with patch("app.core.stripe.RUNNING_GRACE_SECONDS", 0.01):
+                with pytest.raises(HTTPException) as excinfo:
+                    call_stripe(fn)
+        release.set()
+
+        assert excinfo.value.status_code == 504
+        assert fn.call_count == 1
+
+    def test_call_stripe_does_not_retry_server_errors(self, fresh_breaker):
+        fn = MagicMock(side_effect=stripe.APIError("down"))
+
+        with pytest.raises(HTTPException) as excinfo:
+            call_stripe(fn, idempotency_key="key")
+        assert excinfo.value.status_code == 502
+        assert fn.call_count == 1
+
+    def test_call_stripe_does_not_retry_request_errors(self, fresh_breaker):
+        fn = MagicMock(side_effect=stripe.InvalidRequestError("bad", "param"))
+
+        with pytest.raises(stripe.InvalidRequestError):
+            call_stripe(fn)
+        assert fn.call_count == 1
+        assert not fresh_breaker.is_open
+
+    def test_breaker_opens_and_fails_fast(self, fresh_breaker):
+        fn = MagicMock(side_effect=stripe.APIConnectionError("down"))
+
+        with pytest.raises(HTTPException) as excinfo:
+            call_stripe(fn)
+        assert excinfo.value.status_code == 502
+        assert fresh_breaker.is_open
+
+        with pytest.raises(HTTPException) as excinfo:
+            call_stripe(fn)
+        assert excinfo.value.status_code == 503
+        assert fn.call_count == 2
+
+    def test_stripe_session_is_cached(self):
+        session = MagicMock(status="open")
+        with patch(
+            "stripe.checkout.Session.retrieve", return_value=session
+        ) as retrieve:
+            assert get_stripe_session("cs_cached") is session
+            assert get_stripe_session("cs_cached") is session
+
+        retrieve.assert_called_once_with("cs_cached")
+
+
+class TestSubscriptionSweep:
+
+    def test_no_expired_subscriptions(self, db_session):
+        db_session.execute.return_value.all.return_value = []
+
+        assert deactivate_expired_subscriptions(db_session, 100) == 0
+        db_session.commit.assert_not_called()
+
+    def test_expired_subscriptions_clear_users(self, db_session):
+        expired = [(uuid4(), uuid4()), (uuid4(), uuid4())]
+        db_session.execute.return_value.all.return_value = expired
+
+        assert deactivate_expired_subscriptions(db_session, 100) == 2
+        assert db_session.execute.call_count == 2
+        db_session.commit.assert_called_once()
+
+    def test_expiry_waits_for_the_grace_period(self, db_session):
+        db_session.execute.return_value.all.return_value = []
+        now = datetime(2024, 1, 31, tzinfo=timezone.utc)
+
+        with patch.object(app_settings, "SUBSCRIPTION_EXPIRY_GRACE_SECONDS", 3600):
+            deactivate_expired_subscriptions(db_session, 100, now=now)
+
+        statement = db_session.execute.call_args.args[0]
+        assert now - timedelta(hours=1) in statement.compile().params.values()
+
+    def test_sweeper_runs_batches_until_short(self):
+        sweeper = SubscriptionSweeper(
+            session_factory=MagicMock, batch_size=10, max_batches=5
+        )
+        with patch(
+            "app.jobs.subscriptions.deactivate_expired_subscriptions",
+            side_effect=[10, 10, 3],
+        ):
+            assert sweeper.sweep() == 23
+
+        metrics = sweeper.metrics()
+        assert metrics["batches"] == 3
+        assert metrics["deactivated"] == 23
+        assert metrics["failed"] == 0
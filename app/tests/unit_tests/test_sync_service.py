@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.models import SyncChange, SyncEntity, User
+from app.services.access import UserAccess
+from app.services import get_changes
+from app.services.sync import (
+    _write_changes,
+    decode_cursor,
+    encode_cursor,
+    record_task_change,
+)
+
+
+class TestSyncService(unittest.TestCase):
+    def setUp(self):
+        self.db = MagicMock(spec=Session)
+        self.user = User(id=uuid4(), email="test@example.com")
+        self.team_project_id = uuid4()
+        access = UserAccess(
+            team_ids=frozenset(),
+            project_ids=frozenset([self.team_project_id]),
+            owned_project_ids=frozenset(),
+            expires_at=0,
+        )
+        patcher = patch("app.services.sync.get_user_access", return_value=access)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(42)), 42)
+        self.assertEqual(decode_cursor(None), 0)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(HTTPException) as context:
+            decode_cursor("not-a-cursor")
+
+        self.assertEqual(context.exception.status_code, 400)
+
+    def test_no_changes_is_a_single_query(self):
+        self.db.scalar.return_value = 7
+        cursor = encode_cursor(7)
+
+        response = get_changes(self.db, self.user, cursor)
+
+        self.assertEqual(response.cursor, cursor)
+        self.assertFalse(response.has_more)
+        self.db.scalar.assert_called_once()
+        self.db.scalars.assert_not_called()
+
+    def test_tombstones_are_returned(self):
+        task_id = uuid4()
+        self.db.scalar.return_value = 9
+        self.db.scalars.return_value.all.return_value = [
+            SyncChange(
+                seq=9,
+                entity=SyncEntity.task,
+                entity_id=task_id,
+                project_id=uuid4(),
+                owner_id=self.user.id,
+                deleted=True,
+            )
+        ]
+
+        response = get_changes(self.db, self.user, None)
+
+        self.assertEqual(response.deleted_tasks, [task_id])
+        self.assertEqual(response.cursor, encode_cursor(9))
+        self.db.scalars.assert_called_once()
+
+    def test_changes_are_written_under_the_lock_at_commit(self):
+        self.db.get_bind.return_value.dialect.name = "postgresql"
+        self.db.info = {}
+
+        record_task_change(self.db, uuid4(), uuid4())
+        self.db.execute.assert_not_called()
+
+        _write_changes(self.db)
+
+        statements = [str(call.args[0]) for call in self.db.execute.call_args_list]
+        self.assertIn("pg_advisory_xact_lock", statements[0])
+        self.assertIn("DELETE FROM sync_changes", statements[1])
+        self.assertIn("INSERT INTO sync_changes", statements[2])
+
+    def test_team_project_changes_are_included(self):
+        self.db.scalar.return_value = 1
+        self.db.scalars.return_value.all.return_value = []
+
+        get_changes(self.db, self.user, None)
+
+        query = str(self.db.scalars.call_args.args[0])
+        self.assertIn("sync_changes.owner_id", query)
+        self.assertIn("sync_changes.project_id IN", query)
@@ -1,11 +1,20 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
-from app.schemas.task import TaskCreate, TaskUpdate, TaskStatus
+from fastapi import HTTPException
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskPatch,
+    TaskMove,
+    TaskStatus,
+)
 from app.models import Task
 from app.services import (
     create_task,
     update_task,
+    patch_task,
+    move_task,
     delete_task,
     get_task_by_id,
     get_tasks,
@@ -50,6 +59,7 @@ class TestTaskService(unittest.TestCase):
         self.mock_db.add = MagicMock()
         self.mock_db.commit = MagicMock()
         self.mock_db.refresh = MagicMock()
+        self.mock_db.scalar.return_value = "i"
 
         result = create_task(self.mock_db, self.task_data_create)
 
@@ -58,9 +68,11 @@ class TestTaskService(unittest.TestCase):
         self.mock_db.refresh.assert_called_once_with(result)
         self.assertEqual(result.title, self.task_data_create.title)
         self.assertEqual(result.project_id, self.task_data_create.project_id)
+        self.assertEqual(result.rank, "j")
 
     def test_update_task(self):
         self.mock_db.query().filter().first.return_value = self.mock_task
+        self.mock_db.scalar.return_value = "k"
 
         result = update_task(self.mock_db, self.mock_task_id, self.task_data_update)
 
@@ -68,6 +80,8 @@ class TestTaskService(unittest.TestCase):
         self.assertEqual(result.title, self.task_data_update.title)
         self.assertEqual(result.description, self.task_data_update.description)
         self.assertEqual(result.status, self.task_data_update.status)
+        # Moved to the end of the new column.
+        self.assertEqual(result.rank, "l")
         self.mock_db.commit.assert_called_once()
         self.mock_db.refresh.assert_called_once_with(result)
 
@@ -79,6 +93,106 @@ class TestTaskService(unittest.TestCase):
         self.assertIsNone(result)
         self.mock_db.commit.assert_not_called()
 
+    def test_patch_task(self):
+        self.mock_db.execute().first.return_value = (
+            "Test Task",
+            TaskStatus.TODO,
+            self.mock_project_id,
+        )
+        self.mock_db.scalars().first.return_value = self.mock_task
+
+        with patch("app.services.task.record_task_changes") as record_changes:
+            result = patch_task(
+                self.mock_db, self.mock_task_id, TaskPatch(title="Patched", version=1)
+            )
+
+        self.assertEqual(result, self.mock_task)
+        # The previous title is read so the activity log only records renames.
+        self.assertEqual(record_changes.call_args.args[2], "Test Task")
+        self.mock_db.scalar.assert_not_called()
+        self.mock_db.expunge.assert_called_once_with(self.mock_task)
+        self.mock_db.commit.assert_called_once()
+
+    def test_patch_task_version_conflict(self):
+        self.mock_db.execute().first.return_value = None
+        self.mock_db.scalar.return_value = True
+
+        with self.assertRaises(HTTPException) as context:
+            patch_task(
+                self.mock_db, self.mock_task_id, TaskPatch(title="Patched", version=1)
+            )
+
+        self.assertEqual(context.exception.status_code, 409)
+        self.mock_db.commit.assert_not_called()
+
+    def test_patch_task_not_found(self):
+        self.mock_db.execute().first.return_value = None
+        self.mock_db.scalar.return_value = None
+
+        result = patch_task(
+            self.mock_db,
+            self.mock_task_id,
+            TaskPatch(status=TaskStatus.DONE, version=1),
+        )
+
+        self.assertIsNone(result)
+        self.mock_db.commit.assert_not_called()
+
+    def test_move_task_to_end(self):
+        self.mock_db.execute().first.return_value = (
+            self.mock_project_id,
+            TaskStatus.TODO,
+            1,
+        )
+        self.mock_db.scalar.return_value = "k"
+        self.mock_db.scalars().first.return_value = self.mock_task
+
+        result = move_task(
+            self.mock_db, self.mock_task_id, TaskMove(status=TaskStatus.DONE)
+        )
+
+        self.assertEqual(result, self.mock_task)
+        self.mock_db.expunge.assert_called_once_with(self.mock_task)
+        self.mock_db.commit.assert_called_once()
+        # The last task of the column is locked against a concurrent rebalance.
+        bound = str(self.mock_db.scalar.call_args_list[0].args[0])
+        self.assertIn("FOR UPDATE", bound)
+
+    def test_move_task_locks_neighbours(self):
+        current = MagicMock()
+        current.first.return_value = (self.mock_project_id, TaskStatus.TODO, 1)
+        neighbours = MagicMock()
+        neighbours.all.return_value = []
+        self.mock_db.execute.side_effect = [current, neighbours]
+
+        with self.assertRaises(HTTPException):
+            move_task(self.mock_db, self.mock_task_id, TaskMove(after_id=uuid4()))
+
+        query = str(self.mock_db.execute.call_args_list[1].args[0])
+        self.assertIn("FOR UPDATE", query)
+
+    def test_move_task_missing_neighbour(self):
+        current = MagicMock()
+        current.first.return_value = (self.mock_project_id, TaskStatus.TODO, 1)
+        # The neighbour lookup finds nothing in the target column.
+        neighbours = MagicMock()
+        neighbours.all.return_value = []
+        self.mock_db.execute.side_effect = [current, neighbours]
+
+        with self.assertRaises(HTTPException) as context:
+            move_task(self.mock_db, self.mock_task_id, TaskMove(after_id=uuid4()))
+
+        self.assertEqual(context.exception.status_code, 400)
+        self.mock_db.commit.assert_not_called()
+
+    def test_move_task_not_found(self):
+        self.mock_db.execute().first.return_value = None
+
+        result = move_task(self.mock_db, self.mock_task_id, TaskMove())
+
+        self.assertIsNone(result)
+        self.mock_db.commit.assert_not_called()
+
     def test_delete_task(self):
         self.mock_db.query().filter().first.return_value = self.mock_task
 
@@ -106,27 +220,30 @@ class TestTaskService(unittest.TestCase):
         self.mock_db.query().filter().first.assert_called_once()
 
     def test_get_tasks(self):
-        # Mock the first query for the user
-        self.mock_db.query().filter().first.return_value = self.mock_user
-
-        # Mock the second query for the projects owned by the user
-        self.mock_db.query().filter().all.return_value = [self.mock_project]
+        # Mock the lookup of the user's id
+        self.mock_db.scalar.return_value = self.mock_user.id
 
-        # Mock the third query for the tasks associated with the projects
-        self.mock_db.query().filter().all.return_value = [self.mock_task]
+        # Mock the task rows of the projects the user can reach
+        self.mock_db.execute.return_value.all.return_value = [self.mock_task]
 
-        result = get_tasks(self.mock_db, "test@example.com")
+        with patch(
+            "app.services.task.get_user_access",
+            return_value=MagicMock(project_ids={self.mock_project_id}),
+        ):
+            result = get_tasks(self.mock_db, "test@example.com")
 
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0], self.mock_task)
-        self.mock_db.query().filter().all.assert_called()
+        self.mock_db.execute().all.assert_called()
 
     def test_get_tasks_by_project(self):
-        self.mock_db.query().filter().all.return_value = [self.mock_task]
+        self.mock_db.query().filter().first.return_value = self.mock_user
+        self.mock_db.execute.return_value.all.return_value = [self.mock_task]
 
-        result = get_tasks_by_project(
-            self.mock_db, self.mock_project_id, "test@example.com"
-        )
+        with patch("app.services.task.can_access_project", return_value=True):
+            result = get_tasks_by_project(
+                self.mock_db, self.mock_project_id, "test@example.com"
+            )
 
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0], self.mock_task)
@@ -3,17 +3,28 @@ from unittest.mock import MagicMock, patch
 from uuid import UUID, uuid4
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from app.schemas import TeamCreate, TeamUpdate, AddTeamMember, RemoveTeamMember
+from app.schemas import (
+    TeamCreate,
+    TeamUpdate,
+    AddTeamMember,
+    RemoveTeamMember,
+    TeamMembersBatch,
+    TeamMemberStatus,
+)
 from app.models.team import Team
 from app.models.user import User
 from app.services import (
     create_team,
     get_team,
-    get_team_by_owned_by,
+    get_team_row,
     update_team,
     delete_team,
     add_member_to_team,
     remove_member_from_team,
+    get_team_member_ids,
+    get_team_summaries,
+    add_members_to_team,
+    remove_members_from_team,
 )
 
 
@@ -94,6 +105,29 @@ class TestTeamService(unittest.TestCase):
         self.assertEqual(context.exception.status_code, 404)
         self.assertEqual(context.exception.detail, "Team not found")
 
+    def test_get_team_row_reads_columns_only(self):
+        self.db.execute.return_value.first.return_value = (
+            self.mock_team_id,
+            "Test Team",
+            self.mock_user_id,
+        )
+
+        team = get_team_row(self.db, self.mock_team_id)
+
+        self.assertEqual(team[1], "Test Team")
+        query = str(self.db.execute.call_args.args[0])
+        self.assertIn("teams.name", query)
+        self.assertNotIn("JOIN", query)
+        self.db.query.assert_not_called()
+
+    def test_get_team_row_not_found(self):
+        self.db.execute.return_value.first.return_value = None
+
+        with self.assertRaises(HTTPException) as context:
+            get_team_row(self.db, uuid4())
+
+        self.assertEqual(context.exception.status_code, 404)
+
     def test_update_team_success(self):
         team_data = TeamUpdate(name="Updated Team")
         updated_team = update_team(
@@ -127,13 +161,9 @@ class TestTeamService(unittest.TestCase):
 
     def test_add_member_to_team_success(self):
         new_user_id = uuid4()
-        new_user = User(id=new_user_id, email="newuser@example.com")
 
-        # Mock returning the new user
-        self.db.query.return_value.filter.return_value.first.side_effect = [
-            self.mock_team,
-            new_user,
-        ]
+        # The user exists and is not a member yet
+        self.db.scalar.side_effect = [True, False]
 
         add_team_member = AddTeamMember(
             team_id=self.mock_team_id, user_to_add_id=new_user_id
@@ -141,19 +171,39 @@ class TestTeamService(unittest.TestCase):
         updated_team = add_member_to_team(self.db, self.mock_user_id, add_team_member)
         self.db.commit.assert_called_once()
         self.db.refresh.assert_called_once_with(updated_team)
-        self.assertIn(new_user, updated_team.members)
+
+        membership = self.db.add.call_args.args[0]
+        self.assertEqual(membership.user_id, new_user_id)
+        self.assertEqual(membership.team_id, self.mock_team_id)
+
+    def test_add_member_already_in_team(self):
+        self.db.scalar.side_effect = [True, True]
+
+        add_team_member = AddTeamMember(
+            team_id=self.mock_team_id, user_to_add_id=uuid4()
+        )
+        with self.assertRaises(HTTPException) as context:
+            add_member_to_team(self.db, self.mock_user_id, add_team_member)
+
+        self.assertEqual(context.exception.status_code, 400)
+        self.assertEqual(context.exception.detail, "User already in team")
+        self.db.add.assert_not_called()
+
+    def test_add_member_user_not_found(self):
+        self.db.scalar.return_value = False
+
+        add_team_member = AddTeamMember(
+            team_id=self.mock_team_id, user_to_add_id=uuid4()
+        )
+        with self.assertRaises(HTTPException) as context:
+            add_member_to_team(self.db, self.mock_user_id, add_team_member)
+
+        self.assertEqual(context.exception.status_code, 404)
 
     def test_remove_member_from_team_success(self):
-        # Add a new member who is not the owner
         new_user_id = uuid4()
-        new_user = User(id=new_user_id, email="newuser@example.com")
-
-        # Ensure the team has this new member and the owner is different
-        self.mock_team.members.append(new_user)
-        self.db.query.return_value.filter.return_value.first.side_effect = [
-            self.mock_team,
-            new_user,
-        ]
+        self.db.scalar.return_value = True
+        self.db.execute.return_value.rowcount = 1
 
         remove_member = RemoveTeamMember(
             team_id=self.mock_team_id, user_to_remove_id=new_user_id
@@ -162,11 +212,46 @@ class TestTeamService(unittest.TestCase):
             self.db, self.mock_user_id, remove_member
         )
 
-        # Verify that the new user was removed and the owner remains
+        self.db.execute.assert_called_once()
         self.db.commit.assert_called_once()
         self.db.refresh.assert_called_once_with(updated_team)
-        self.assertNotIn(new_user, updated_team.members)
-        self.assertIn(self.mock_user, updated_team.members)
+
+    def test_remove_member_not_in_team(self):
+        self.db.scalar.return_value = True
+        self.db.execute.return_value.rowcount = 0
+
+        remove_member = RemoveTeamMember(
+            team_id=self.mock_team_id, user_to_remove_id=uuid4()
+        )
+        with self.assertRaises(HTTPException) as context:
+            remove_member_from_team(self.db, self.mock_user_id, remove_member)
+
+        self.assertEqual(context.exception.status_code, 400)
+        self.assertEqual(context.exception.detail, "User not in team")
+        self.db.commit.assert_not_called()
+
+    def test_get_team_member_ids(self):
+        member_ids = [uuid4(), uuid4()]
+        self.db.scalars.return_value = iter(member_ids)
+
+        result = get_team_member_ids(self.db, self.mock_team_id, limit=2)
+
+        self.assertEqual(result, member_ids)
+
+    def test_get_team_summaries_pages_with_counts(self):
+        team_ids = sorted([uuid4(), uuid4(), uuid4()])
+        self.db.execute.return_value.all.return_value = [
+            (team_id, f"Team {i}", self.mock_user_id, i + 1, i)
+            for i, team_id in enumerate(team_ids)
+        ]
+
+        page = get_team_summaries(self.db, self.mock_user_id, limit=2)
+
+        self.db.execute.assert_called_once()
+        self.assertEqual([team.id for team in page.items], team_ids[:2])
+        self.assertEqual(page.items[1].member_count, 2)
+        self.assertEqual(page.items[1].project_count, 1)
+        self.assertEqual(page.next_after, team_ids[1])
 
     def test_remove_owner_from_team(self):
         remove_member = RemoveTeamMember(
@@ -181,6 +266,60 @@ class TestTeamService(unittest.TestCase):
             context.exception.detail, "You cannot remove the owner of the team"
         )
 
+    def test_add_members_batch(self):
+        new_user_id, member_id, missing_id = uuid4(), uuid4(), uuid4()
+        self.db.get_bind.return_value.dialect.name = "sqlite"
+        self.db.execute.return_value.all.return_value = [
+            (new_user_id, "new@example.com"),
+            (member_id, "member@example.com"),
+        ]
+        # Only the new user is returned by INSERT ... ON CONFLICT DO NOTHING
+        self.db.scalars.return_value = [new_user_id]
+
+        batch = TeamMembersBatch(
+            team_id=self.mock_team_id,
+            user_ids=[new_user_id, missing_id],
+            emails=["member@example.com"],
+        )
+        result = add_members_to_team(self.db, self.mock_user_id, batch)
+
+        self.assertEqual(
+            [outcome.status for outcome in result.results],
+            [
+                TeamMemberStatus.ADDED,
+                TeamMemberStatus.NOT_FOUND,
+                TeamMemberStatus.ALREADY_MEMBER,
+            ],
+        )
+        self.assertEqual(result.results[1].user_id, missing_id)
+        self.db.commit.assert_called_once()
+
+    def test_remove_members_batch_keeps_owner(self):
+        member_id = uuid4()
+        self.db.execute.return_value.all.return_value = [
+            (self.mock_user_id, "test@example.com"),
+            (member_id, "member@example.com"),
+        ]
+        self.db.scalars.return_value = [member_id]
+
+        batch = TeamMembersBatch(
+            team_id=self.mock_team_id, user_ids=[self.mock_user_id, member_id]
+        )
+        result = remove_members_from_team(self.db, self.mock_user_id, batch)
+
+        self.assertEqual(
+            [outcome.status for outcome in result.results],
+            [TeamMemberStatus.OWNER, TeamMemberStatus.REMOVED],
+        )
+
+    def test_members_batch_not_owner(self):
+        batch = TeamMembersBatch(team_id=self.mock_team_id, user_ids=[uuid4()])
+
+        with self.assertRaises(HTTPException) as context:
+            add_members_to_team(self.db, uuid4(), batch)
+
+        self.assertEqual(context.exception.status_code, 403)
+
 
 if __name__ == "__main__":
     unittest.main()
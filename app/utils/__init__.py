@@ -1 +1 @@
-from .db import create_tables, drop_tables
+from .db import create_tables, drop_tables, upsert
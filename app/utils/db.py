@@ -1,3 +1,6 @@
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
 from ..models import Base
 from app.db import engine
 
@@ -8,3 +11,19 @@ def create_tables():
 
 def drop_tables():
     Base.metadata.drop_all(bind=engine)
+
+
+def upsert(db: Session, model):
+    """Return an INSERT supporting ON CONFLICT for the session's dialect."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def columns_for(model, schema: type[BaseModel], fields: tuple[str, ...] | None = None):
+    """The `model` columns behind each field of `schema`, or just `fields`.
+
+    Selecting these returns plain rows the schema validates from attributes,
+    without building ORM instances or touching the identity map.
+    """
+    return [getattr(model, name) for name in fields or schema.model_fields]
@@ -0,0 +1,214 @@
+from collections import deque
+from typing import Hashable, Iterable
+
+
+class DependencyGraph:
+    """In-memory task dependency graph of one project.
+
+    Edges point from a task to the task it depends on. Blocked tasks are kept
+    up to date on every change; the topological order and the critical path
+    are computed lazily and reused until a change invalidates them.
+
+    Tasks are numbered on insertion and every internal structure is indexed
+    by that number; hashing ids (UUIDs) only happens at the boundary.
+    """
+
+    def __init__(
+        self,
+        tasks: Iterable[tuple[Hashable, bool]] = (),
+        edges: Iterable[tuple[Hashable, Hashable]] = (),
+    ):
+        self._index: dict[Hashable, int] = {}
+        self._ids: list = []
+        self._dependencies: list[set[int] | None] = []
+        self._dependents: list[set[int] | None] = []
+        self._done: list[bool] = []
+        # Number of unfinished dependencies of every task.
+        self._open: list[int] = []
+        self._blocked: set[int] = set()
+        self._order: list[int] | None = None
+        self._position: dict[int, int] | None = None
+        self._critical_path: list | None = None
+
+        for task, done in tasks:
+            self.add_task(task, done)
+        for task, dependency in edges:
+            self.add_edge(task, dependency)
+
+    def __contains__(self, task) -> bool:
+        return task in self._index
+
+    def has_edge(self, task, dependency) -> bool:
+        if task not in self._index or dependency not in self._index:
+            return False
+        return self._index[dependency] in self._dependencies[self._index[task]]
+
+    def add_task(self, task, done: bool = False) -> int:
+        node = self._index.get(task)
+        if node is not None:
+            return node
+        node = len(self._ids)
+        self._index[task] = node
+        self._ids.append(task)
+        self._dependencies.append(set())
+        self._dependents.append(set())
+        self._done.append(done)
+        self._open.append(0)
+        if self._order is not None:
+            # A task without edges can go anywhere; append it.
+            if self._position is not None:
+                self._position[node] = len(self._order)
+            self._order.append(node)
+        return node
+
+    def remove_task(self, task):
+        node = self._index.pop(task, None)
+        if node is None:
+            return
+        for dependency in self._dependencies[node]:
+            self._dependents[dependency].discard(node)
+        for dependent in self._dependents[node]:
+            self._dependencies[dependent].discard(node)
+            if not self._done[node]:
+                self._open[dependent] -= 1
+                self._update_blocked(dependent)
+        self._ids[node] = None
+        self._dependencies[node] = self._dependents[node] = None
+        self._blocked.discard(node)
+        if self._order is not None:
+            # Dropping a node keeps the rest of the order valid.
+            self._order.remove(node)
+            self._position = None
+        self._critical_path = None
+
+    def set_done(self, task, done: bool):
+        node = self._index.get(task)
+        if node is None or self._done[node] == done:
+            return
+        self._done[node] = done
+        delta = -1 if done else 1
+        for dependent in self._dependents[node]:
+            self._open[dependent] += delta
+            self._update_blocked(dependent)
+        self._update_blocked(node)
+        self._critical_path = None
+
+    def creates_cycle(self, task, dependency) -> bool:
+        """Whether making `task` depend on `dependency` would close a cycle."""
+        if task == dependency:
+            return True
+        if task not in self._index or dependency not in self._index:
+            return False
+        target, start = self._index[task], self._index[dependency]
+        position = self._positions()
+        if position[start] < position[target]:
+            return False
+        # Following dependencies only moves earlier in the order, so tasks
+        # ordered before `task` cannot lead back to it.
+        floor = position[target]
+        stack, seen = [start], {start}
+        while stack:
+            for upstream in self._dependencies[stack.pop()]:
+                if upstream == target:
+                    return True
+                if upstream not in seen and position[upstream] > floor:
+                    seen.add(upstream)
+                    stack.append(upstream)
+        return False
+
+    def add_edge(self, task, dependency):
+        node = self.add_task(task)
+        upstream = self.add_task(dependency)
+        if upstream in self._dependencies[node]:
+            return
+        if self._order is not None and self._position_of(upstream) > (
+            self._position_of(node)
+        ):
+            self._order = self._position = None
+        self._dependencies[node].add(upstream)
+        self._dependents[upstream].add(node)
+        if not self._done[upstream]:
+            self._open[node] += 1
+            self._update_blocked(node)
+        self._critical_path = None
+
+    def remove_edge(self, task, dependency):
+        if not self.has_edge(task, dependency):
+            return
+        node, upstream = self._index[task], self._index[dependency]
+        # Removing an edge never breaks the cached order.
+        self._dependencies[node].discard(upstream)
+        self._dependents[upstream].discard(node)
+        if not self._done[upstream]:
+            self._open[node] -= 1
+            self._update_blocked(node)
+        self._critical_path = None
+
+    def topological_order(self) -> list:
+        self._positions()
+        ids = self._ids
+        return [ids[node] for node in self._order]
+
+    def blocked(self) -> list:
+        """Blocked tasks, in topological order."""
+        self._positions()
+        ids, blocked = self._ids, self._blocked
+        return [ids[node] for node in self._order if node in blocked]
+
+    def critical_path(self) -> list:
+        """Longest chain of unfinished tasks, first task to start first."""
+        if self._critical_path is None:
+            self._positions()
+            done, dependencies = self._done, self._dependencies
+            length = [0] * len(self._ids)
+            previous: dict[int, int] = {}
+            best = None
+            for node in self._order:
+                if done[node]:
+                    continue
+                longest, via = 0, None
+                for upstream in dependencies[node]:
+                    if length[upstream] > longest:
+                        longest, via = length[upstream], upstream
+                length[node] = longest + 1
+                if via is not None:
+                    previous[node] = via
+                if best is None or length[node] > length[best]:
+                    best = node
+
+            path = []
+            while best is not None:
+                path.append(self._ids[best])
+                best = previous.get(best)
+            self._critical_path = path[::-1]
+        return list(self._critical_path)
+
+    def _position_of(self, node: int) -> int:
+        return self._positions()[node]
+
+    def _positions(self) -> dict[int, int]:
+        if self._order is None:
+            # Kahn's algorithm: dependencies come before their dependents.
+            dependents = self._dependents
+            remaining = [
+                len(deps) if deps is not None else -1 for deps in self._dependencies
+            ]
+            ready = deque(node for node, count in enumerate(remaining) if not count)
+            order = []
+            while ready:
+                node = ready.popleft()
+                order.append(node)
+                for dependent in dependents[node]:
+                    remaining[dependent] -= 1
+                    if not remaining[dependent]:
+                        ready.append(dependent)
+            self._order = order
+        if self._position is None:
+            self._position = {node: i for i, node in enumerate(self._order)}
+        return self._position
+
+    def _update_blocked(self, node: int):
+        if self._open[node] > 0 and not self._done[node]:
+            self._blocked.add(node)
+        else:
+            self._blocked.discard(node)
@@ -0,0 +1,130 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, NamedTuple
+
+
+class ParsedRow(NamedTuple):
+    row: int
+    data: dict | None
+    error: str | None = None
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[str | None]:
+    """Split a byte stream into text lines, yielding None for over-long lines."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    skipping = False
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        start = 0
+        while (end := buffer.find("\n", start)) != -1:
+            if skipping:
+                skipping = False
+            else:
+                yield buffer[start:end].rstrip("\r")
+            start = end + 1
+        buffer = buffer[start:]
+
+        # Drop the rest of a line that would not fit in memory and resume at
+        # the next newline, so a single bad row cannot stall the import.
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield None
+            skipping = True
+            buffer = ""
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer and not skipping:
+        yield buffer.rstrip("\r")
+
+
+async def iter_ndjson_rows(
+    lines: AsyncIterator[str | None],
+) -> AsyncIterator[ParsedRow]:
+    row = 0
+    async for line in lines:
+        if line is not None and not line.strip():
+            continue
+        row += 1
+        if line is None:
+            yield ParsedRow(row, None, "Row exceeds the maximum line size")
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield ParsedRow(row, None, f"Invalid JSON: {e}")
+            continue
+        if not isinstance(data, dict):
+            yield ParsedRow(row, None, "Row must be a JSON object")
+            continue
+        yield ParsedRow(row, data)
+
+
+async def iter_csv_rows(
+    lines: AsyncIterator[str | None], max_record_bytes: int
+) -> AsyncIterator[ParsedRow]:
+    header: list[str] | None = None
+    record: list[str] = []
+    record_size = 0
+    quotes = 0
+    row = 0
+
+    async for line in lines:
+        if line is None:
+            record, record_size, quotes = [], 0, 0
+            if header is not None:
+                row += 1
+                yield ParsedRow(row, None, "Row exceeds the maximum line size")
+            continue
+
+        # A quoted field may span several physical lines; keep collecting
+        # until the quotes are balanced.
+        record.append(line)
+        record_size += len(line) + 1
+        quotes += line.count('"')
+        if quotes % 2:
+            # A stray quote would otherwise swallow the rest of the upload.
+            if record_size > max_record_bytes:
+                record, record_size, quotes = [], 0, 0
+                row += 1
+                yield ParsedRow(row, None, "Row exceeds the maximum record size")
+            continue
+        text = "\n".join(record)
+        record, record_size, quotes = [], 0, 0
+
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+
+        row += 1
+        if len(values) > len(header):
+            yield ParsedRow(row, None, "Row has more columns than the header")
+            continue
+        yield ParsedRow(
+            row, {key: value for key, value in zip(header, values) if value != ""}
+        )
+
+    if record:
+        row += 1
+        yield ParsedRow(row, None, "Unterminated quoted field")
+
+
+async def chunked(
+    rows: AsyncIterator[ParsedRow], size: int
+) -> AsyncIterator[list[ParsedRow]]:
+    chunk: list[ParsedRow] = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
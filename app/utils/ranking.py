@@ -0,0 +1,86 @@
+# Lexicographic fractional indexing. A rank is the digit string of a fraction
+# in (0, 1), so comparing ranks as strings compares positions and a key can
+# always be found between two neighbours without touching other rows.
+#
+# Only digits and lowercase letters are used: they sort the same under byte
+# order and the usual locale collations, so SQL ORDER BY agrees with Python.
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+
+def rank_between(before: str | None, after: str | None) -> str:
+    """Return a rank strictly between two neighbours; None means open-ended."""
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Rank {before!r} is not before {after!r}")
+    if after is None:
+        return _increment(before) if before else DIGITS[BASE // 2]
+    return _midpoint(before or "", after)
+
+
+def spread_ranks(count: int) -> list[str]:
+    """Evenly spaced, shortest possible ranks for `count` items.
+
+    Only the lower half of the key space is used so appends stay short.
+    """
+    width = 1
+    while BASE**width < 4 * count:
+        width += 1
+    step = BASE**width // (2 * count + 2)
+    return [_encode(step * (i + 1), width) for i in range(count)]
+
+
+def ranks_after(after: str | None, count: int) -> list[str]:
+    """`count` ascending ranks after `after`, short enough for bulk appends."""
+    if count == 0:
+        return []
+    if after is None:
+        return spread_ranks(count)
+    # Everything prefixed by the next key sorts after `after`.
+    prefix = _increment(after)
+    return [prefix] + [prefix + rank for rank in spread_ranks(count - 1)]
+
+
+def _midpoint(a: str, b: str) -> str:
+    # Both keys never end in "0", so there is always room below them.
+    n = 0
+    while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+        n += 1
+    if n > 0:
+        return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0])
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _upper_half(a[1:])
+
+
+def _upper_half(a: str) -> str:
+    # Midpoint between `a` and the end of the key space.
+    if not a:
+        return DIGITS[BASE // 2]
+    digit = DIGITS.index(a[0])
+    if BASE - digit > 1:
+        return DIGITS[(digit + BASE + 1) // 2]
+    return a[0] + _upper_half(a[1:])
+
+
+def _increment(key: str) -> str:
+    # Append by counting up at the current length; only when the key is all
+    # top digits does it have to grow.
+    digits = [DIGITS.index(char) for char in key]
+    for i in reversed(range(len(digits))):
+        if digits[i] < BASE - 1:
+            digits[i] += 1
+            return "".join(DIGITS[digit] for digit in digits[: i + 1])
+    return key + DIGITS[BASE // 2]
+
+
+def _encode(value: int, width: int) -> str:
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        chars.append(DIGITS[digit])
+    return "".join(reversed(chars)).rstrip("0")
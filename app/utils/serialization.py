@@ -0,0 +1,108 @@
+from functools import lru_cache
+from typing import Any, Iterable
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import Row
+
+from app.core import app_settings
+
+
+class RawJSONResponse(Response):
+    """A response whose body is already encoded JSON bytes."""
+
+    media_type = "application/json"
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+
+# Partial models come and go with client field choices; bound both caches.
+@lru_cache(maxsize=512)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    # Built once per model; the core schema compiles to a Rust validator and
+    # serializer that are reused for every response.
+    return TypeAdapter(list[model])
+
+
+def _source(fields: frozenset[str], row: Any) -> Any:
+    if isinstance(row, Row):
+        # Zipping is far cheaper than looking up Row attributes one by one.
+        return dict(zip(row._fields, row))
+    # Loaded column values sit in the instance __dict__; reading them there
+    # skips SQLAlchemy's attribute descriptors, which dominate the cost.
+    # Rows with expired or deferred fields go through getattr as usual.
+    loaded = getattr(row, "__dict__", None)
+    if loaded is not None and fields <= loaded.keys():
+        return loaded
+    return row
+
+
+def dump_json(model: type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """Read ORM or Core rows into `model`s and encode them straight to JSON bytes."""
+    adapter = list_adapter(model)
+    fields = frozenset(model.model_fields)
+    models = adapter.validate_python(
+        [_source(fields, row) for row in rows], from_attributes=True
+    )
+    return adapter.dump_json(models)
+
+
+def parse_fields(model: type[BaseModel], fields: str | None) -> tuple[str, ...] | None:
+    """Validate a comma-separated `fields` parameter against `model`.
+
+    Fields come back in the schema's order, whatever order they were asked
+    for in, so every subset maps to one partial model.
+    """
+    names = dict.fromkeys(
+        name.strip() for name in (fields or "").split(",") if name.strip()
+    )
+    if not names:
+        return None
+    unknown = [name for name in names if name not in model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    return tuple(name for name in model.model_fields if name in names)
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """`model` restricted to `fields`, built once per combination."""
+    return create_model(
+        f"{model.__name__}Fields",
+        **{name: (model.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+def list_response(
+    model: type[BaseModel],
+    rows: Iterable[Any],
+    fields: tuple[str, ...] | None = None,
+):
+    """Return `rows` for FastAPI to serialize, or the fast path when enabled.
+
+    The fast path skips FastAPI's response validation and jsonable_encoder
+    pass; the route's `response_model` still documents the shape. Sparse
+    fieldsets always take it, since they do not match the response model.
+    """
+    if fields:
+        return RawJSONResponse(dump_json(partial_model(model, fields), rows))
+    if not app_settings.FAST_JSON_RESPONSES:
+        return rows
+    return RawJSONResponse(dump_json(model, rows))
+
+
+def item_response(
+    model: type[BaseModel], item: Any, fields: tuple[str, ...] | None = None
+):
+    """Return `item` as is, or only `fields` of it encoded as JSON."""
+    if not fields:
+        return item
+    partial = partial_model(model, fields)
+    return RawJSONResponse(
+        partial.model_validate(item, from_attributes=True).model_dump_json().encode()
+    )
@@ -0,0 +1,123 @@
+"""Local stand-in for a Redis server, enough for the response cache.
+
+Speaks RESP and implements GET, SET (with PX), MGET, INCR, DEL, FLUSHDB,
+SELECT, AUTH and PING over an in-memory dict. Point the app at it with
+
+    RESPONSE_CACHE_BACKEND=redis RESPONSE_CACHE_URL=redis://127.0.0.1:16379/0 \\
+        uvicorn app.main:app
+
+and start it with
+
+    python -m benchmarks.fake_redis --port 16379
+"""
+
+import argparse
+import asyncio
+import time
+
+
+class Status(bytes):
+    """A simple-string reply, as opposed to a bulk value."""
+
+
+OK = Status(b"OK")
+
+
+class Store:
+    def __init__(self):
+        self._values: dict[bytes, tuple[bytes, float | None]] = {}
+
+    def _get(self, key: bytes) -> bytes | None:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    def execute(self, command: list[bytes]):
+        name, args = command[0].upper(), command[1:]
+        if name == b"GET":
+            return self._get(args[0])
+        if name == b"MGET":
+            return [self._get(key) for key in args]
+        if name == b"SET":
+            expires_at = None
+            if len(args) >= 4 and args[2].upper() == b"PX":
+                expires_at = time.monotonic() + int(args[3]) / 1000
+            self._values[args[0]] = (args[1], expires_at)
+            return OK
+        if name == b"INCR":
+            value = int(self._get(args[0]) or 0) + 1
+            self._values[args[0]] = (str(value).encode(), None)
+            return value
+        if name == b"DEL":
+            return sum(self._values.pop(key, None) is not None for key in args)
+        if name == b"FLUSHDB":
+            self._values.clear()
+            return OK
+        if name in (b"SELECT", b"AUTH", b"PING"):
+            return Status(b"PONG") if name == b"PING" else OK
+        return Exception(f"ERR unknown command '{name.decode()}'")
+
+
+def _encode(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(_encode(item) for item in reply)
+    if isinstance(reply, Status):
+        return b"+%s\r\n" % reply
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[bytes] | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    count = int(line[1:-2])
+    command = []
+    for _ in range(count):
+        length = int((await reader.readline())[1:-2])
+        command.append((await reader.readexactly(length + 2))[:-2])
+    return command
+
+
+async def serve(host: str, port: int, store: Store | None = None):
+    store = store or Store()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while (command := await _read_command(reader)) is not None:
+                writer.write(_encode(store.execute(command)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=16379)
+    args = parser.parse_args()
+
+    async def run():
+        server = await serve(args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
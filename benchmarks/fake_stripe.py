@@ -0,0 +1,148 @@
+"""Local stand-in for the Stripe endpoints used by the subscription service.
+
+Implements checkout session create/retrieve and subscription cancel with
+injectable latency and failures. Point the app at it with
+
+    STRIPE_API_BASE=http://127.0.0.1:12111 uvicorn app.main:app
+
+and start it with
+
+    python -m benchmarks.fake_stripe --latency-ms 80 --jitter-ms 20 \\
+        --slow-rate 0.01 --slow-ms 2000 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import random
+import secrets
+import time
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Fraction of requests that take `slow_ms` instead, to shape the tail.
+    slow_rate: float = 0.0
+    slow_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    # Retrieved sessions report "complete" so the status poll activates.
+    complete_sessions: bool = True
+
+
+config = FaultConfig()
+app = FastAPI(title="Fake Stripe")
+
+_sessions: dict[str, dict] = {}
+_subscriptions: dict[str, dict] = {}
+
+
+def _id(prefix: str) -> str:
+    return f"{prefix}_test_{secrets.token_hex(12)}"
+
+
+def _error(status_code: int, error_type: str, message: str):
+    return JSONResponse(
+        {"error": {"type": error_type, "message": message}}, status_code=status_code
+    )
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+    if config.slow_rate and random.random() < config.slow_rate:
+        delay = config.slow_ms
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+
+    if config.error_rate and random.random() < config.error_rate:
+        if config.error_status == 429:
+            return _error(429, "rate_limit_error", "Injected rate limit")
+        return _error(config.error_status, "api_error", "Injected failure")
+    return await call_next(request)
+
+
+@app.post("/v1/checkout/sessions")
+async def create_checkout_session(request: Request):
+    form = await request.form()
+    session_id = _id("cs")
+    subscription_id = _id("sub")
+    _subscriptions[subscription_id] = {
+        "id": subscription_id,
+        "object": "subscription",
+        "status": "active",
+    }
+    _sessions[session_id] = {
+        "id": session_id,
+        "object": "checkout.session",
+        "client_secret": f"{session_id}_secret_{secrets.token_hex(8)}",
+        "created": int(time.time()),
+        "mode": form.get("mode"),
+        "status": "open",
+        "return_url": form.get("return_url"),
+        "customer": _id("cus"),
+        "customer_email": form.get("customer_email"),
+        "customer_details": {"email": form.get("customer_email")},
+        "subscription": subscription_id,
+        "metadata": {
+            key[len("metadata[") : -1]: value
+            for key, value in form.items()
+            if key.startswith("metadata[")
+        },
+    }
+    return _sessions[session_id]
+
+
+@app.get("/v1/checkout/sessions/{session_id}")
+async def retrieve_checkout_session(session_id: str):
+    session = _sessions.get(session_id)
+    if session is None:
+        return _error(404, "invalid_request_error", f"No such session: {session_id}")
+    if config.complete_sessions:
+        session["status"] = "complete"
+    return session
+
+
+@app.delete("/v1/subscriptions/{subscription_id}")
+async def cancel_subscription(subscription_id: str):
+    subscription = _subscriptions.get(subscription_id)
+    if subscription is None:
+        return _error(
+            404, "invalid_request_error", f"No such subscription: {subscription_id}"
+        )
+    subscription["status"] = "canceled"
+    return subscription
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12111)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--open-sessions", action="store_true")
+    args = parser.parse_args()
+
+    config.latency_ms = args.latency_ms
+    config.jitter_ms = args.jitter_ms
+    config.slow_rate = args.slow_rate
+    config.slow_ms = args.slow_ms
+    config.error_rate = args.error_rate
+    config.error_status = args.error_status
+    config.complete_sessions = not args.open_sessions
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
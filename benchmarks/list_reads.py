@@ -0,0 +1,57 @@
+"""Cost of reading a task listing as ORM instances vs plain column rows.
+
+    python -m benchmarks.list_reads --rows 10000
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Task
+from app.schemas.task import TaskInDB
+from app.utils.db import columns_for
+from app.utils.serialization import dump_json
+from benchmarks.serialization import _tasks
+
+
+def _orm(db: Session) -> bytes:
+    db.expunge_all()
+    return dump_json(TaskInDB, db.query(Task).order_by(Task.rank).all())
+
+
+def _rows(db: Session) -> bytes:
+    db.expunge_all()
+    rows = db.execute(select(*columns_for(Task, TaskInDB)).order_by(Task.rank)).all()
+    return dump_json(TaskInDB, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(_tasks(args.rows))
+        db.commit()
+
+        assert _orm(db) == _rows(db)
+        for name, fn in (("orm", _orm), ("core rows", _rows)):
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                fn(db)
+                best = min(best, time.perf_counter() - started)
+            print(
+                f"{name:<10} {best * 1000:8.1f} ms total"
+                f" {best / args.rows * 1e6:8.2f} us/row"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Per-row cost of serializing list responses, FastAPI's path vs the fast path.
+
+    python -m benchmarks.serialization --rows 10000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import List
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import Task
+from app.models.task import TaskStatus
+from app.schemas.task import TaskInDB
+from app.utils.serialization import dump_json
+
+
+def _tasks(count: int) -> list[Task]:
+    now = datetime.now(timezone.utc)
+    project_id = uuid4()
+    return [
+        Task(
+            id=uuid4(),
+            title=f"Task {i}",
+            description="Benchmark task with a short description",
+            status=TaskStatus.TODO,
+            project_id=project_id,
+            created_at=now,
+            updated_at=now,
+            version=1,
+            rank=f"{i:08d}",
+        )
+        for i in range(count)
+    ]
+
+
+def _fastapi_path(field, rows) -> bytes:
+    # What a route with response_model=List[TaskInDB] does with ORM rows.
+    content = asyncio.run(
+        serialize_response(field=field, response_content=rows, is_coroutine=False)
+    )
+    return JSONResponse(content).body
+
+
+def _best_of(repeat: int, fn, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = _tasks(args.rows)
+    field = create_model_field(
+        name="Response", type_=List[TaskInDB], mode="serialization"
+    )
+    dump_json(TaskInDB, rows[:1])  # build the adapter outside the timing
+
+    for name, fn, fn_args in (
+        ("fastapi", _fastapi_path, (field, rows)),
+        ("fast path", dump_json, (TaskInDB, rows)),
+    ):
+        seconds = _best_of(args.repeat, fn, *fn_args)
+        print(
+            f"{name:<10} {seconds * 1000:8.1f} ms total"
+            f" {seconds / args.rows * 1e6:8.2f} us/row"
+        )
+
+
+if __name__ == "__main__":
+    main()
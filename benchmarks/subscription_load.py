@@ -0,0 +1,130 @@
+"""Drive the subscription flow against a running app and report latencies.
+
+Each simulated user loops over checkout -> status poll -> cancel. Start the
+fake Stripe server and the app pointed at it first, then run
+
+    python -m benchmarks.subscription_load --users 50 --cycles 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+API = "/api/v1"
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def request(
+        self, client: httpx.AsyncClient, name: str, method: str, url, **kw
+    ):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kw)
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, 0
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        self.statuses[name][status] += 1
+        return response
+
+    def report(self, elapsed: float):
+        total = sum(len(samples) for samples in self.latencies.values())
+        print(f"{total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s)")
+        print(
+            f"{'endpoint':<10} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  statuses"
+        )
+        for name, samples in self.latencies.items():
+            statuses = ", ".join(
+                f"{status}: {count}"
+                for status, count in sorted(self.statuses[name].items())
+            )
+            print(
+                f"{name:<10} {len(samples):>6} {statistics.median(samples):>8.1f}"
+                f" {_percentile(samples, 0.95):>8.1f} {_percentile(samples, 0.99):>8.1f}"
+                f" {max(samples):>8.1f}  {statuses}"
+            )
+
+
+async def _login(client: httpx.AsyncClient, email: str) -> str:
+    credentials = {"email": email, "password": "benchmark-password"}
+    response = await client.post(f"{API}/auth/login", json=credentials)
+    if response.status_code != 200:
+        await client.post(f"{API}/auth/register", json=credentials)
+        response = await client.post(f"{API}/auth/login", json=credentials)
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _user(client: httpx.AsyncClient, recorder: Recorder, index: int, cycles: int):
+    email = f"bench-{index}@example.com"
+    token = await _login(client, email)
+    headers = {"Authorization": token, "Origin": "http://localhost"}
+
+    for _ in range(cycles):
+        response = await recorder.request(
+            client,
+            "checkout",
+            "POST",
+            f"{API}/subscription/create-checkout-session",
+            params={"subscription_type": "monthly"},
+            headers=headers,
+        )
+        if response is None or response.status_code != 200:
+            continue
+        await recorder.request(
+            client,
+            "status",
+            "GET",
+            f"{API}/subscription/stripe-session-status",
+            params={
+                "stripe_session_id": response.json()["id"],
+                "subscription_type": "monthly",
+            },
+        )
+        await recorder.request(
+            client,
+            "cancel",
+            "POST",
+            f"{API}/subscription/cancel-subscription",
+            params={"user_email": email},
+            headers=headers,
+        )
+
+
+async def run(base_url: str, users: int, cycles: int):
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=users)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_user(client, recorder, index, cycles) for index in range(users))
+        )
+        recorder.report(time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.users, args.cycles))
+
+
+if __name__ == "__main__":
+    main()